@@ -19,19 +19,135 @@ class Settings:
     # You.com API endpoints (see docs.you.com/api-reference)
     # Search v1: GET .../v1/search (X-API-Key, query, count)
     you_search_url: str = os.getenv("YOU_SEARCH_URL", "https://ydc-index.io/v1/search")
-    # Search legacy fallback if v1 returns 403
+    # Search legacy fallback if v1 returns 403.  A key that v1 rejects uses
+    # legacy directly, re-trying v1 after this many seconds.
     you_search_legacy_url: str = "https://api.ydc-index.io/search"
+    search_endpoint_reprobe_interval: float = 600.0
     # Express Agent for synthesis: POST .../v1/agents/runs (Bearer token, agent, input)
     you_agents_runs_url: str = os.getenv(
         "YOU_AGENTS_RUNS_URL", "https://api.you.com/v1/agents/runs"
     )
 
-    # Defaults
+    # Saved-analysis history.  Empty keeps it in memory (per process, lost on
+    # restart); a file path stores it in SQLite, shared by all workers.
+    history_db_path: str = os.getenv("HISTORY_DB_PATH", "")
+    # Page size for GET /api/history when a cursor is given without a limit.
+    history_page_size: int = 50
+    # Bounds for the in-memory history: entry count, approximate bytes of
+    # serialised entries, and age in seconds (0 = unbounded).  Past a bound
+    # the least recently used ("lru") or oldest saved ("age") entry goes.
+    history_max_entries: int = 1000
+    history_max_bytes: int = 64 * 1024 * 1024
+    history_max_age: float = 0.0
+    history_eviction: str = "lru"
+    # How the in-memory history compresses each entry: "zlib", "zstd"
+    # (requires the ``zstandard`` package) or "none".
+    history_compression: str = "zlib"
+
+    # Defaults.  The two timeouts are the read timeouts of a search and of a
+    # synthesis call respectively.
     search_timeout: float = 30.0
     chat_timeout: float = 120.0
     max_search_results: int = 5
     max_technologies: int = 5
 
+    # Shared HTTP pool for the You.com APIs.  HTTP/2 is used when enabled
+    # and the ``h2`` package is installed.  Connect, write and pool-wait
+    # timeouts apply to every call; read timeouts are per operation (above).
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0
+    http2: bool = True
+    http_connect_timeout: float = 5.0
+    http_write_timeout: float = 10.0
+    http_pool_timeout: float = 10.0
+    # Open connections to the upstream hosts at startup, in the background.
+    http_warmup: bool = True
+    # Retries of transient upstream failures (429, 5xx, transport errors):
+    # total attempts per call and the jittered exponential backoff bounds.
+    # A server-sent Retry-After is honoured up to the max delay.  Agent calls
+    # do not retry read timeouts: one attempt already waited chat_timeout.
+    upstream_retry_attempts: int = 3
+    upstream_retry_base_delay: float = 0.2
+    upstream_retry_max_delay: float = 5.0
+    # Hedged searches: a search still running after the recent p95 latency
+    # (or the initial delay, until enough samples exist; never less than the
+    # min delay) is duplicated and the first answer wins.
+    search_hedge: bool = True
+    search_hedge_initial_delay: float = 2.0
+    search_hedge_min_delay: float = 0.25
+    # Circuit breakers per upstream endpoint: open after this many
+    # consecutive failures, probe again after the reset timeout (seconds).
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+
+    # Technology vocabulary (canonical names, aliases, categories) used by the
+    # job parser.  Empty means the bundled app/data/technologies.json.  The
+    # file is re-read when its mtime changes, checked at most this often.
+    tech_vocabulary_path: str = os.getenv("TECH_VOCABULARY_PATH", "")
+    tech_vocabulary_reload_interval: float = 5.0
+    # How extracted technologies are ordered before the ``max_technologies``
+    # cap is applied: "relevance" (mention count, section, position) or
+    # "vocabulary" (order of the vocabulary file).
+    tech_ranking: str = "relevance"
+
+    # Search fan-out: how many search queries may be in flight at once for a
+    # single pipeline run, and how long each individual query may take before
+    # it is abandoned (its technology is simply left out of the prompt).
+    search_concurrency: int = 5
+    search_query_deadline: float = 10.0
+
+    # In-process cache in front of the Search API, keyed by normalised query.
+    # A TTL of 0 disables it.
+    search_cache_ttl: float = 3600.0
+    search_cache_max_entries: int = 2048
+    search_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Cache of complete analyses keyed by job-description fingerprint.
+    # Entries older than ``result_cache_ttl`` seconds are treated as stale;
+    # a TTL of 0 disables the cache.  Set RESULT_CACHE_REDIS_URL to share it
+    # between workers (requires the ``redis`` package).
+    result_cache_ttl: float = 24 * 3600.0
+    result_cache_max_entries: int = 256
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_redis_url: str = os.getenv("RESULT_CACHE_REDIS_URL", "")
+
+    # Let identical /api/prepare requests that arrive while a run is still in
+    # progress attach to that run instead of starting their own.
+    dedupe_inflight: bool = True
+
+    # Pacing of /api/prepare progress events.  "none" emits every event as
+    # soon as it is ready (API clients, benchmarks); "ui" holds each step for
+    # at least ``ui_min_step_seconds[i]`` so fast steps stay visible in the
+    # frontend.  Clients pick per request with the ``X-Pacing`` header.
+    pacing: str = os.getenv("PIPELINE_PACING", "none")
+    ui_min_step_seconds: tuple[float, ...] = (0.3, 0.0, 0.0, 0.0, 0.2)
+
+    # Stream the Express Agent answer and forward it as ``partial`` SSE
+    # events instead of waiting for the whole synthesis to finish.
+    stream_synthesis: bool = True
+
+    # Per-request traces.  A request sending ``X-Trace: 1`` gets its trace as
+    # a final ``trace`` SSE event; this fraction of all other requests is
+    # traced too.  Every trace goes to the exporters named in TRACE_EXPORTERS
+    # (comma-separated: "jsonl", "http", "memory").
+    trace_sample_rate: float = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    trace_exporters: tuple[str, ...] = tuple(
+        name.strip() for name in os.getenv("TRACE_EXPORTERS", "").split(",") if name.strip()
+    )
+    trace_jsonl_path: str = os.getenv("TRACE_JSONL_PATH", "traces.jsonl")
+    trace_http_url: str = os.getenv("TRACE_HTTP_URL", "")
+
+    # CPU-heavy steps (parsing and validating the synthesis answer, metadata
+    # extraction) whose input is at least ``offload_min_chars`` long run in
+    # an executor so they don't stall other streams: "thread", "process" or
+    # "none" (always inline).
+    offload_executor: str = os.getenv("OFFLOAD_EXECUTOR", "thread")
+    offload_min_chars: int = int(os.getenv("OFFLOAD_MIN_CHARS", "65536"))
+    offload_workers: int = 2
+    # Sample event-loop lag this often (seconds); 0 disables the monitor.
+    loop_lag_interval: float = 0.1
+
     def validate(self) -> None:
         """Raise if required settings are missing."""
         if not self.you_api_key:
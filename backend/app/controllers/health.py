@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from fastapi import APIRouter
 
-from app.views.health import health_response
+from app.services import you_client
+from app.views.health import health_response, upstream_response
 
 router = APIRouter(tags=["health"])
 
@@ -13,3 +16,13 @@ router = APIRouter(tags=["health"])
 async def health() -> dict[str, str]:
     """Simple liveness check."""
     return health_response()
+
+
+@router.get("/health/upstream")
+async def upstream() -> dict[str, Any]:
+    """Connection-pool saturation, search-cache counters and circuit states."""
+    return upstream_response(
+        you_client.pool_stats(),
+        you_client.search_cache.stats(),
+        you_client.resilience_stats(),
+    )
@@ -1,11 +1,25 @@
-"""History (saved analyses) controller."""
+"""History (saved analyses) controller.
+
+The handlers are plain functions: the history store is synchronous (and
+SQLite may wait on another worker's write lock), so FastAPI runs them in
+its threadpool instead of on the event loop serving the SSE streams.
+"""
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from app.models import SaveHistoryRequest
-from app.repositories.history_store import delete as history_delete, get_by_id, list_all, save as history_save
+from app.config import settings
+from app.models import HistorySummary, SaveHistoryRequest
+from app.repositories.history_store import (
+    delete as history_delete,
+    get_by_id,
+    list_page,
+    list_summaries,
+    save as history_save,
+    search as history_search,
+    stats as history_stats,
+)
 from app.views.history import (
     history_delete_response,
     history_item_view,
@@ -16,20 +30,71 @@ router = APIRouter(tags=["history"])
 
 
 @router.get("/history")
-async def list_history() -> list:
-    """List all saved analyses, newest first."""
-    return history_list_view(list_all())
+def list_history(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> list:
+    """List summaries of saved analyses, newest first.
+
+    Without ``limit`` or ``cursor`` every entry is returned.  Otherwise one
+    page is returned and, if there are more, the cursor for the next page
+    is sent in the ``X-Next-Cursor`` header.  ``fields`` (comma-separated)
+    narrows each item to the named summary fields.  Use
+    ``GET /history/{id}`` for the full analysis.
+    """
+    selected = _parse_fields(fields)
+    if limit is None and cursor is None:
+        return history_list_view(list_summaries(), selected)
+    try:
+        items, next_cursor = list_page(limit or settings.history_page_size, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return history_list_view(items, selected)
+
+
+def _parse_fields(fields: str | None) -> set[str] | None:
+    if not fields:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - HistorySummary.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
+
+
+@router.get("/history/search")
+def search_history(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    fields: str | None = None,
+) -> list:
+    """Search saved analyses by company, technology, question or job text.
+
+    Returns summaries, most relevant first.  Declared before
+    ``/history/{id}`` so that "search" is not taken for an id.
+    """
+    return history_list_view(history_search(q, limit), _parse_fields(fields))
+
+
+@router.get("/history/stats")
+def get_history_stats() -> dict[str, int]:
+    """Current size of the history store and how many entries it has evicted."""
+    return history_stats()
 
 
 @router.post("/history")
-async def save_to_history(req: SaveHistoryRequest) -> dict:
+def save_to_history(req: SaveHistoryRequest) -> dict:
     """Save an analysis to history. Returns the created saved analysis."""
     entry = history_save(req.jobDescription, req.results)
     return history_item_view(entry)
 
 
 @router.get("/history/{id}")
-async def get_history_item(id: str) -> dict:
+def get_history_item(id: str) -> dict:
     """Get one saved analysis by id."""
     entry = get_by_id(id)
     if entry is None:
@@ -38,7 +103,7 @@ async def get_history_item(id: str) -> dict:
 
 
 @router.delete("/history/{id}")
-async def delete_history_item(id: str) -> dict[str, str]:
+def delete_history_item(id: str) -> dict[str, str]:
     """Delete a saved analysis."""
     if not history_delete(id):
         raise HTTPException(status_code=404, detail="Not found")
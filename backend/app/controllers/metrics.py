@@ -0,0 +1,18 @@
+"""Metrics controller — Prometheus-style scrape endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services import metrics
+from app.views.metrics import metrics_response
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def scrape() -> Response:
+    """Pipeline stage latencies, upstream calls, caches and pool, in the
+    text exposition format."""
+    return metrics_response(metrics.registry.render())
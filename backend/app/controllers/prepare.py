@@ -2,16 +2,33 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException
 from fastapi.responses import StreamingResponse
 
 from app.models import PrepareRequest
+from app.services.pipeline import PACING_POLICIES
 from app.views.prepare import prepare_stream_response
 
 router = APIRouter(tags=["prepare"])
 
 
 @router.post("/prepare")
-async def prepare_interview(req: PrepareRequest) -> StreamingResponse:
-    """Analyse a job description and stream the results via SSE."""
-    return prepare_stream_response(req.jobDescription)
+async def prepare_interview(
+    req: PrepareRequest,
+    x_pacing: str | None = Header(None),
+    x_trace: str | None = Header(None),
+) -> StreamingResponse:
+    """Analyse a job description and stream the results via SSE.
+
+    The ``X-Pacing`` header ("ui" or "none") overrides the configured pacing
+    of progress events for this request.  ``X-Trace: 1`` appends a ``trace``
+    event with the request's span timings.
+    """
+    if x_pacing is not None and x_pacing not in PACING_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unknown pacing: {x_pacing}")
+    return prepare_stream_response(
+        req.jobDescription,
+        use_cache=not req.bypassCache,
+        pacing=x_pacing,
+        trace=(x_trace or "").lower() in ("1", "true", "yes"),
+    )
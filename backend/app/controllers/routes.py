@@ -6,6 +6,7 @@ from fastapi import APIRouter
 
 from app.controllers.health import router as health_router
 from app.controllers.history import router as history_router
+from app.controllers.metrics import router as metrics_router
 from app.controllers.prepare import router as prepare_router
 
 router = APIRouter(prefix="/api")
@@ -13,3 +14,4 @@ router = APIRouter(prefix="/api")
 router.include_router(health_router)
 router.include_router(prepare_router)
 router.include_router(history_router)
+router.include_router(metrics_router)
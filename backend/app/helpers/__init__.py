@@ -1,24 +1,34 @@
 """Helper modules (parsers, prompt builders, SSE formatting)."""
 
-from app.helpers.job_parser import extract_metadata
+from app.helpers.job_parser import extract_metadata, find_technologies, tokenize
 from app.helpers.prompts import SYSTEM_PROMPT, build_synthesis_prompt
 from app.helpers.sse import (
     PIPELINE_STEPS,
+    RawJSON,
     error_event,
     event,
+    partial_event,
     progress_event,
     result_event,
+    section_event,
     steps_event,
+    trace_event,
 )
 
 __all__ = [
     "extract_metadata",
+    "find_technologies",
+    "tokenize",
     "SYSTEM_PROMPT",
     "build_synthesis_prompt",
     "PIPELINE_STEPS",
+    "RawJSON",
     "error_event",
     "event",
+    "partial_event",
     "progress_event",
     "result_event",
+    "section_event",
     "steps_event",
+    "trace_event",
 ]
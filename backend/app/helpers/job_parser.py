@@ -5,51 +5,214 @@ Renamed from ``parser.py`` to avoid shadowing the stdlib ``parser`` module.
 
 from __future__ import annotations
 
+import json
+import logging
+import os
 import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping
 
+from app.config import settings
 from app.models import JobMetadata
 
-# Sorted by category for readability; order doesn't affect matching.
-_KNOWN_TECHNOLOGIES: tuple[str, ...] = (
-    # Languages
-    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Golang",
-    "Rust", "Ruby", "PHP", "Swift", "Kotlin", "Scala", "R", "Dart", "Elixir",
-    "Clojure", "Haskell", "Perl",
-    # Frontend
-    "React", "Angular", "Vue", "Vue.js", "Svelte", "Next.js", "Nuxt",
-    "Gatsby", "Remix", "Astro", "Ember",
-    # Backend
-    "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring",
-    "Spring Boot", ".NET", "ASP.NET", "Rails", "Ruby on Rails", "Laravel",
-    "Phoenix",
-    # Databases
-    "PostgreSQL", "Postgres", "MySQL", "MongoDB", "Redis", "Elasticsearch",
-    "Cassandra", "DynamoDB", "SQLite", "SQL Server", "MariaDB",
-    "Neo4j", "CockroachDB", "Supabase", "Firebase",
-    # Cloud & Infra
-    "AWS", "Azure", "GCP", "Google Cloud", "Docker", "Kubernetes",
-    "Terraform", "Ansible", "Jenkins", "GitHub Actions", "GitLab CI",
-    "Vercel", "Netlify",
-    # Data & ML
-    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Spark",
-    "Hadoop", "Kafka", "Airflow", "dbt", "Snowflake", "BigQuery",
-    "LangChain", "OpenAI",
-    # Mobile
-    "React Native", "Flutter", "SwiftUI",
-    # Other
-    "GraphQL", "REST", "gRPC", "WebSocket", "RabbitMQ", "Celery",
-    "Linux", "Nginx", "Prometheus", "Grafana", "Datadog", "Sentry",
-    # Concepts
-    "distributed systems", "microservices", "CI/CD", "machine learning",
-    "deep learning", "NLP", "computer vision", "data engineering",
-    "DevOps", "SRE",
-)
-
-# Pre-compiled regex patterns for each technology (case-insensitive).
-_TECH_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
-    (tech, re.compile(r"\b" + re.escape(tech) + r"\b", re.IGNORECASE))
-    for tech in _KNOWN_TECHNOLOGIES
-]
+logger = logging.getLogger(__name__)
+
+# Bundled vocabulary; ``TECH_VOCABULARY_PATH`` points at a replacement.
+DEFAULT_VOCABULARY_PATH = Path(__file__).resolve().parent.parent / "data" / "technologies.json"
+
+
+@dataclass(frozen=True, slots=True)
+class TechMatch:
+    """A vocabulary technology found in a text, with where it occurred."""
+
+    name: str
+    positions: tuple[int, ...]
+
+    @property
+    def count(self) -> int:
+        return len(self.positions)
+
+
+class TechMatcher:
+    """Single-pass, case-insensitive matcher for a vocabulary of names.
+
+    Matches the same occurrences as running ``\\b<name>\\b`` with
+    ``re.IGNORECASE`` for every name separately, including overlapping ones
+    ("React" inside "React Native"), but scans the text once.  The names are
+    compiled into a prefix trie; one regex built from that trie finds every
+    position where some name starts, and the trie is walked from there to
+    enumerate all names ending on a word boundary.  Cost per position is
+    bounded by the longest name, not by the vocabulary size.
+    """
+
+    def __init__(self, names: Iterable[str], aliases: Mapping[str, str] | None = None) -> None:
+        self.names: list[str] = []
+        self._trie: dict[str, dict] = {}
+        for name in names:
+            if self._insert(name, len(self.names)):
+                self.names.append(name)
+        # Aliases share their canonical name's index, so they are reported
+        # (and counted) as that name.
+        index_of = {name: i for i, name in enumerate(self.names)}
+        for alias, canonical in (aliases or {}).items():
+            if canonical in index_of:
+                self._insert(alias, index_of[canonical])
+        self._scanner = re.compile(
+            r"(?=\b" + _trie_pattern(self._trie) + r"\b)", re.IGNORECASE
+        )
+
+    def _insert(self, term: str, index: int) -> bool:
+        node = self._trie
+        for ch in term.lower():
+            node = node.setdefault(ch, {})
+        if _END in node:
+            return False
+        node[_END] = index
+        return True
+
+    def find(self, text: str) -> list[TechMatch]:
+        """Return every name found in *text*, in vocabulary order."""
+        lowered = _lower_same_length(text)
+        end = len(text)
+        positions: dict[int, list[int]] = {}
+        for match in self._scanner.finditer(text):
+            start = match.start()
+            node = self._trie
+            i = start
+            while i < end:
+                node = node.get(lowered[i])
+                if node is None:
+                    break
+                i += 1
+                index = node.get(_END)
+                if index is not None and _is_word(text[i - 1]) != (i < end and _is_word(text[i])):
+                    starts = positions.setdefault(index, [])
+                    # A name and its alias can both match at one start ("Vue.js").
+                    if not starts or starts[-1] != start:
+                        starts.append(start)
+        return [
+            TechMatch(name=self.names[index], positions=tuple(positions[index]))
+            for index in sorted(positions)
+        ]
+
+
+# Trie key marking the end of a name; never a single character.
+_END = ""
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a trie as a regex alternation sharing common prefixes."""
+    branches = [
+        re.escape(ch) + _trie_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch != _END
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if _END in node else body
+
+
+def _lower_same_length(text: str) -> str:
+    """``text.lower()``, keeping characters whose lowercase form is longer as-is."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+
+def _is_word(ch: str) -> bool:
+    """Approximate ``\\w`` for a single character."""
+    return ch.isalnum() or ch == "_"
+
+
+@dataclass(frozen=True, slots=True)
+class Technology:
+    """One vocabulary entry: canonical name, category and alternative spellings."""
+
+    name: str
+    category: str
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Vocabulary:
+    """A loaded technology vocabulary and the matcher compiled from it."""
+
+    technologies: tuple[Technology, ...]
+    matcher: TechMatcher
+    path: Path
+    mtime: float
+
+    def category(self, name: str) -> str | None:
+        """Return the category of canonical technology *name*, if known."""
+        for tech in self.technologies:
+            if tech.name == name:
+                return tech.category
+        return None
+
+
+def load_vocabulary(path: str | Path) -> Vocabulary:
+    """Read a vocabulary JSON file and compile its matcher.
+
+    The file is a list of ``{"name", "category", "aliases"}`` objects; list
+    order is the order technologies are reported in.
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    technologies = tuple(
+        Technology(
+            name=item["name"],
+            category=item.get("category", ""),
+            aliases=tuple(item.get("aliases") or ()),
+        )
+        for item in raw
+    )
+    matcher = TechMatcher(
+        (tech.name for tech in technologies),
+        {alias: tech.name for tech in technologies for alias in tech.aliases},
+    )
+    return Vocabulary(technologies=technologies, matcher=matcher, path=path, mtime=mtime)
+
+
+def reload_vocabulary() -> Vocabulary:
+    """Load the configured vocabulary file now, replacing the active one."""
+    global _vocabulary, _vocabulary_checked_at  # noqa: PLW0603
+    _vocabulary = load_vocabulary(settings.tech_vocabulary_path or DEFAULT_VOCABULARY_PATH)
+    _vocabulary_checked_at = time.monotonic()
+    logger.info(
+        "Loaded %d technologies from %s", len(_vocabulary.technologies), _vocabulary.path
+    )
+    return _vocabulary
+
+
+def vocabulary() -> Vocabulary:
+    """Return the active vocabulary, reloading it if its file has changed.
+
+    The file's mtime is checked at most every
+    ``settings.tech_vocabulary_reload_interval`` seconds (0 disables the
+    check).  A file that fails to load is logged and the previous
+    vocabulary stays active.
+    """
+    global _vocabulary_checked_at  # noqa: PLW0603
+    interval = settings.tech_vocabulary_reload_interval
+    now = time.monotonic()
+    if interval > 0 and now - _vocabulary_checked_at >= interval:
+        _vocabulary_checked_at = now
+        try:
+            if os.stat(_vocabulary.path).st_mtime != _vocabulary.mtime:
+                reload_vocabulary()
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Keeping previous technology vocabulary: %s", exc)
+    return _vocabulary
+
+
+_vocabulary: Vocabulary
+_vocabulary_checked_at = 0.0
+reload_vocabulary()
 
 # Patterns tried in order to extract the company name.
 _COMPANY_PATTERNS: list[re.Pattern[str]] = [
@@ -58,6 +221,20 @@ _COMPANY_PATTERNS: list[re.Pattern[str]] = [
     re.compile(r"([A-Z][A-Za-z0-9.\-]+)\s+is\s+(?:looking|hiring|seeking|building)"),
 ]
 
+# Section headings and how much a technology mention under them counts
+# towards its relevance.  Mentions before any heading weigh 1.0.
+_SECTION_WEIGHTS: list[tuple[re.Pattern[str], float]] = [
+    (re.compile(r"nice[\s-]to[\s-]have|bonus|preferred|pluses|a plus|good to have", re.I), 0.5),
+    (re.compile(r"requirements|qualifications|must[\s-]have|required|what you(?:'ll)? (?:need|bring)|tech stack", re.I), 2.0),
+    (re.compile(r"responsibilities|what you(?:'ll)? do|the role|about the job", re.I), 1.5),
+]
+
+# A heading is a short line, optionally markdown-prefixed and colon-terminated.
+_HEADING_LINE = re.compile(r"^[ \t]*(?:#+[ \t]*)?([^\n]{1,40}?)[ \t]*:?[ \t]*$", re.M)
+
+# Weight of a tech's earliest mention, scaled from 1.0 (start) to 0.0 (end).
+_EARLY_MENTION_BONUS = 1.0
+
 
 def extract_metadata(job_description: str) -> JobMetadata:
     """Return a ``JobMetadata`` from free-form *job_description* text."""
@@ -106,15 +283,68 @@ def _extract_role(text: str) -> str:
     return "Software Engineer"
 
 
-def _extract_technologies(text: str, limit: int = 10) -> list[str]:
-    seen: set[str] = set()
-    unique: list[str] = []
+def find_technologies(text: str) -> list[TechMatch]:
+    """Return every known technology in *text* with its match positions.
+
+    Aliases are reported under their canonical name.
+    """
+    return vocabulary().matcher.find(text)
 
-    for tech, pattern in _TECH_PATTERNS:
-        if pattern.search(text):
-            key = tech.lower()
-            if key not in seen:
-                seen.add(key)
-                unique.append(tech)
 
-    return unique[:limit]
+# Word tokens; a trailing run of "+" or "#" is kept so "C++" and "C#" survive.
+_TOKEN = re.compile(r"\w+[+#]*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split *text* into lowercase word tokens for full-text search.
+
+    Uses the same notion of a word as the technology matcher's ``\\b``
+    boundaries, so "Node.js" yields ``["node", "js"]``.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+def rank_technologies(text: str, matches: list[TechMatch]) -> list[TechMatch]:
+    """Order *matches* by relevance to *text*, most relevant first.
+
+    Each mention scores the weight of the section it appears in (e.g.
+    "Requirements" counts more than "Nice to have"), and the earliest
+    mention adds a bonus that shrinks towards the end of the text.  Ties
+    keep vocabulary order.
+    """
+    sections = _section_weights(text)
+    length = max(len(text), 1)
+
+    def score(match: TechMatch) -> float:
+        mentions = sum(_weight_at(sections, pos) for pos in match.positions)
+        return mentions + _EARLY_MENTION_BONUS * (1 - match.positions[0] / length)
+
+    return sorted(matches, key=score, reverse=True)
+
+
+def _section_weights(text: str) -> list[tuple[int, float]]:
+    """Return ``(offset, weight)`` for every recognised section heading."""
+    sections: list[tuple[int, float]] = []
+    for line in _HEADING_LINE.finditer(text):
+        heading = line.group(1)
+        for pattern, weight in _SECTION_WEIGHTS:
+            if pattern.search(heading):
+                sections.append((line.start(), weight))
+                break
+    return sections
+
+
+def _weight_at(sections: list[tuple[int, float]], pos: int) -> float:
+    weight = 1.0
+    for offset, section_weight in sections:
+        if offset > pos:
+            break
+        weight = section_weight
+    return weight
+
+
+def _extract_technologies(text: str, limit: int = 10) -> list[str]:
+    matches = find_technologies(text)
+    if settings.tech_ranking == "relevance":
+        matches = rank_technologies(text, matches)
+    return [match.name for match in matches[:limit]]
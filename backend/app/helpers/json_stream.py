@@ -0,0 +1,95 @@
+"""Incremental scanner for a JSON object that arrives in chunks.
+
+Used while the synthesis answer is still streaming: every time one of the
+object's top-level members is complete, its key and raw JSON text are
+reported so that the section can be validated and sent to the client
+without waiting for the rest of the document.
+"""
+
+from __future__ import annotations
+
+import json
+
+_OPENERS = "{["
+_CLOSERS = "}]"
+
+
+class SectionParser:
+    """Report top-level members of a streamed JSON object as they complete.
+
+    Text before the opening ``{`` (e.g. a stray markdown fence) is ignored,
+    as is anything after the closing ``}``.  The parser only tracks string,
+    escape and nesting state; members are not decoded, so callers should
+    ``json.loads`` the returned text themselves.
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._closed = False
+        self._in_string = False
+        self._escape = False
+        self._key_chars: list[str] | None = None
+        self._key: str | None = None
+        self._value_chars: list[str] | None = None
+
+    @property
+    def closed(self) -> bool:
+        """True once the top-level object's closing brace has been seen."""
+        return self._closed
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        """Consume *chunk* and return ``(key, raw_json)`` for members it completed."""
+        completed: list[tuple[str, str]] = []
+        for ch in chunk:
+            if self._closed:
+                break
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._key = json.loads("".join(self._key_chars))
+                        self._key_chars = None
+                continue
+
+            if self._depth == 1:
+                if ch == '"' and self._key is None:
+                    self._in_string = True
+                    self._key_chars = [ch]
+                    continue
+                if ch == ":" and self._key is not None and self._value_chars is None:
+                    self._value_chars = []
+                    continue
+                if ch in ",}":
+                    if self._key is not None and self._value_chars is not None:
+                        completed.append((self._key, "".join(self._value_chars).strip()))
+                    self._key = None
+                    self._value_chars = None
+                    if ch == "}":
+                        self._depth = 0
+                        self._closed = True
+                    continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in _OPENERS:
+                self._depth += 1
+            elif ch in _CLOSERS:
+                self._depth -= 1
+            self._append(ch)
+        return completed
+
+    def _append(self, ch: str) -> None:
+        if self._key_chars is not None:
+            self._key_chars.append(ch)
+        elif self._value_chars is not None:
+            self._value_chars.append(ch)
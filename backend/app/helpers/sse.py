@@ -1,10 +1,27 @@
-"""Helpers for formatting Server-Sent Events."""
+"""Helpers for formatting Server-Sent Events.
+
+Events that never change (the step list, every progress update) are
+serialised once at import.  Payloads that are already JSON — a Pydantic
+model, or text wrapped in ``RawJSON`` — are embedded as-is rather than
+being turned into dicts and serialised again.  ``orjson`` is used for the
+remaining encoding when it is installed.
+"""
 
 from __future__ import annotations
 
 import json
 from typing import Any
 
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Which encoder ``event()`` uses: "orjson" or "json".
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
 # Step definitions displayed in the frontend streaming UI.
 PIPELINE_STEPS: list[dict[str, str]] = [
     {"emoji": "⏳", "text": "Extracting job details..."},
@@ -15,22 +32,45 @@ PIPELINE_STEPS: list[dict[str, str]] = [
 ]
 
 
+class RawJSON(str):
+    """Text that is already valid JSON, to be embedded in an event verbatim."""
+
+    __slots__ = ()
+
+
+def _dumps(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
 def event(data: dict[str, Any]) -> str:
     """Serialise *data* as a single SSE ``data:`` line."""
-    return f"data: {json.dumps(data)}\n\n"
+    return f"data: {_dumps(data)}\n\n"
+
+
+def _event_with(fields: dict[str, Any], key: str, value: Any) -> str:
+    """Like ``event({**fields, key: value})``, embedding *value* without a
+    round trip through Python objects when it is already JSON."""
+    if isinstance(value, BaseModel):
+        payload = value.model_dump_json()
+    elif isinstance(value, RawJSON):
+        payload = value
+    else:
+        payload = _dumps(value)
+    head = _dumps(fields)[:-1]  # drop the closing brace
+    return f'data: {head},"{key}":{payload}}}\n\n'
+
+
+_STEPS_EVENT = event({"type": "steps", "steps": PIPELINE_STEPS})
 
 
 def steps_event() -> str:
     """Return the initial SSE event that defines the pipeline steps."""
-    return event({"type": "steps", "steps": PIPELINE_STEPS})
+    return _STEPS_EVENT
 
 
-def progress_event(step_index: int, status: str) -> str:
-    """Return a progress SSE event.
-
-    *status* is ``"active"`` or ``"done"``.
-    Progress percentage is derived from the step index.
-    """
+def _progress(step_index: int, status: str) -> str:
     total = len(PIPELINE_STEPS)
     frac = (step_index + (1.0 if status == "done" else 0.5)) / total
     return event(
@@ -43,9 +83,48 @@ def progress_event(step_index: int, status: str) -> str:
     )
 
 
-def result_event(data: dict[str, Any]) -> str:
-    """Return the final result SSE event."""
-    return event({"type": "result", "data": data})
+_PROGRESS_EVENTS = {
+    (step_index, status): _progress(step_index, status)
+    for step_index in range(len(PIPELINE_STEPS))
+    for status in ("active", "done")
+}
+
+
+def progress_event(step_index: int, status: str) -> str:
+    """Return a progress SSE event.
+
+    *status* is ``"active"`` or ``"done"``.
+    Progress percentage is derived from the step index.
+    """
+    cached = _PROGRESS_EVENTS.get((step_index, status))
+    return cached if cached is not None else _progress(step_index, status)
+
+
+def partial_event(text: str) -> str:
+    """Return a partial-output SSE event carrying a chunk of the raw synthesis."""
+    return event({"type": "partial", "text": text})
+
+
+def section_event(name: str, data: Any) -> str:
+    """Return an SSE event carrying one validated ``AnalysisResult`` section.
+
+    *data* may be plain Python data or ``RawJSON``.
+    """
+    return _event_with({"type": "section", "name": name}, "data", data)
+
+
+def result_event(data: dict[str, Any] | BaseModel | RawJSON) -> str:
+    """Return the final result SSE event.
+
+    Pass the ``AnalysisResult`` itself (or its JSON as ``RawJSON``) to have
+    it serialised in one step by Pydantic.
+    """
+    return _event_with({"type": "result"}, "data", data)
+
+
+def trace_event(trace: dict[str, Any]) -> str:
+    """Return the SSE event carrying the request's trace (sent last)."""
+    return event({"type": "trace", "trace": trace})
 
 
 def error_event(message: str) -> str:
@@ -13,7 +13,8 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.controllers import router
-from app.services import you_client
+from app.repositories import result_cache
+from app.services import loop_lag, offload, tracing, you_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,8 +27,14 @@ FRONTEND_DIST = Path(__file__).parent.parent.parent / "dist"
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage startup / shutdown of shared resources."""
     await you_client.startup()
+    await result_cache.startup()
+    loop_lag.startup()
     logger.info("Application started")
     yield
+    await loop_lag.shutdown()
+    await result_cache.shutdown()
+    offload.shutdown()
+    await tracing.shutdown()
     await you_client.shutdown()
     logger.info("Application shut down")
 
@@ -42,6 +49,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
     # API routes
@@ -6,6 +6,7 @@ from app.models.analysis import (
     AnalysisResult,
     Citation,
     CompanyInsight,
+    HistorySummary,
     InterviewFocus,
     PracticeQuestion,
     Resource,
@@ -22,6 +23,7 @@ __all__ = [
     "AnalysisResult",
     "Citation",
     "CompanyInsight",
+    "HistorySummary",
     "InterviewFocus",
     "JobMetadata",
     "PracticeQuestion",
@@ -64,6 +64,16 @@ class SavedAnalysis(BaseModel):
     savedAt: int  # Unix timestamp (ms)
 
 
+class HistorySummary(BaseModel):
+    """The fields of a ``SavedAnalysis`` shown in history listings."""
+
+    id: str
+    companyName: str
+    roleTitle: str
+    savedAt: int  # Unix timestamp (ms)
+    jobDescriptionPreview: str
+
+
 class SaveHistoryRequest(BaseModel):
     jobDescription: str = Field(..., min_length=1)
     results: AnalysisResult
@@ -7,3 +7,6 @@ from pydantic import BaseModel, Field
 
 class PrepareRequest(BaseModel):
     jobDescription: str = Field(..., min_length=1)
+    # Skip the result cache lookup and run the full pipeline; the fresh
+    # result still replaces the cached one.
+    bypassCache: bool = False
@@ -1,17 +1,33 @@
 """Data access layer (repositories / stores)."""
 
+from app.repositories.history_backends import (
+    HistoryBackend,
+    MemoryHistoryBackend,
+    SQLiteHistoryBackend,
+)
 from app.repositories.history_store import (
     clear_store,
+    configure_backend,
     delete,
     get_by_id,
     list_all,
+    list_page,
+    list_summaries,
     save,
+    search,
 )
 
 __all__ = [
+    "HistoryBackend",
+    "MemoryHistoryBackend",
+    "SQLiteHistoryBackend",
     "clear_store",
+    "configure_backend",
     "delete",
     "get_by_id",
     "list_all",
+    "list_page",
+    "list_summaries",
     "save",
+    "search",
 ]
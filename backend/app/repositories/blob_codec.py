@@ -0,0 +1,166 @@
+"""Compression of serialised history entries.
+
+Saved analyses are JSON with the same keys, difficulty labels and
+categories in every entry, so each blob is compressed against a shared
+preset dictionary built from a representative entry.  Even a short entry
+then finds most of its structure in the dictionary, so it compresses well
+instead of paying for the repeated keys.
+
+Every blob starts with one tag byte naming its method, so blobs written
+with one method still decode after the configured method changes.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+_TAG_NONE = b"\x00"
+_TAG_ZLIB = b"\x01"
+_TAG_ZSTD = b"\x02"
+
+
+def _build_dictionary() -> bytes:
+    """Return a preset dictionary covering the JSON skeleton of a saved analysis.
+
+    The dictionary is one synthetic ``SavedAnalysis`` serialised the way
+    entries are stored, with every section filled in and the usual
+    difficulty labels and categories, so the keys, labels and common
+    phrases of a real entry appear in it in their usual order.  It must
+    never change: blobs already stored can only be decompressed with the
+    dictionary that compressed them.
+    """
+    from app.models import (
+        AnalysisResult,
+        Citation,
+        CompanyInsight,
+        InterviewFocus,
+        PracticeQuestion,
+        Resource,
+        SavedAnalysis,
+        TechAnalysis,
+        TechPoint,
+    )
+
+    citation = Citation(title="Engineering Blog", domain="github.com", url="https://www.")
+    sample = SavedAnalysis(
+        id="00000000-0000-4000-8000-000000000000",
+        jobDescription=(
+            "About the role: We are looking for a Senior Software Engineer to join our team. "
+            "Responsibilities: design, build and maintain scalable services. "
+            "Requirements: years of experience with Python, TypeScript, React, AWS, "
+            "PostgreSQL, Kubernetes and distributed systems. Nice to have: "
+        ),
+        companyName="Company",
+        roleTitle="Company Analysis",
+        results=AnalysisResult(
+            companyName="Company",
+            companyIntelligence=[
+                CompanyInsight(text="The company is ", citation=citation),
+                CompanyInsight(text="Recent funding and growth of the engineering team."),
+            ],
+            techAnalysis=[
+                TechAnalysis(
+                    name="Python",
+                    points=[
+                        TechPoint(text="Used for backend services and APIs.", citation=citation),
+                        TechPoint(text="Expect questions on performance and testing."),
+                    ],
+                ),
+            ],
+            interviewFocus=[
+                InterviewFocus(topic="System Design", difficulty="Hard", description="Design a "),
+                InterviewFocus(topic="Coding", difficulty="Medium", description="Data structures and "),
+            ],
+            practiceQuestions=[
+                PracticeQuestion(
+                    question="How would you design a ",
+                    difficulty="Hard",
+                    category="System Design",
+                    hint="Think about scalability, caching and trade-offs.",
+                ),
+                PracticeQuestion(
+                    question="Explain the difference between ",
+                    difficulty="Easy",
+                    category="Technical",
+                    hint="Consider ",
+                ),
+                PracticeQuestion(
+                    question="Tell me about a time you ",
+                    difficulty="Medium",
+                    category="Behavioral",
+                    hint="Use the STAR method.",
+                ),
+            ],
+            resources=[
+                Resource(
+                    title="Documentation",
+                    domain="docs.python.org",
+                    url="https://docs.",
+                    description="Official documentation for ",
+                ),
+            ],
+        ),
+        savedAt=1700000000000,
+    )
+    return sample.model_dump_json().encode()
+
+
+class BlobCodec:
+    """Compresses text to tagged blobs and back.
+
+    *method* is ``"none"``, ``"zlib"`` or ``"zstd"`` (requires the optional
+    ``zstandard`` package).  Both compressors use the same preset dictionary.
+    """
+
+    def __init__(self, method: str = "zlib", level: int | None = None) -> None:
+        if method not in ("none", "zlib", "zstd"):
+            raise ValueError(f"Unknown compression method: {method!r}")
+        self.method = method
+        self.dictionary = _build_dictionary()
+        self._zlib_level = level if level is not None else 6
+        self._zstd_level = level if level is not None else 3
+        self._zstd: Any = None
+        if method == "zstd":
+            self._zstd = _zstd_codecs(self.dictionary, self._zstd_level)
+
+    def encode(self, text: str) -> bytes:
+        data = text.encode()
+        if self.method == "zlib":
+            compressor = zlib.compressobj(
+                self._zlib_level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=self.dictionary
+            )
+            return _TAG_ZLIB + compressor.compress(data) + compressor.flush()
+        if self.method == "zstd":
+            compressor, _decompressor = self._zstd
+            return _TAG_ZSTD + compressor.compress(data)
+        return _TAG_NONE + data
+
+    def decode(self, blob: bytes) -> str:
+        tag, payload = blob[:1], blob[1:]
+        if tag == _TAG_ZLIB:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=self.dictionary)
+            return (decompressor.decompress(payload) + decompressor.flush()).decode()
+        if tag == _TAG_ZSTD:
+            if self._zstd is None:
+                self._zstd = _zstd_codecs(self.dictionary, self._zstd_level)
+            _compressor, decompressor = self._zstd
+            return decompressor.decompress(payload).decode()
+        if tag == _TAG_NONE:
+            return payload.decode()
+        raise ValueError(f"Unknown blob tag: {tag!r}")
+
+
+def _zstd_codecs(dictionary: bytes, level: int) -> tuple[Any, Any]:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd history compression needs the 'zstandard' package; install it "
+            "or set history_compression to 'zlib'."
+        ) from exc
+    preset = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    return (
+        zstandard.ZstdCompressor(level=level, dict_data=preset),
+        zstandard.ZstdDecompressor(dict_data=preset),
+    )
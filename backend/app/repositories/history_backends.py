@@ -0,0 +1,496 @@
+"""Storage backends for saved analyses.
+
+``history_store`` delegates to one of these.  ``MemoryHistoryBackend`` keeps
+entries in a dict (lost on restart, per process); ``SQLiteHistoryBackend``
+persists them in an embedded SQLite database that several worker processes
+can share.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Protocol
+
+from app.helpers.job_parser import tokenize
+from app.repositories.blob_codec import BlobCodec
+from app.repositories.search_index import InvertedIndex
+
+if TYPE_CHECKING:
+    from app.models import HistorySummary, SavedAnalysis
+
+
+# Length of the job-description excerpt kept in each summary.
+PREVIEW_CHARS = 160
+
+# Position of an entry in history order: ``(savedAt, id)``.  Listings run
+# from the largest key (newest) down.
+SortKey = tuple[int, str]
+
+
+def sort_key(entry: SavedAnalysis | HistorySummary) -> SortKey:
+    return (entry.savedAt, entry.id)
+
+
+def summarize(entry: SavedAnalysis) -> HistorySummary:
+    """Return the listing summary stored alongside *entry*."""
+    from app.models import HistorySummary
+
+    return HistorySummary(
+        id=entry.id,
+        companyName=entry.companyName,
+        roleTitle=entry.roleTitle,
+        savedAt=entry.savedAt,
+        jobDescriptionPreview=entry.jobDescription[:PREVIEW_CHARS],
+    )
+
+
+# Searchable text of an entry, and how much a match in each field counts.
+SEARCH_FIELD_WEIGHTS = {
+    "company": 4.0,
+    "technologies": 3.0,
+    "questions": 2.0,
+    "job_description": 1.0,
+}
+
+
+def search_fields(entry: SavedAnalysis) -> dict[str, str]:
+    """Return the text of *entry* indexed for search, by field."""
+    results = entry.results
+    return {
+        "company": entry.companyName,
+        "technologies": " ".join(tech.name for tech in results.techAnalysis),
+        "questions": " ".join(q.question for q in results.practiceQuestions),
+        "job_description": entry.jobDescription,
+    }
+
+
+class HistoryBackend(Protocol):
+    """Storage interface used by ``history_store``."""
+
+    def list_all(self) -> list[SavedAnalysis]:
+        """Return all entries, newest first."""
+        ...
+
+    def list_page(
+        self, limit: int | None = None, before: SortKey | None = None
+    ) -> list[HistorySummary]:
+        """Return up to *limit* summaries (all if ``None``), newest first,
+        strictly older than *before*."""
+        ...
+
+    def search(self, query: str, limit: int) -> list[HistorySummary]:
+        """Return up to *limit* summaries of entries matching *query*, best first."""
+        ...
+
+    def get(self, id: str) -> SavedAnalysis | None:
+        """Return one entry, or ``None``."""
+        ...
+
+    def put(self, entry: SavedAnalysis, summary: HistorySummary) -> None:
+        """Insert (or replace) *entry* together with its listing summary."""
+        ...
+
+    def delete(self, id: str) -> bool:
+        """Remove an entry.  Returns True if it existed."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        ...
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of entries, their approximate size in bytes and
+        how many were evicted or expired."""
+        ...
+
+
+class MemoryHistoryBackend:
+    """Per-process dict of entries plus a sorted index kept up to date on writes.
+
+    Listing a page is a binary search plus a slice of the index, without
+    copying or re-sorting the whole store, and only touches the summaries.
+
+    The store is bounded: once it holds more than *max_entries* entries or
+    *max_bytes* of serialised entries, it evicts either the least recently
+    used entry (``eviction="lru"``; ``get`` counts as a use) or the oldest
+    saved one (``eviction="age"``).  Entries saved more than *max_age*
+    seconds ago are dropped as well.  A limit of 0 disables it.
+
+    Entries are held as compressed JSON blobs (see ``BlobCodec``) and only
+    decoded by ``get`` and ``list_all``; *max_bytes* counts blob sizes.
+
+    Safe to call from several threads: every public method holds one lock
+    (blobs are encoded and decoded outside it).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        max_age: float = 0,
+        eviction: str = "lru",
+        compression: str = "zlib",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if eviction not in ("lru", "age"):
+            raise ValueError(f"Unknown eviction policy: {eviction!r}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.eviction = eviction
+        self._clock = clock
+        self._codec = BlobCodec(compression)
+        self._blobs: dict[str, bytes] = {}
+        self._summaries: dict[str, HistorySummary] = {}
+        self._order: list[SortKey] = []  # ascending; newest last
+        self._index = InvertedIndex(SEARCH_FIELD_WEIGHTS)
+        # id -> blob size; ordered least → most recently used.
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        # History handlers run in FastAPI's threadpool; one lock covers the
+        # dicts, the sorted index, the search index and the LRU order.
+        self._lock = threading.Lock()
+
+    def list_all(self) -> list[SavedAnalysis]:
+        with self._lock:
+            self._expire()
+            blobs = [self._blobs[id] for _saved_at, id in reversed(self._order)]
+        return [self._decode(blob) for blob in blobs]
+
+    def list_page(
+        self, limit: int | None = None, before: SortKey | None = None
+    ) -> list[HistorySummary]:
+        with self._lock:
+            self._expire()
+            end = len(self._order) if before is None else bisect.bisect_left(self._order, before)
+            start = 0 if limit is None else max(0, end - limit)
+            return [self._summaries[id] for _saved_at, id in reversed(self._order[start:end])]
+
+    def search(self, query: str, limit: int) -> list[HistorySummary]:
+        with self._lock:
+            self._expire()
+            return [self._summaries[id] for id in self._index.search(query, limit)]
+
+    def get(self, id: str) -> SavedAnalysis | None:
+        with self._lock:
+            self._expire()
+            blob = self._blobs.get(id)
+            if blob is None:
+                return None
+            if self.eviction == "lru":
+                self._sizes.move_to_end(id)
+        return self._decode(blob)
+
+    def put(self, entry: SavedAnalysis, summary: HistorySummary) -> None:
+        blob = self._codec.encode(entry.model_dump_json())
+        fields = search_fields(entry)
+        with self._lock:
+            self._remove(entry.id)
+            self._blobs[entry.id] = blob
+            self._summaries[entry.id] = summary
+            bisect.insort(self._order, sort_key(entry))
+            self._index.add(entry.id, fields)
+            self._sizes[entry.id] = len(blob)
+            self._bytes += len(blob)
+            self._expire()
+            self._evict()
+
+    def delete(self, id: str) -> bool:
+        with self._lock:
+            return self._remove(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blobs.clear()
+            self._summaries.clear()
+            self._order.clear()
+            self._index.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return current size and eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._blobs),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _expire(self) -> None:
+        if not self.max_age or not self._order:
+            return
+        cutoff = (self._clock() - self.max_age) * 1000  # savedAt is in ms
+        while self._order and self._order[0][0] < cutoff:
+            self._remove(self._order[0][1])
+            self.expirations += 1
+
+    def _evict(self) -> None:
+        while (self.max_entries and len(self._blobs) > self.max_entries) or (
+            self.max_bytes and self._bytes > self.max_bytes
+        ):
+            if self.eviction == "lru":
+                victim = next(iter(self._sizes))
+            else:
+                victim = self._order[0][1]
+            self._remove(victim)
+            self.evictions += 1
+
+    def _decode(self, blob: bytes) -> SavedAnalysis:
+        from app.models import SavedAnalysis
+
+        return SavedAnalysis.model_validate_json(self._codec.decode(blob))
+
+    def _remove(self, id: str) -> bool:
+        if self._blobs.pop(id, None) is None:
+            return False
+        summary = self._summaries.pop(id)
+        del self._order[bisect.bisect_left(self._order, sort_key(summary))]
+        self._index.remove(id)
+        self._bytes -= self._sizes.pop(id)
+        return True
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_analyses (
+    id              TEXT PRIMARY KEY,
+    saved_at        INTEGER NOT NULL,
+    company_name    TEXT NOT NULL,
+    role_title      TEXT NOT NULL,
+    preview         TEXT NOT NULL DEFAULT '',
+    job_description TEXT NOT NULL,
+    results         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_saved_analyses_saved_at
+    ON saved_analyses (saved_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_saved_analyses_company_name
+    ON saved_analyses (company_name);
+"""
+
+# Full-text index kept in step with ``saved_analyses`` by put/delete/clear.
+# "+", "#" and "_" are word characters, matching ``tokenize``, so "C++" and "C#"
+# stay searchable.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS saved_analyses_fts USING fts5(
+    id UNINDEXED,
+    company,
+    technologies,
+    questions,
+    job_description,
+    tokenize = "unicode61 remove_diacritics 0 tokenchars '+#_'"
+);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the prepared form on every call.
+_COLUMNS = "id, saved_at, company_name, role_title, job_description, results"
+_SQL_LIST = f"SELECT {_COLUMNS} FROM saved_analyses ORDER BY saved_at DESC, id DESC"
+# Summary listings only read the small leading columns of each row.
+_SUMMARY_COLUMNS = "id, saved_at, company_name, role_title, preview"
+_SQL_PAGE = (
+    f"SELECT {_SUMMARY_COLUMNS} FROM saved_analyses "
+    "ORDER BY saved_at DESC, id DESC LIMIT ?"
+)
+_SQL_PAGE_BEFORE = (
+    f"SELECT {_SUMMARY_COLUMNS} FROM saved_analyses WHERE (saved_at, id) < (?, ?) "
+    "ORDER BY saved_at DESC, id DESC LIMIT ?"
+)
+_SQL_GET = f"SELECT {_COLUMNS} FROM saved_analyses WHERE id = ?"
+_SQL_PUT = (
+    f"INSERT OR REPLACE INTO saved_analyses ({_COLUMNS}, preview) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_DELETE = "DELETE FROM saved_analyses WHERE id = ?"
+_SQL_CLEAR = "DELETE FROM saved_analyses"
+_SQL_COUNT = "SELECT COUNT(*) FROM saved_analyses"
+_SQL_FTS_PUT = (
+    "INSERT INTO saved_analyses_fts (id, company, technologies, questions, job_description) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_FTS_DELETE = "DELETE FROM saved_analyses_fts WHERE id = ?"
+_SQL_FTS_CLEAR = "DELETE FROM saved_analyses_fts"
+# bm25() takes one weight per column, including the unindexed id.
+_SQL_SEARCH = (
+    "SELECT s.id, s.saved_at, s.company_name, s.role_title, s.preview "
+    "FROM saved_analyses_fts AS f JOIN saved_analyses AS s ON s.id = f.id "
+    "WHERE saved_analyses_fts MATCH ? "
+    "ORDER BY bm25(saved_analyses_fts, 0, {}) LIMIT ?".format(
+        ", ".join(str(weight) for weight in SEARCH_FIELD_WEIGHTS.values())
+    )
+)
+
+
+class SQLiteHistoryBackend:
+    """Entries persisted in a SQLite database file (WAL mode).
+
+    One connection per backend, serialised with a lock; separate worker
+    processes each open their own connection to the same file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; each statement is its own transaction
+            cached_statements=64,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def list_all(self) -> list[SavedAnalysis]:
+        with self._lock:
+            rows = self._conn.execute(_SQL_LIST).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def list_page(
+        self, limit: int | None = None, before: SortKey | None = None
+    ) -> list[HistorySummary]:
+        limit = -1 if limit is None else limit  # SQLite: negative LIMIT = no limit
+        with self._lock:
+            if before is None:
+                rows = self._conn.execute(_SQL_PAGE, (limit,)).fetchall()
+            else:
+                rows = self._conn.execute(_SQL_PAGE_BEFORE, (*before, limit)).fetchall()
+        return [_row_to_summary(row) for row in rows]
+
+    def search(self, query: str, limit: int) -> list[HistorySummary]:
+        match = _fts_query(query)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(_SQL_SEARCH, (match, limit)).fetchall()
+        return [_row_to_summary(row) for row in rows]
+
+    def get(self, id: str) -> SavedAnalysis | None:
+        with self._lock:
+            row = self._conn.execute(_SQL_GET, (id,)).fetchone()
+        return _row_to_entry(row) if row else None
+
+    def put(self, entry: SavedAnalysis, summary: HistorySummary) -> None:
+        params = (
+            entry.id,
+            entry.savedAt,
+            entry.companyName,
+            entry.roleTitle,
+            entry.jobDescription,
+            entry.results.model_dump_json(),
+            summary.jobDescriptionPreview,
+        )
+        fields = search_fields(entry)
+        with self._lock, self._transaction():
+            self._conn.execute(_SQL_PUT, params)
+            self._conn.execute(_SQL_FTS_DELETE, (entry.id,))
+            self._conn.execute(_SQL_FTS_PUT, (entry.id, *fields.values()))
+
+    def delete(self, id: str) -> bool:
+        with self._lock, self._transaction():
+            self._conn.execute(_SQL_FTS_DELETE, (id,))
+            return self._conn.execute(_SQL_DELETE, (id,)).rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock, self._transaction():
+            self._conn.execute(_SQL_FTS_CLEAR)
+            self._conn.execute(_SQL_CLEAR)
+
+    def stats(self) -> dict[str, int]:
+        # Entries are never evicted from SQLite; bytes is the database size.
+        with self._lock:
+            (entries,) = self._conn.execute(_SQL_COUNT).fetchone()
+            (pages,) = self._conn.execute("PRAGMA page_count").fetchone()
+            (page_size,) = self._conn.execute("PRAGMA page_size").fetchone()
+        return {"entries": entries, "bytes": pages * page_size, "evictions": 0, "expirations": 0}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self, mode: str = "") -> Iterator[None]:
+        self._conn.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _migrate(self) -> None:
+        """Bring databases created by older versions up to the current schema.
+
+        Every worker process runs this at startup, possibly at the same
+        time: the checks and changes share one ``BEGIN IMMEDIATE``
+        transaction, so the workers take turns and later ones find the
+        schema already up to date.
+        """
+        with self._transaction("IMMEDIATE"):
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(saved_analyses)")
+            }
+            if "preview" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE saved_analyses ADD COLUMN preview TEXT NOT NULL DEFAULT ''"
+                )
+                self._conn.execute(
+                    "UPDATE saved_analyses SET preview = substr(job_description, 1, ?)",
+                    (PREVIEW_CHARS,),
+                )
+            # The search index arrived after the table: index existing rows
+            # once, when it is still empty.
+            self._conn.execute(_FTS_SCHEMA)
+            if self._conn.execute("SELECT 1 FROM saved_analyses_fts LIMIT 1").fetchone() is None:
+                for row in self._conn.execute(_SQL_LIST).fetchall():
+                    entry = _row_to_entry(row)
+                    self._conn.execute(_SQL_FTS_PUT, (entry.id, *search_fields(entry).values()))
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every token required, the last as a prefix."""
+    tokens = tokenize(query)
+    if not tokens:
+        return ""
+    quoted = ['"' + token.replace('"', '""') + '"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _row_to_summary(row: tuple) -> HistorySummary:
+    from app.models import HistorySummary
+
+    id, saved_at, company_name, role_title, preview = row
+    return HistorySummary(
+        id=id,
+        companyName=company_name,
+        roleTitle=role_title,
+        savedAt=saved_at,
+        jobDescriptionPreview=preview,
+    )
+
+
+def _row_to_entry(row: tuple) -> SavedAnalysis:
+    from app.models import AnalysisResult, SavedAnalysis
+
+    id, saved_at, company_name, role_title, job_description, results = row
+    return SavedAnalysis(
+        id=id,
+        jobDescription=job_description,
+        companyName=company_name,
+        roleTitle=role_title,
+        results=AnalysisResult.model_validate_json(results),
+        savedAt=saved_at,
+    )
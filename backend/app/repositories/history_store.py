@@ -1,28 +1,108 @@
-"""In-memory store for saved analyses (history). Replace with DB/Redis for persistence."""
+"""Store for saved analyses (history).
+
+Entries live in a pluggable backend (see ``history_backends``): in memory by
+default, or in SQLite when ``HISTORY_DB_PATH`` is set so that history
+survives restarts and is shared between workers.
+"""
 
 from __future__ import annotations
 
+import base64
+import binascii
+import logging
 import uuid
 from typing import TYPE_CHECKING
 
+from app.config import settings
+from app.repositories.history_backends import (
+    HistoryBackend,
+    MemoryHistoryBackend,
+    SortKey,
+    SQLiteHistoryBackend,
+    sort_key,
+    summarize,
+)
+
 if TYPE_CHECKING:
-    from app.models import AnalysisResult, SavedAnalysis
+    from app.models import AnalysisResult, HistorySummary, SavedAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+def _default_backend() -> HistoryBackend:
+    if settings.history_db_path:
+        logger.info("History stored in SQLite at %s", settings.history_db_path)
+        return SQLiteHistoryBackend(settings.history_db_path)
+    return MemoryHistoryBackend(
+        max_entries=settings.history_max_entries,
+        max_bytes=settings.history_max_bytes,
+        max_age=settings.history_max_age,
+        eviction=settings.history_eviction,
+        compression=settings.history_compression,
+    )
 
-_store: dict[str, SavedAnalysis] = {}
+
+_backend: HistoryBackend = _default_backend()
+
+
+def configure_backend(backend: HistoryBackend) -> None:
+    """Replace the storage backend."""
+    global _backend  # noqa: PLW0603
+    _backend = backend
 
 
 def list_all() -> list[SavedAnalysis]:
     """Return all saved analyses, newest first."""
-    from app.models import SavedAnalysis
+    return _backend.list_all()
+
+
+def list_summaries() -> list[HistorySummary]:
+    """Return the summaries of all saved analyses, newest first."""
+    return _backend.list_page()
 
-    items = list(_store.values())
-    items.sort(key=lambda x: x.savedAt, reverse=True)
-    return items
+
+def list_page(limit: int, cursor: str | None = None) -> tuple[list[HistorySummary], str | None]:
+    """Return up to *limit* summaries after *cursor*, newest first.
+
+    Also returns the cursor for the next page, or ``None`` on the last page.
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    before = decode_cursor(cursor) if cursor else None
+    items = _backend.list_page(limit + 1, before)
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(sort_key(items[-1]))
+
+
+def search(query: str, limit: int) -> list[HistorySummary]:
+    """Return up to *limit* summaries matching *query*, most relevant first.
+
+    Matches the company name, technologies, practice questions and job
+    description; every word must occur, and the last may be a prefix.
+    """
+    return _backend.search(query, limit)
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Return an opaque cursor pointing just after *key* in history order."""
+    saved_at, id = key
+    return base64.urlsafe_b64encode(f"{saved_at}:{id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Inverse of ``encode_cursor``.  Raises ``ValueError`` if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        saved_at, id = raw.split(":", 1)
+        return int(saved_at), id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
 
 
 def get_by_id(id: str) -> SavedAnalysis | None:
     """Return one saved analysis by id."""
-    return _store.get(id)
+    return _backend.get(id)
 
 
 def save(job_description: str, results: AnalysisResult) -> SavedAnalysis:
@@ -37,21 +117,23 @@ def save(job_description: str, results: AnalysisResult) -> SavedAnalysis:
         results=results,
         savedAt=_timestamp_ms(),
     )
-    _store[entry.id] = entry
+    _backend.put(entry, summarize(entry))
     return entry
 
 
 def delete(id: str) -> bool:
     """Remove a saved analysis. Returns True if it existed."""
-    if id in _store:
-        del _store[id]
-        return True
-    return False
+    return _backend.delete(id)
+
+
+def stats() -> dict[str, int]:
+    """Return the backend's entry count, approximate bytes and eviction counters."""
+    return _backend.stats()
 
 
 def clear_all() -> None:
     """Remove all entries. For testing only."""
-    _store.clear()
+    _backend.clear()
 
 
 def _timestamp_ms() -> int:
@@ -61,4 +143,4 @@ def _timestamp_ms() -> int:
 
 def clear_store() -> None:
     """Clear all entries. For testing only."""
-    _store.clear()
+    _backend.clear()
@@ -0,0 +1,147 @@
+"""Cache of complete analysis results, keyed by a job-description fingerprint.
+
+The backend is pluggable: an in-process LRU is used by default, and
+``configure_backend()`` swaps in a shared store (e.g. ``RedisResultCache``)
+so that several workers can serve each other's results.  Values are the
+``AnalysisResult`` JSON text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any, Protocol
+
+from app.config import settings
+from app.services.cache import TTLCache
+
+if TYPE_CHECKING:
+    from app.models import JobMetadata
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt or result schema changes so stale entries stop matching.
+_FINGERPRINT_VERSION = "1"
+
+
+class ResultCacheBackend(Protocol):
+    """Storage used by the result cache."""
+
+    async def get(self, key: str) -> str | None:
+        """Return the stored payload, or ``None`` if absent or expired."""
+        ...
+
+    async def set(self, key: str, payload: str, ttl: float) -> None:
+        """Store *payload* for *ttl* seconds."""
+        ...
+
+
+class InMemoryResultCache:
+    """Per-process backend with TTL and LRU eviction."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._cache: TTLCache[str] = TTLCache(
+            ttl=settings.result_cache_ttl,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=len,
+        )
+
+    async def get(self, key: str) -> str | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, payload: str, ttl: float) -> None:
+        self._cache.put(key, payload, ttl=ttl)
+
+
+class RedisResultCache:
+    """Shared backend on top of an async Redis-compatible client.
+
+    *client* only needs ``get`` and ``set(key, value, ex=seconds)`` coroutines,
+    as provided by ``redis.asyncio.Redis``.
+    """
+
+    def __init__(self, client: Any, prefix: str = "interview-buddy:result:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> str | None:
+        value = await self._client.get(self._prefix + key)
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def set(self, key: str, payload: str, ttl: float) -> None:
+        await self._client.set(self._prefix + key, payload, ex=max(1, int(ttl)))
+
+
+_backend: ResultCacheBackend = InMemoryResultCache(
+    max_entries=settings.result_cache_max_entries,
+    max_bytes=settings.result_cache_max_bytes,
+)
+# Redis connection owned by this module when RESULT_CACHE_REDIS_URL is set.
+_redis: Any = None
+
+
+async def startup() -> None:
+    """Connect the shared backend if one is configured.  Call once at app boot."""
+    global _redis  # noqa: PLW0603
+    if not settings.result_cache_redis_url:
+        return
+    try:
+        import redis.asyncio as redis
+    except ImportError as exc:
+        raise RuntimeError(
+            "RESULT_CACHE_REDIS_URL is set but the 'redis' package is not installed."
+        ) from exc
+    _redis = redis.from_url(settings.result_cache_redis_url)
+    configure_backend(RedisResultCache(_redis))
+    logger.info("Result cache using shared Redis backend")
+
+
+async def shutdown() -> None:
+    """Close the shared backend connection, if any.  Call once at app shutdown."""
+    global _redis  # noqa: PLW0603
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def configure_backend(backend: ResultCacheBackend) -> None:
+    """Replace the cache backend (e.g. with a shared store at startup)."""
+    global _backend  # noqa: PLW0603
+    _backend = backend
+
+
+def fingerprint(job_description: str, metadata: JobMetadata) -> str:
+    """Return a stable key for *job_description* and its extracted metadata.
+
+    Case and whitespace differences in the job description do not change
+    the fingerprint.
+    """
+    normalised = " ".join(job_description.lower().split())
+    digest = hashlib.sha256()
+    for part in (_FINGERPRINT_VERSION, normalised, metadata.model_dump_json()):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def get(key: str) -> str | None:
+    """Return the cached ``AnalysisResult`` JSON for *key*, if any.
+
+    Backend failures are logged and treated as a miss.
+    """
+    try:
+        return await _backend.get(key)
+    except Exception as exc:
+        logger.warning("Result cache lookup failed: %s", exc)
+        return None
+
+
+async def put(key: str, payload: str) -> None:
+    """Store ``AnalysisResult`` JSON under *key*; failures are logged and ignored."""
+    try:
+        await _backend.set(key, payload, settings.result_cache_ttl)
+    except Exception as exc:
+        logger.warning("Result cache store failed: %s", exc)
@@ -0,0 +1,134 @@
+"""In-memory inverted index with BM25 ranking, for searching saved analyses.
+
+Documents are made of named fields (company, technologies, ...) whose
+tokens count ``weight`` times each, so a match in the company name ranks
+above the same word deep in a job description.  ``add`` and ``remove``
+update the postings incrementally; nothing is rebuilt on write.
+
+Queries match documents containing every query token; the last token also
+matches as a prefix ("kube" finds "kubernetes"), for search-as-you-type.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+from collections import Counter
+from typing import Mapping
+
+from app.helpers.job_parser import tokenize
+
+# BM25 parameters (the usual defaults).
+_K1 = 1.2
+_B = 0.75
+# Cap on the number of index terms a trailing prefix expands to.
+_MAX_PREFIX_TERMS = 64
+
+
+class InvertedIndex:
+    """Token → ``{doc id: weighted term frequency}`` postings, plus BM25 stats."""
+
+    def __init__(self, weights: Mapping[str, float]) -> None:
+        self.weights = dict(weights)
+        self._postings: dict[str, dict[str, float]] = {}
+        self._terms: list[str] = []  # sorted; for prefix lookups
+        self._doc_terms: dict[str, Counter[str]] = {}
+        self._doc_length: dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: str, fields: Mapping[str, str]) -> None:
+        """Index *fields* of *doc_id*, replacing any earlier version."""
+        self.remove(doc_id)
+        terms: Counter[str] = Counter()
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for token in tokenize(text):
+                terms[token] += weight
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[doc_id] = frequency
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_length[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        """Drop *doc_id* from the index; a no-op if it is not indexed."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+        self._total_length -= self._doc_length.pop(doc_id)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._doc_terms.clear()
+        self._doc_length.clear()
+        self._total_length = 0.0
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Return up to *limit* ids matching *query*, best first."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._doc_terms:
+            return []
+        # Each query token becomes a group of index terms; a document must
+        # match at least one term of every group.
+        groups = [[token] for token in tokens[:-1]]
+        groups.append(self._expand_prefix(tokens[-1]))
+        group_postings = [
+            [self._postings[term] for term in group if term in self._postings]
+            for group in groups
+        ]
+        if not all(group_postings):
+            return []
+
+        group_postings.sort(key=lambda postings: sum(len(p) for p in postings))
+        candidates = set().union(*group_postings[0])
+        for postings in group_postings[1:]:
+            candidates = {doc for doc in candidates if any(doc in p for p in postings)}
+            if not candidates:
+                return []
+
+        count = len(self._doc_terms)
+        average = self._total_length / count
+        norms = {
+            doc: _K1 * (1 - _B + _B * self._doc_length[doc] / average) for doc in candidates
+        }
+        scores: dict[str, float] = dict.fromkeys(candidates, 0.0)
+        for postings in group_postings:
+            # Within a prefix group, a document scores by its best-matching term.
+            best: dict[str, float] = {}
+            for p in postings:
+                idf = math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5))
+                docs = candidates if len(candidates) < len(p) else p.keys() & candidates
+                for doc in docs:
+                    frequency = p.get(doc)
+                    if frequency:
+                        score = idf * frequency * (_K1 + 1) / (frequency + norms[doc])
+                        if score > best.get(doc, 0.0):
+                            best[doc] = score
+            for doc, score in best.items():
+                scores[doc] += score
+        return heapq.nlargest(limit, scores, key=lambda doc: (scores[doc], doc))
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        terms: list[str] = []
+        for term in self._terms[start:start + _MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
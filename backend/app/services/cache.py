@@ -0,0 +1,139 @@
+"""Bounded in-process cache with TTL expiry, LRU eviction and single-flight loads.
+
+Designed for caching results of slow upstream calls inside one worker:
+
+- entries expire ``ttl`` seconds after they were stored;
+- the least recently used entries are evicted once either ``max_entries`` or
+  ``max_bytes`` (as measured by the ``sizeof`` callback) is exceeded;
+- concurrent ``get_or_load`` calls for the same key share one in-flight load
+  instead of each hitting the upstream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """TTL + LRU cache keyed by string, with a byte-size cap and hit/miss counters."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[V], int],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        # key -> (expires_at, size, value); ordered least → most recently used.
+        self._entries: OrderedDict[str, tuple[float, int, V]] = OrderedDict()
+        self._pending: dict[str, asyncio.Task[V]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        """Approximate size of all cached values, as reported by ``sizeof``."""
+        return self._bytes
+
+    def get(self, key: str) -> V | None:
+        """Return the cached value for *key*, or ``None`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _size, value = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: V, ttl: float | None = None) -> None:
+        """Store *value* under *key*, evicting LRU entries to stay within bounds.
+
+        *ttl* overrides the cache-wide TTL for this entry.
+        """
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value or load it, sharing one load per key.
+
+        Failed loads are not cached; every caller waiting on that load gets
+        the same exception.  A caller being cancelled does not cancel the
+        shared load for the others.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._finish_load(key, t))
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters.
+
+        Loads still in flight are forgotten too: callers already waiting on
+        one get its result, but new callers start a fresh load and the old
+        result is not written back into the cache.
+        """
+        self._entries.clear()
+        self._pending.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.coalesced = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return current size and counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+    def _finish_load(self, key: str, task: asyncio.Task[V]) -> None:
+        if self._pending.get(key) is not task:
+            return  # dropped by clear()
+        del self._pending[key]
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+    def _remove(self, key: str) -> None:
+        _expires_at, size, _value = self._entries.pop(key)
+        self._bytes -= size
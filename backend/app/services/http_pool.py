@@ -0,0 +1,194 @@
+"""Shared HTTP connection pool for upstream APIs, with saturation metrics.
+
+``build_client()`` returns an ``httpx.AsyncClient`` whose transport has
+explicit pool limits, keep-alive and (when the ``h2`` package is
+installed) HTTP/2, so concurrent searches are multiplexed over a few
+connections instead of each opening its own.  The transport is wrapped in
+``MonitoredTransport``, which records how many requests hold a connection,
+how long requests wait for one and how many connections were opened; see
+``PoolMonitor.stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any, AsyncIterator, Iterable
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """Counters describing how busy the connection pool is."""
+
+    def __init__(self, max_connections: int) -> None:
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.warmed = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counters; wait times are in milliseconds."""
+        return {
+            "maxConnections": self.max_connections,
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "requests": self.requests,
+            "connectionsOpened": self.connections_opened,
+            "waitAvgMs": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+            "waitMaxMs": round(self.wait_max * 1000, 3),
+            "warmed": self.warmed,
+        }
+
+    def _acquired(self, waited: float) -> None:
+        self.waits += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+
+class MonitoredTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport to feed a ``PoolMonitor``.
+
+    A request counts as in flight from when it is sent until its response
+    body is closed, i.e. for as long as it holds a pooled connection.  The
+    wait for a connection is the time until httpcore reports the first
+    connection event (opening a new connection, or sending headers on a
+    reused one) through the ``trace`` request extension.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, monitor: PoolMonitor) -> None:
+        self._inner = inner
+        self.monitor = monitor
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        monitor = self.monitor
+        started = time.perf_counter()
+        acquired: list[float] = []
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(name: str, info: dict) -> None:
+            if not acquired:
+                acquired.append(time.perf_counter())
+            if name == "connection.connect_tcp.complete":
+                monitor.connections_opened += 1
+            if outer_trace is not None:
+                await outer_trace(name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        monitor.requests += 1
+        monitor.in_flight += 1
+        monitor.peak_in_flight = max(monitor.peak_in_flight, monitor.in_flight)
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            monitor.in_flight -= 1
+            raise
+        finally:
+            if acquired:
+                monitor._acquired(acquired[0] - started)
+        if response.is_closed:  # body already loaded; nothing holds the connection
+            monitor.in_flight -= 1
+        else:
+            response.stream = _ReleasingStream(response.stream, monitor)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that marks its request finished once closed."""
+
+    def __init__(self, stream: Any, monitor: PoolMonitor) -> None:
+        self._stream = stream
+        self._monitor = monitor
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._monitor.in_flight -= 1
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def operation_timeout(read: float) -> httpx.Timeout:
+    """Timeouts for one kind of upstream call: shared connect/write/pool
+    limits and an operation-specific *read* timeout."""
+    return httpx.Timeout(
+        connect=settings.http_connect_timeout,
+        read=read,
+        write=settings.http_write_timeout,
+        pool=settings.http_pool_timeout,
+    )
+
+
+def build_transport() -> httpx.AsyncHTTPTransport:
+    """The connection-pooling transport with the configured limits and HTTP/2."""
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    http2 = settings.http2 and http2_available()
+    if settings.http2 and not http2:
+        logger.info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+    return httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+
+
+def build_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> tuple[httpx.AsyncClient, PoolMonitor]:
+    """Create the pooled client and its monitor.
+
+    *transport* replaces the default connection-pooling transport (tests).
+    """
+    if transport is None:
+        transport = build_transport()
+    monitor = PoolMonitor(settings.http_max_connections)
+    client = httpx.AsyncClient(
+        transport=MonitoredTransport(transport, monitor),
+        timeout=operation_timeout(max(settings.search_timeout, settings.chat_timeout)),
+    )
+    return client, monitor
+
+
+async def warm_up(client: httpx.AsyncClient, monitor: PoolMonitor, urls: Iterable[str]) -> None:
+    """Open a pooled connection to the origin of each of *urls*.
+
+    Sends one ``HEAD /`` per origin, without credentials; any response
+    leaves an established (TLS) connection in the pool for the first real
+    request.  Failures are logged and ignored.
+    """
+    origins = sorted({f"{parts.scheme}://{parts.netloc}/" for parts in map(urlsplit, urls)})
+
+    async def touch(origin: str) -> None:
+        try:
+            await client.head(origin, timeout=operation_timeout(settings.http_connect_timeout))
+            monitor.warmed += 1
+        except httpx.HTTPError as exc:
+            logger.info("Connection warm-up to %s failed: %s", origin, exc)
+
+    await asyncio.gather(*(touch(origin) for origin in origins))
@@ -0,0 +1,97 @@
+"""Registry of in-flight event streams, shared between identical requests.
+
+The first request for a key starts the producer; later requests for the
+same key attach to it, receive every event emitted so far and then follow
+the live stream.  When its last subscriber goes away the key is released
+and the producer cancelled, so a later request starts a fresh run; the
+key is also released as soon as the producer finishes.  A producer that
+fails ends its subscribers' streams with an ``error`` event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator, Callable
+
+from app.helpers.sse import error_event
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One running producer and the events it has emitted so far."""
+
+    def __init__(self, key: str, source: AsyncIterator[str]) -> None:
+        self.key = key
+        self.events: list[str] = []
+        self.done = False
+        self.subscribers = 0
+        self._updated = asyncio.Event()
+        self._task = asyncio.create_task(self._pump(source))
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """Yield all past events, then live ones until the producer finishes."""
+        self.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(self.events):
+                    yield self.events[index]
+                    index += 1
+                if self.done:
+                    return
+                await self._updated.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                logger.info("All subscribers left in-flight run %s; cancelling", self.key[:12])
+                # Release the key first: a request joining now must not
+                # attach to a run that is being cancelled.
+                self._release()
+                self._task.cancel()
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for item in source:
+                self.events.append(item)
+                self._notify()
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            logger.exception("In-flight run %s failed", self.key[:12])
+            self.events.append(error_event(f"Analysis failed: {exc}"))
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            self.done = True
+            self._release()
+            self._notify()
+
+    def _release(self) -> None:
+        if _flights.get(self.key) is self:
+            del _flights[self.key]
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+
+_flights: dict[str, _Flight] = {}
+
+
+def join(key: str, start: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+    """Subscribe to the in-flight stream for *key*, starting it with *start* if needed."""
+    flight = _flights.get(key)
+    if flight is None:
+        flight = _Flight(key, start())
+        _flights[key] = flight
+    else:
+        logger.info("Attaching to in-flight run %s (%d events so far)", key[:12], len(flight.events))
+    return flight.subscribe()
+
+
+def in_flight() -> int:
+    """Number of producers currently running."""
+    return len(_flights)
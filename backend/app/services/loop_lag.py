@@ -0,0 +1,61 @@
+"""Event-loop lag monitor.
+
+A background task sleeps for ``interval`` seconds at a time and records
+how much later than asked it woke up.  That delay is time the loop spent
+on something else — typically a CPU-bound call holding it — and is what
+every other stream on the worker waited.  Samples go to the
+``event_loop_lag_seconds`` histogram and to a rolling window of recent
+samples (``monitor.samples``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+from app.config import settings
+from app.services import metrics
+
+
+class LoopLagMonitor:
+    """Samples the running loop's scheduling delay every *interval* seconds."""
+
+    def __init__(self, interval: float = 0.1, window: int = 10_000) -> None:
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            metrics.EVENT_LOOP_LAG.observe(lag)
+
+
+monitor = LoopLagMonitor(settings.loop_lag_interval or 0.1)
+
+
+def startup() -> None:
+    """Start sampling (unless ``loop_lag_interval`` is 0)."""
+    if settings.loop_lag_interval > 0:
+        monitor.start()
+
+
+async def shutdown() -> None:
+    await monitor.stop()
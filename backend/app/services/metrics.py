@@ -0,0 +1,255 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A ``Registry`` holds ``Counter``, ``Gauge`` and ``Histogram`` metrics,
+optionally split by labels, and renders them for ``GET /api/metrics``.
+Recording is a dict update (plus a bisect for histograms) and takes no
+locks: everything runs on the event loop thread.
+
+Numbers that other modules already keep (cache and pool counters) are not
+duplicated; those modules register a collector that turns their stats into
+metrics when the registry is rendered.
+
+The metrics the pipeline and ``you_client`` record are defined at the
+bottom of this module.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from typing import Callable, Iterable, TypeVar
+
+# Seconds; spans a cache hit (~ms) to a slow synthesis (~minute).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_PREFIX = "interview_buddy_"
+
+M = TypeVar("M", bound="_Metric")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = _PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        bucket_names = (*self.labelnames, "le")
+        for suffix, key, value in self._samples():
+            names = bucket_names if suffix == "_bucket" else self.labelnames
+            lines.append(f"{self.name}{suffix}{_labels(names, key)} {_number(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], float]]:
+        for key, value in self._values.items():
+            yield "", key, value
+
+
+class Gauge(Counter):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: object) -> None:
+        self._values[self._key(labels)] = value
+
+    def track(self, **labels: object) -> _Tracking:
+        """Context manager counting the block as in progress."""
+        return _Tracking(self, labels)
+
+
+class Histogram(_Metric):
+    """Counts of observations (usually seconds) per bucket, plus sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative) ..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        counts = self._values.get(key)
+        if counts is None:
+            counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def time(self, **labels: object) -> _Timer:
+        """Context manager observing the block's duration in seconds."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: object) -> int:
+        counts = self._values.get(self._key(labels))
+        return int(sum(counts[:-1])) if counts else 0
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], float]]:
+        for key, counts in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield "_bucket", (*key, _number(bound)), cumulative
+            yield "_sum", key, counts[-1]
+            yield "_count", key, cumulative
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: Histogram, labels: dict[str, object]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+
+
+class _Tracking:
+    __slots__ = ("_gauge", "_labels")
+
+    def __init__(self, gauge: Gauge, labels: dict[str, object]) -> None:
+        self._gauge = gauge
+        self._labels = labels
+
+    def __enter__(self) -> _Tracking:
+        self._gauge.inc(**self._labels)
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._gauge.dec(**self._labels)
+
+
+class Registry:
+    """The metrics to expose, plus collectors producing more at render time."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Register *collector*, called on every render to build extra metrics."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format (version 0.0.4)."""
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+# ── Application metrics ──────────────────────────────────────────────
+
+registry = Registry()
+
+PIPELINE_STAGE_SECONDS = registry.register(
+    Histogram(
+        "pipeline_stage_seconds",
+        "Wall time of each pipeline stage (total = the whole run).",
+        ["stage"],
+    )
+)
+PIPELINE_RUNS = registry.register(
+    Counter("pipeline_runs_total", "Finished pipeline runs by outcome.", ["outcome"])
+)
+PIPELINE_IN_FLIGHT = registry.register(
+    Gauge("pipeline_in_flight", "Pipeline runs currently in progress.")
+)
+RESULT_CACHE_LOOKUPS = registry.register(
+    Counter("result_cache_lookups_total", "Result-cache lookups by result.", ["result"])
+)
+UPSTREAM_SECONDS = registry.register(
+    Histogram(
+        "upstream_request_seconds",
+        "Duration of You.com calls, including retries.",
+        ["endpoint"],
+    )
+)
+UPSTREAM_ERRORS = registry.register(
+    Counter(
+        "upstream_errors_total",
+        "Failed You.com calls by endpoint and kind (HTTP status, transport or circuit_open).",
+        ["endpoint", "kind"],
+    )
+)
+UPSTREAM_IN_FLIGHT = registry.register(
+    Gauge("upstream_in_flight", "You.com calls currently in progress.", ["endpoint"])
+)
+EVENT_LOOP_LAG = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "How late the event loop ran a scheduled wake-up (time it was blocked).",
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+)
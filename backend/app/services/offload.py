@@ -0,0 +1,87 @@
+"""Runs CPU-heavy steps off the event loop.
+
+Parsing and validating a large synthesis answer, or scanning a long job
+description, can hold the event loop for milliseconds, stalling every
+other SSE stream the worker serves.  ``run()`` sends such calls to an
+executor once their input reaches ``offload_min_chars`` and runs smaller
+ones inline, where the hand-off would cost more than it saves:
+
+- ``"none"``: always inline.
+- ``"thread"``: a small thread pool.  The GIL is still shared, but the
+  interpreter switches threads every few milliseconds, so the loop keeps
+  serving other streams instead of waiting for the whole call.
+- ``"process"``: a process pool, for true parallelism.  Arguments and
+  results are pickled, so the function must be a module-level function.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from app.config import settings
+from app.services import tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Values accepted for ``Settings.offload_executor``.
+EXECUTORS = ("none", "thread", "process")
+
+_kind = settings.offload_executor
+_min_chars = settings.offload_min_chars
+_executor: Executor | None = None
+
+
+def configure(kind: str, min_chars: int | None = None) -> None:
+    """Switch executor strategy (and threshold); the old pool is shut down."""
+    global _kind, _min_chars  # noqa: PLW0603
+    if kind not in EXECUTORS:
+        raise ValueError(f"Unknown offload executor: {kind!r}")
+    shutdown()
+    _kind = kind
+    if min_chars is not None:
+        _min_chars = min_chars
+
+
+def _get_executor() -> Executor:
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        workers = max(1, settings.offload_workers)
+        if _kind == "process":
+            _executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix="offload")
+        logger.info("Offloading CPU-heavy steps to a %s pool (%d workers)", _kind, workers)
+    return _executor
+
+
+async def run(func: Callable[..., T], *args: object, size: int) -> T:
+    """Call ``func(*args)``, in the executor if *size* (input length in
+    characters) reaches the threshold, inline otherwise."""
+    if _kind == "none" or size < _min_chars:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args)
+    with tracing.span("offload", func=getattr(func, "__name__", "?"), executor=_kind):
+        if _kind == "process":
+            return await loop.run_in_executor(_get_executor(), call)
+        # Threads keep the caller's context, so spans opened by *func* nest.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(_get_executor(), context.run, call)
+
+
+def shutdown() -> None:
+    """Stop the pool, if one was started.  Call at app shutdown."""
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
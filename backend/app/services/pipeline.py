@@ -9,94 +9,302 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable
+
+from pydantic import TypeAdapter, ValidationError
 
 from app.config import settings
-from app.models import AnalysisResult, SearchHit
-from app.services import you_client
+from app.models import AnalysisResult, JobMetadata, SearchHit
+from app.repositories import result_cache
+from app.services import inflight, metrics, offload, tracing, you_client
 from app.helpers.job_parser import extract_metadata
+from app.helpers.json_stream import SectionParser
 from app.helpers.prompts import build_synthesis_prompt
 from app.helpers.sse import (
+    PIPELINE_STEPS,
+    RawJSON,
     error_event,
+    partial_event,
     progress_event,
     result_event,
+    section_event,
     steps_event,
+    trace_event,
 )
 
 logger = logging.getLogger(__name__)
 
+# Validators for the list sections of ``AnalysisResult`` that are streamed to
+# the client individually as soon as the LLM has finished writing them.
+_SECTION_ADAPTERS: dict[str, TypeAdapter] = {
+    name: TypeAdapter(field.annotation)
+    for name, field in AnalysisResult.model_fields.items()
+    if name != "companyName"
+}
+
+
+# Values accepted for ``Settings.pacing`` and the ``X-Pacing`` header.
+PACING_POLICIES = ("none", "ui")
+
+
+class _Pacer:
+    """Holds each step open for a minimum duration under the "ui" policy.
+
+    *clock* (default: the running loop's) and *sleep* can be replaced in tests.
+    """
+
+    def __init__(
+        self,
+        pacing: str,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._minimums = settings.ui_min_step_seconds if pacing == "ui" else ()
+        self._started: dict[int, float] = {}
+        self._clock = clock or (lambda: asyncio.get_running_loop().time())
+        self._sleep = sleep
+
+    def start(self, step_index: int) -> str:
+        """Record the step start and return its "active" event."""
+        self._started[step_index] = self._clock()
+        return progress_event(step_index, "active")
+
+    async def done(self, step_index: int) -> str:
+        """Wait out the rest of the step's minimum, then return its "done" event."""
+        if step_index < len(self._minimums):
+            elapsed = self._clock() - self._started.get(step_index, 0.0)
+            remaining = self._minimums[step_index] - elapsed
+            if remaining > 0:
+                await self._sleep(remaining)
+        return progress_event(step_index, "done")
+
+
+async def run(
+    job_description: str,
+    use_cache: bool = True,
+    pacing: str | None = None,
+    trace: bool = False,
+    metadata: JobMetadata | None = None,
+) -> AsyncGenerator[str, None]:
+    """Execute the full interview-prep pipeline, yielding SSE events.
+
+    A cached analysis for the same job description is replayed instead of
+    re-running search and synthesis unless *use_cache* is False.  *pacing*
+    (default ``settings.pacing``) is one of ``PACING_POLICIES``.  With
+    *trace*, the run is traced and a final ``trace`` event carries its
+    spans; a sampled fraction of other runs is traced for the exporters only.
+    *metadata*, if the caller already extracted it, is used instead of
+    extracting it again.
+    """
+    tracer = tracing.Trace("pipeline.run") if trace or tracing.sampled() else None
+    data = None
+    try:
+        with (
+            metrics.PIPELINE_IN_FLIGHT.track(),
+            metrics.PIPELINE_STAGE_SECONDS.time(stage="total"),
+            tracing.activate(tracer),
+        ):
+            async for sse in _run(job_description, use_cache, pacing, metadata):
+                yield sse
+    finally:
+        if tracer is not None:
+            tracer.finish()
+            data = tracer.to_dict()
+            tracing.export(data)
+    if trace and data is not None:
+        yield trace_event(data)
+
 
-async def run(job_description: str) -> AsyncGenerator[str, None]:
-    """Execute the full interview-prep pipeline, yielding SSE events."""
+async def _run(
+    job_description: str,
+    use_cache: bool,
+    pacing: str | None,
+    metadata: JobMetadata | None = None,
+) -> AsyncGenerator[str, None]:
+    pacer = _Pacer(pacing or settings.pacing)
 
     # ── Step definitions ─────────────────────────────────────────────
     yield steps_event()
 
     # ── Step 0: extract metadata ─────────────────────────────────────
-    yield progress_event(0, "active")
-    metadata = extract_metadata(job_description)
+    yield pacer.start(0)
+    if metadata is None:
+        metadata = await _extract_metadata(job_description)
     logger.info(
         "Extracted: company=%s  role=%s  techs=%s",
         metadata.company_name,
         metadata.role_title,
         metadata.technologies,
     )
-    await asyncio.sleep(0.3)  # brief UX pause
-    yield progress_event(0, "done")
+    yield await pacer.done(0)
+
+    cache_key = result_cache.fingerprint(job_description, metadata)
+    if use_cache and settings.result_cache_ttl > 0:
+        with tracing.span("result_cache.get") as span:
+            cached = await result_cache.get(cache_key)
+            span.set(hit=cached is not None)
+        metrics.RESULT_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        if cached is not None:
+            logger.info("Result cache hit for %s", metadata.company_name)
+            metrics.PIPELINE_RUNS.inc(outcome="cached")
+            for step_index in range(1, len(PIPELINE_STEPS)):
+                yield pacer.start(step_index)
+                yield await pacer.done(step_index)
+            yield result_event(RawJSON(cached))
+            return
 
-    # ── Step 1: company research (Search API) ────────────────────────
-    yield progress_event(1, "active")
-    company_hits = await _search_company(metadata.company_name)
-    yield progress_event(1, "done")
+    # ── Steps 1 & 2: company + tech-stack research (Search API) ──────
+    # Both searches start straight away and share one concurrency limit;
+    # progress events are still emitted in step order.
+    limit = asyncio.Semaphore(max(1, settings.search_concurrency))
+    company_task = asyncio.create_task(_search_company(metadata.company_name, limit))
+    tech_task = asyncio.create_task(_search_technologies(metadata.technologies, limit))
+    try:
+        yield pacer.start(1)
+        company_hits = await company_task
+        yield await pacer.done(1)
 
-    # ── Step 2: tech-stack research (Search API) ─────────────────────
-    yield progress_event(2, "active")
-    tech_hits = await _search_technologies(metadata.technologies)
-    yield progress_event(2, "done")
+        yield pacer.start(2)
+        tech_hits = await tech_task
+        yield await pacer.done(2)
+    finally:
+        # No-op once finished; stops orphaned searches if the client went away.
+        company_task.cancel()
+        tech_task.cancel()
 
     # ── Step 3: synthesis (Chat completions) ─────────────────────────
-    yield progress_event(3, "active")
-
-    prompt = build_synthesis_prompt(
-        job_description=job_description,
-        company=metadata.company_name,
-        role=metadata.role_title,
-        technologies=metadata.technologies,
-        company_results=company_hits,
-        tech_results=tech_hits,
-    )
+    yield pacer.start(3)
+
+    with tracing.span("build_prompt") as span:
+        prompt = build_synthesis_prompt(
+            job_description=job_description,
+            company=metadata.company_name,
+            role=metadata.role_title,
+            technologies=metadata.technologies,
+            company_results=company_hits,
+            tech_results=tech_hits,
+        )
+        span.set(chars=len(prompt))
 
     try:
-        analysis = await _synthesise(prompt, metadata.company_name)
+        with (
+            metrics.PIPELINE_STAGE_SECONDS.time(stage="synthesise"),
+            tracing.span("synthesise"),
+        ):
+            chunks: list[str] = []
+            sections = SectionParser()
+            async for chunk in _synthesis_chunks(prompt):
+                chunks.append(chunk)
+                if settings.stream_synthesis:
+                    yield partial_event(chunk)
+                    for name, raw_section in sections.feed(chunk):
+                        section = await offload.run(
+                            _validate_section, name, raw_section, size=len(raw_section)
+                        )
+                        if section is not None:
+                            yield section_event(name, section)
+            raw = "".join(chunks)
+            analysis = await offload.run(
+                _parse_analysis, raw, metadata.company_name, size=len(raw)
+            )
     except (json.JSONDecodeError, ValueError) as exc:
         logger.error("Synthesis parse error: %s", exc)
+        metrics.PIPELINE_RUNS.inc(outcome="error")
         yield error_event("Failed to parse AI response. Please try again.")
         return
     except Exception as exc:
         logger.error("Synthesis failed: %s", exc)
+        metrics.PIPELINE_RUNS.inc(outcome="error")
         yield error_event(f"Analysis failed: {exc}")
         return
 
-    yield progress_event(3, "done")
+    yield await pacer.done(3)
+
+    if settings.result_cache_ttl > 0:
+        with tracing.span("result_cache.put"):
+            await result_cache.put(cache_key, analysis.model_dump_json())
 
     # ── Step 4: done ─────────────────────────────────────────────────
-    yield progress_event(4, "active")
-    await asyncio.sleep(0.2)
-    yield progress_event(4, "done")
+    yield pacer.start(4)
+    yield await pacer.done(4)
+
+    metrics.PIPELINE_RUNS.inc(outcome="ok")
+    yield result_event(analysis)
+
+
+def run_shared(
+    job_description: str,
+    use_cache: bool = True,
+    pacing: str | None = None,
+    trace: bool = False,
+) -> AsyncIterator[str]:
+    """Like ``run()``, but identical concurrent requests share one pipeline run.
 
-    yield result_event(analysis.model_dump())
+    Requests attaching to a run that is already in progress first receive
+    the events it has emitted so far, then follow it live.  Only requests
+    with the same pacing share a run; traced requests always run their own,
+    since the trace describes that request alone.
+    """
+    pacing = pacing or settings.pacing
+    if trace or not settings.dedupe_inflight:
+        return run(job_description, use_cache=use_cache, pacing=pacing, trace=trace)
+    return _run_shared(job_description, use_cache, pacing)
+
+
+async def _run_shared(
+    job_description: str, use_cache: bool, pacing: str
+) -> AsyncGenerator[str, None]:
+    # The metadata is part of the sharing key; the run reuses it.  Runs
+    # bypassing the cache never share with ones that may replay it.
+    metadata = await _extract_metadata(job_description)
+    key = result_cache.fingerprint(job_description, metadata)
+    stream = inflight.join(
+        f"{key}:{pacing}:{'cached' if use_cache else 'fresh'}",
+        lambda: run(job_description, use_cache=use_cache, pacing=pacing, metadata=metadata),
+    )
+    try:
+        async for sse in stream:
+            yield sse
+    finally:
+        await stream.aclose()
 
 
 # ── Private helpers ──────────────────────────────────────────────────
 
-async def _search_company(company: str) -> list[SearchHit]:
+async def _extract_metadata(job_description: str) -> JobMetadata:
+    """Extract metadata (off the event loop for long job descriptions)."""
+    with (
+        metrics.PIPELINE_STAGE_SECONDS.time(stage="extract_metadata"),
+        tracing.span("extract_metadata") as span,
+    ):
+        metadata = await offload.run(
+            extract_metadata, job_description, size=len(job_description)
+        )
+        span.set(company=metadata.company_name, technologies=len(metadata.technologies))
+    return metadata
+
+
+async def _search_company(
+    company: str,
+    limit: asyncio.Semaphore | None = None,
+) -> list[SearchHit]:
     """Run a single company-focused search query."""
     try:
-        hits = await you_client.search(
-            f"{company} company recent news product launches 2025 2026"
-        )
+        with (
+            metrics.PIPELINE_STAGE_SECONDS.time(stage="search_company"),
+            tracing.span("search_company", company=company),
+        ):
+            hits = await _bounded_search(
+                f"{company} company recent news product launches 2025 2026",
+                limit or asyncio.Semaphore(1),
+            )
         logger.info("Company search returned %d results", len(hits))
         return hits
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Company search exceeded %.1fs deadline", settings.search_query_deadline
+        )
+        return []
     except Exception as exc:
         logger.warning("Company search failed: %s", exc)
         return []
@@ -104,32 +312,90 @@ async def _search_company(company: str) -> list[SearchHit]:
 
 async def _search_technologies(
     technologies: list[str],
+    limit: asyncio.Semaphore | None = None,
 ) -> dict[str, list[SearchHit]]:
-    """Run one search query per technology (capped by config)."""
+    """Run one search query per technology (capped by config), concurrently.
+
+    At most ``settings.search_concurrency`` queries are in flight at once.
+    A technology whose query fails or misses its deadline is left out of the
+    result; the others are returned as usual.
+    """
+    techs = technologies[: settings.max_technologies]
+    limit = limit or asyncio.Semaphore(max(1, settings.search_concurrency))
+    with (
+        metrics.PIPELINE_STAGE_SECONDS.time(stage="search_technologies"),
+        tracing.span("search_technologies", technologies=techs),
+    ):
+        outcomes = await asyncio.gather(
+            *(
+                _bounded_search(f"{tech} best practices interview questions 2025", limit)
+                for tech in techs
+            ),
+            return_exceptions=True,
+        )
+
     results: dict[str, list[SearchHit]] = {}
-    for tech in technologies[: settings.max_technologies]:
-        try:
-            hits = await you_client.search(
-                f"{tech} best practices interview questions 2025"
+    for tech, outcome in zip(techs, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.warning(
+                "Tech search for %s exceeded %.1fs deadline",
+                tech,
+                settings.search_query_deadline,
             )
-            results[tech] = hits
-        except Exception as exc:
-            logger.warning("Tech search for %s failed: %s", tech, exc)
+        elif isinstance(outcome, BaseException):
+            logger.warning("Tech search for %s failed: %s", tech, outcome)
+        else:
+            results[tech] = outcome
     logger.info("Tech search completed for %d technologies", len(results))
     return results
 
 
-async def _synthesise(prompt: str, fallback_company: str) -> AnalysisResult:
-    """Call the research-mode LLM and parse its output into an ``AnalysisResult``."""
-    raw = await you_client.research(prompt)
-    content = _strip_markdown_fences(raw)
-    data: dict = json.loads(content)
+async def _bounded_search(query: str, limit: asyncio.Semaphore) -> list[SearchHit]:
+    """Search once *limit* admits us, giving up after the per-query deadline."""
+    async with limit:
+        return await asyncio.wait_for(
+            you_client.search(query), timeout=settings.search_query_deadline
+        )
+
+
+async def _synthesis_chunks(prompt: str) -> AsyncIterator[str]:
+    """Yield the research-mode LLM answer, incrementally when streaming is enabled."""
+    if settings.stream_synthesis:
+        async for chunk in you_client.research_stream(prompt):
+            yield chunk
+    else:
+        yield await you_client.research(prompt)
+
+
+def _validate_section(name: str, raw: str) -> RawJSON | None:
+    """Validate one completed top-level member; ``None`` if it can't be streamed.
+
+    Invalid sections are skipped here and reported by the final full
+    validation instead.
+    """
+    adapter = _SECTION_ADAPTERS.get(name)
+    if adapter is None:
+        return None
+    try:
+        with tracing.span("validate_section", section=name):
+            return RawJSON(adapter.dump_json(adapter.validate_json(raw)).decode())
+    except ValidationError as exc:
+        logger.warning("Streamed section %s failed validation: %s", name, exc)
+        return None
+
+
+def _parse_analysis(raw: str, fallback_company: str) -> AnalysisResult:
+    """Parse the LLM answer into an ``AnalysisResult``."""
+    with tracing.span("parse_json", chars=len(raw)):
+        content = _strip_markdown_fences(raw)
+        data: dict = json.loads(content)
 
     # Guarantee the company name is present
     if not data.get("companyName"):
         data["companyName"] = fallback_company
 
-    return AnalysisResult.model_validate(data)
+    with tracing.span("validate"):
+        return AnalysisResult.model_validate(data)
 
 
 def _strip_markdown_fences(text: str) -> str:
@@ -0,0 +1,265 @@
+"""Retries, hedged requests and circuit breaking for upstream HTTP calls.
+
+- ``send_with_retries`` re-sends a request that failed with a transient
+  error (429, 5xx or a transport error), waiting a jittered exponential
+  backoff or the server's ``Retry-After``.
+- ``hedged`` starts a duplicate of a slow call after a delay (typically
+  the recent p95 latency from a ``LatencyTracker``) and returns whichever
+  answers first.
+- ``CircuitBreaker`` fails calls fast while an endpoint keeps failing and
+  lets a single probe through once its cool-down has passed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How often and how patiently to retry one call."""
+
+    attempts: int = 3  # total, including the first
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    # False for calls with a long read timeout: an attempt that already
+    # waited the full timeout is not repeated.
+    retry_read_timeouts: bool = True
+
+
+def is_retryable_error(policy: RetryPolicy, exc: httpx.TransportError) -> bool:
+    return policy.retry_read_timeouts or not isinstance(exc, httpx.ReadTimeout)
+
+
+def is_transient(response: httpx.Response) -> bool:
+    return response.status_code in RETRYABLE_STATUSES
+
+
+def backoff_delay(policy: RetryPolicy, retry: int, response: httpx.Response | None = None) -> float:
+    """Seconds to wait before retry number *retry* (0-based).
+
+    Honours ``Retry-After`` (seconds or an HTTP date) when the response has
+    one; otherwise "full jitter": uniform in ``[0, base_delay * 2**retry]``.
+    Never more than ``max_delay``.
+    """
+    if response is not None:
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(policy.max_delay, retry_after)
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2**retry))
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Closed → open after *failure_threshold* consecutive failures.
+
+    While open, ``before_call`` raises ``CircuitOpenError``.  After
+    *reset_timeout* seconds one probe call is allowed (half-open); its
+    success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` unless a call may go ahead now."""
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("%s circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or (
+            self._opened_at is None and self._failures >= self.failure_threshold
+        ):
+            logger.warning("%s circuit opened after %d failures", self.name, self._failures)
+            self._opened_at = self._clock()
+            self._probing = False
+
+    def release(self) -> None:
+        """End a call let through by ``before_call`` without a verdict.
+
+        For calls that were cancelled (a losing hedge, a deadline, a client
+        disconnect): a half-open probe slot is given back so the next call
+        can probe, instead of the circuit staying half-open for good.
+        """
+        self._probing = False
+
+    def reset(self) -> None:
+        self.record_success()
+        self.rejected = 0
+
+
+async def send_with_retries(
+    send: Callable[[], Awaitable[httpx.Response]],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker | None = None,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    on_retry: Callable[[], None] | None = None,
+) -> httpx.Response:
+    """Call *send* until it returns a non-transient response or attempts run out.
+
+    Returns the last response (callers still ``raise_for_status()``); the
+    last transport error is re-raised, and so is a read timeout at once
+    unless the policy retries those.  *breaker*, if given, is checked
+    before every attempt and told the outcome: transient failures count
+    against it, any other response (including 4xx) counts as the endpoint
+    being healthy; any other exception counts as a failure and
+    cancellation releases a half-open probe without a verdict.
+    *on_retry* is called before each retry (for counters).
+    """
+    attempts = max(1, policy.attempts)
+    for retry in range(attempts):
+        if breaker is not None:
+            breaker.before_call()
+        response: httpx.Response | None = None
+        try:
+            response = await send()
+        except httpx.TransportError as exc:
+            if breaker is not None:
+                breaker.record_failure()
+            if retry == attempts - 1 or not is_retryable_error(policy, exc):
+                raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        else:
+            if not is_transient(response):
+                if breaker is not None:
+                    breaker.record_success()
+                return response
+            if breaker is not None:
+                breaker.record_failure()
+            if retry == attempts - 1:
+                return response
+            await response.aclose()
+        delay = backoff_delay(policy, retry, response)
+        logger.info(
+            "Upstream call failed (attempt %d/%d); retrying in %.2fs", retry + 1, attempts, delay
+        )
+        if on_retry is not None:
+            on_retry()
+        await sleep(delay)
+    raise AssertionError("unreachable")
+
+
+class LatencyTracker:
+    """Rolling window of recent call durations, for hedging thresholds."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """The *q*-quantile of the window, or ``None`` with too few samples."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float | None) -> tuple[T, bool]:
+    """Run *call*; if it has not finished after *delay* seconds, start a
+    second copy and return the first to succeed.
+
+    Returns ``(result, hedge_fired)``.  The slower copy is cancelled.  If
+    both fail, the first error is raised.  ``delay=None`` disables hedging.
+    """
+    first = asyncio.ensure_future(call())
+    if delay is None:
+        return await first, False
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result(), False
+
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task in done and task.exception() is None:
+                    return task.result(), True
+            for task in tasks:
+                if task in done and error is None:
+                    error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,314 @@
+"""Per-request traces: nested, timed spans for one pipeline run.
+
+A ``Trace`` is activated for the duration of a run; code anywhere below it
+opens spans with ``span(name, **attributes)``.  The active span lives in a
+context variable, so spans opened in tasks started by the run (parallel
+searches, hedged requests) nest under the span that started them.  With
+no active trace ``span()`` returns a shared no-op, so untraced requests
+pay one context-variable lookup per span.
+
+Finished traces are handed to the configured exporters (``jsonl``,
+``http``, ``memory``; see the ``trace_*`` settings) in the background.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation; times are ``perf_counter`` seconds."""
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    start: float
+    end: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class Trace:
+    """All spans of one request, rooted at a span named *name*."""
+
+    def __init__(self, name: str, trace_id: str | None = None) -> None:
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._ids = itertools.count(1)
+        self.spans: list[Span] = []
+        self.root = self.open(name, None)
+
+    def open(self, name: str, parent: Span | None, **attributes: Any) -> Span:
+        span = Span(
+            name,
+            next(self._ids),
+            parent.span_id if parent is not None else None,
+            time.perf_counter(),
+            attributes=attributes,
+        )
+        self.spans.append(span)
+        return span
+
+    def finish(self) -> None:
+        """Close the root span (and any span left open, e.g. by a disconnect)."""
+        now = time.perf_counter()
+        for span in self.spans:
+            if span.end is None:
+                span.end = now
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form; span times are milliseconds from the trace start."""
+        origin = self._origin
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        return {
+            "traceId": self.trace_id,
+            "startedAt": int(self.started_at * 1000),
+            "durationMs": ms((self.root.end or time.perf_counter()) - origin),
+            "spans": [
+                {
+                    "id": span.span_id,
+                    "parentId": span.parent_id,
+                    "name": span.name,
+                    "startMs": ms(span.start - origin),
+                    "durationMs": ms((span.end or span.start) - span.start),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_current: ContextVar[tuple[Trace, Span] | None] = ContextVar("trace", default=None)
+
+
+class _SpanScope:
+    __slots__ = ("_trace", "_parent", "_name", "_attributes", "_span", "_token")
+
+    def __init__(self, trace: Trace, parent: Span, name: str, attributes: dict[str, Any]) -> None:
+        self._trace = trace
+        self._parent = parent
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._span = self._trace.open(self._name, self._parent, **self._attributes)
+        self._token: Token = _current.set((self._trace, self._span))
+        return self._span
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, _tb: Any
+    ) -> None:
+        self._span.end = time.perf_counter()
+        if exc is not None and not isinstance(exc, (GeneratorExit, asyncio.CancelledError)):
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        _restore(self._token)
+
+
+def _restore(token: Token) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:
+        # A generator holding the span was closed from another context
+        # (e.g. finalised after a client disconnect); nothing to restore.
+        pass
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> _SpanScope | _NoopSpan:
+    """Context manager timing the block as a child of the current span.
+
+    ``as`` binds an object whose ``set(**attributes)`` adds attributes.
+    """
+    active = _current.get()
+    if active is None:
+        return _NOOP
+    return _SpanScope(active[0], active[1], name, attributes)
+
+
+class _Activation:
+    __slots__ = ("_trace", "_token")
+
+    def __init__(self, trace: Trace | None) -> None:
+        self._trace = trace
+
+    def __enter__(self) -> Trace | None:
+        if self._trace is not None:
+            self._token = _current.set((self._trace, self._trace.root))
+        return self._trace
+
+    def __exit__(self, *_exc: object) -> None:
+        if self._trace is not None:
+            _restore(self._token)
+
+
+def activate(trace: Trace | None) -> _Activation:
+    """Make *trace* current for the block; ``None`` leaves tracing off."""
+    return _Activation(trace)
+
+
+def sampled() -> bool:
+    """Whether to trace a request that did not ask for it (``trace_sample_rate``)."""
+    rate = settings.trace_sample_rate
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+# ── Exporters ────────────────────────────────────────────────────────
+
+class Exporter(Protocol):
+    async def export(self, trace: dict[str, Any]) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class InMemoryExporter:
+    """Keeps the last *max_traces* traces (tests, local inspection)."""
+
+    def __init__(self, max_traces: int = 100) -> None:
+        self.traces: deque[dict[str, Any]] = deque(maxlen=max_traces)
+
+    async def export(self, trace: dict[str, Any]) -> None:
+        self.traces.append(trace)
+
+    async def aclose(self) -> None:
+        return None
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per trace to *path*, off the event loop."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    async def export(self, trace: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._write, json.dumps(trace, separators=(",", ":")))
+
+    def _write(self, line: str) -> None:
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+    async def aclose(self) -> None:
+        return None
+
+
+class HttpExporter:
+    """POSTs each trace as JSON to *url* (e.g. a local collector)."""
+
+    def __init__(
+        self, url: str, client: httpx.AsyncClient | None = None, timeout: float = 2.0
+    ) -> None:
+        self.url = url
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+        self._owns_client = client is None
+
+    async def export(self, trace: dict[str, Any]) -> None:
+        resp = await self._client.post(self.url, json=trace)
+        resp.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+
+_exporters: list[Exporter] | None = None
+_pending: set[asyncio.Task] = set()
+
+
+def _build_exporters() -> list[Exporter]:
+    built: list[Exporter] = []
+    for name in settings.trace_exporters:
+        if name == "memory":
+            built.append(InMemoryExporter())
+        elif name == "jsonl":
+            built.append(JsonLinesExporter(settings.trace_jsonl_path))
+        elif name == "http":
+            if not settings.trace_http_url:
+                raise ValueError("The 'http' trace exporter needs TRACE_HTTP_URL")
+            built.append(HttpExporter(settings.trace_http_url))
+        else:
+            raise ValueError(f"Unknown trace exporter: {name!r}")
+    return built
+
+
+def exporters() -> list[Exporter]:
+    """The configured exporters, built from settings on first use."""
+    global _exporters  # noqa: PLW0603
+    if _exporters is None:
+        _exporters = _build_exporters()
+    return _exporters
+
+
+def configure_exporters(configured: list[Exporter] | None) -> None:
+    """Replace the exporters; ``None`` rebuilds them from settings (tests)."""
+    global _exporters  # noqa: PLW0603
+    _exporters = configured
+
+
+def export(trace: dict[str, Any]) -> None:
+    """Hand *trace* to every exporter in the background; failures are logged."""
+    for exporter in exporters():
+        task = asyncio.create_task(_export_one(exporter, trace))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
+
+
+async def _export_one(exporter: Exporter, trace: dict[str, Any]) -> None:
+    try:
+        await exporter.export(trace)
+    except Exception as exc:
+        logger.warning("Trace export via %s failed: %s", type(exporter).__name__, exc)
+
+
+async def flush() -> None:
+    """Wait for exports in progress."""
+    if _pending:
+        await asyncio.gather(*list(_pending))
+
+
+async def shutdown() -> None:
+    """Finish pending exports and close the exporters.  Call at app shutdown."""
+    global _exporters  # noqa: PLW0603
+    await flush()
+    for exporter in _exporters or []:
+        await exporter.aclose()
+    _exporters = None
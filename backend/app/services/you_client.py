@@ -1,16 +1,23 @@
 """You.com API client — Search (v1) and Express Agent for synthesis.
 
 - Search: GET https://ydc-index.io/v1/search (X-API-Key, query, count)
-- Synthesis: POST https://api.you.com/v1/agents/runs (Bearer, agent=express, input)
+- Synthesis: POST https://api.you.com/v1/agents/runs (Bearer, agent=express, input),
+  either as one JSON response or streamed as SSE deltas
+
+Transient failures are retried and each endpoint has a circuit breaker
+(see ``resilience``); slow searches are hedged.
 
 Designed to be used as a managed singleton: call ``startup()`` once at app
-boot to create the shared ``httpx.AsyncClient``, and ``shutdown()`` on
-teardown.
+boot to create the shared ``httpx.AsyncClient`` (see ``http_pool``), and
+``shutdown()`` on teardown.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from typing import Any, AsyncIterator, Awaitable, Callable
 from urllib.parse import urlparse
 
 import httpx
@@ -18,30 +25,195 @@ import httpx
 from app.config import settings
 from app.models import SearchHit
 from app.helpers.prompts import SYSTEM_PROMPT
+from app.services import http_pool, metrics, resilience, tracing
+from app.services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-# Module-level singleton.  Initialised in ``startup()``.
+# Module-level singletons.  Initialised in ``startup()``.
 _http: httpx.AsyncClient | None = None
+_pool: http_pool.PoolMonitor | None = None
+_warmup: asyncio.Task | None = None
+
+# Circuit breakers per upstream endpoint, recent search latencies (for the
+# hedging delay) and retry/hedge counters.  Rebuilt by ``reset_resilience()``.
+breakers: dict[str, resilience.CircuitBreaker] = {}
+search_latency = resilience.LatencyTracker()
+_counters = {"retries": 0, "hedges": 0}
+
+
+def reset_resilience() -> None:
+    """Close all circuits and forget latencies and counters, picking up the
+    current breaker settings (startup, tests)."""
+    global search_latency  # noqa: PLW0603
+    breakers.clear()
+    for name in ("search", "search_legacy", "agents"):
+        breakers[name] = resilience.CircuitBreaker(
+            name,
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+        )
+    search_latency = resilience.LatencyTracker()
+    _counters.update(retries=0, hedges=0)
+
 
+reset_resilience()
 
-async def startup() -> None:
-    """Create the shared ``httpx.AsyncClient``.  Call once at app boot."""
-    global _http  # noqa: PLW0603
+
+async def startup(transport: httpx.AsyncBaseTransport | None = None) -> None:
+    """Create the shared ``httpx.AsyncClient``.  Call once at app boot.
+
+    *transport* replaces the pooled network transport (tests).
+    """
+    global _http, _pool, _warmup  # noqa: PLW0603
     settings.validate()
-    _http = httpx.AsyncClient(timeout=max(settings.search_timeout, settings.chat_timeout))
+    _http, _pool = http_pool.build_client(transport)
+    if settings.http_warmup:
+        _warmup = asyncio.create_task(
+            http_pool.warm_up(
+                _http, _pool, [settings.you_search_url, settings.you_agents_runs_url]
+            )
+        )
     logger.info("YouClient HTTP pool initialised")
 
 
 async def shutdown() -> None:
     """Close the shared client.  Call once at app shutdown."""
-    global _http  # noqa: PLW0603
+    global _http, _pool, _warmup  # noqa: PLW0603
+    if _warmup is not None:
+        _warmup.cancel()
+        _warmup = None
     if _http:
         await _http.aclose()
         _http = None
+        _pool = None
         logger.info("YouClient HTTP pool closed")
 
 
+def pool_stats() -> dict[str, Any]:
+    """Connection-pool counters (empty before ``startup()``)."""
+    return _pool.stats() if _pool is not None else {}
+
+
+def resilience_stats() -> dict[str, Any]:
+    """Circuit states, rejected calls and retry/hedge counters."""
+    p95 = search_latency.quantile(0.95)
+    return {
+        "circuits": {
+            name: {"state": breaker.state, "rejected": breaker.rejected}
+            for name, breaker in breakers.items()
+        },
+        "retries": _counters["retries"],
+        "hedges": _counters["hedges"],
+        "searchP95Ms": round(p95 * 1000, 1) if p95 is not None else None,
+    }
+
+
+def _retry_policy(retry_read_timeouts: bool = True) -> resilience.RetryPolicy:
+    return resilience.RetryPolicy(
+        attempts=settings.upstream_retry_attempts,
+        base_delay=settings.upstream_retry_base_delay,
+        max_delay=settings.upstream_retry_max_delay,
+        retry_read_timeouts=retry_read_timeouts,
+    )
+
+
+def _count_retry() -> None:
+    _counters["retries"] += 1
+
+
+async def _send(
+    endpoint: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    policy: resilience.RetryPolicy | None = None,
+) -> httpx.Response:
+    """Send one upstream request with retries, through *endpoint*'s breaker."""
+    with (
+        metrics.UPSTREAM_IN_FLIGHT.track(endpoint=endpoint),
+        metrics.UPSTREAM_SECONDS.time(endpoint=endpoint),
+        tracing.span(f"upstream.{endpoint}") as span,
+    ):
+        retries = 0
+
+        def on_retry() -> None:
+            nonlocal retries
+            retries += 1
+            _count_retry()
+
+        try:
+            resp = await resilience.send_with_retries(
+                send, policy or _retry_policy(), breakers[endpoint], on_retry=on_retry
+            )
+        except Exception as exc:
+            _record_error(endpoint, exc)
+            raise
+        finally:
+            span.set(retries=retries)
+        span.set(status=resp.status_code)
+    if resp.status_code >= 400:
+        _record_error(endpoint, resp.status_code)
+    return resp
+
+
+def _record_error(endpoint: str, error: Exception | int) -> None:
+    if isinstance(error, int):
+        kind = str(error)
+    elif isinstance(error, resilience.CircuitOpenError):
+        kind = "circuit_open"
+    elif isinstance(error, httpx.HTTPStatusError):
+        kind = str(error.response.status_code)
+    else:
+        kind = "transport"
+    metrics.UPSTREAM_ERRORS.inc(endpoint=endpoint, kind=kind)
+
+
+def _collect_metrics() -> list[metrics.Counter]:
+    """Search-cache, pool and resilience numbers for ``GET /api/metrics``."""
+    collected: list[metrics.Counter] = []
+
+    def add(kind: type[metrics.Counter], name: str, help: str, value: float) -> None:
+        metric = kind(name, help)
+        metric.inc(value)
+        collected.append(metric)
+
+    cache = search_cache.stats()
+    add(metrics.Gauge, "search_cache_entries", "Entries in the search cache.", cache["entries"])
+    add(metrics.Counter, "search_cache_hits_total", "Search-cache hits.", cache["hits"])
+    add(metrics.Counter, "search_cache_misses_total", "Search-cache misses.", cache["misses"])
+    add(
+        metrics.Counter,
+        "search_cache_coalesced_total",
+        "Searches that joined an identical in-flight one.",
+        cache["coalesced"],
+    )
+    pool = pool_stats()
+    if pool:
+        add(
+            metrics.Gauge,
+            "http_pool_in_flight",
+            "Requests holding a pooled connection.",
+            pool["inFlight"],
+        )
+        add(
+            metrics.Counter,
+            "http_pool_connections_opened_total",
+            "Upstream connections opened.",
+            pool["connectionsOpened"],
+        )
+    add(metrics.Counter, "upstream_retries_total", "Retried upstream calls.", _counters["retries"])
+    add(metrics.Counter, "search_hedges_total", "Hedged (duplicated) searches.", _counters["hedges"])
+    circuits = metrics.Gauge(
+        "circuit_open", "1 while an endpoint's circuit is open or half-open.", ["endpoint"]
+    )
+    for name, breaker in breakers.items():
+        circuits.set(0 if breaker.state == "closed" else 1, endpoint=name)
+    collected.append(circuits)
+    return collected
+
+
+metrics.registry.add_collector(_collect_metrics)
+
+
 def _client() -> httpx.AsyncClient:
     if _http is None:
         raise RuntimeError("YouClient not initialised — call startup() first")
@@ -50,28 +222,119 @@ def _client() -> httpx.AsyncClient:
 
 # ── Search API (YDC v1) ──────────────────────────────────────────────
 
+def _hits_size(hits: list[SearchHit]) -> int:
+    """Approximate in-memory size of a search result list, for the cache byte cap."""
+    return sum(
+        200 + len(h.title) + len(h.url) + len(h.domain) + sum(len(s) for s in h.snippets)
+        for h in hits
+    ) + 64
+
+
+# Shared across requests: identical queries built for different job
+# descriptions (same company, same technology) are served from here.
+search_cache: TTLCache[list[SearchHit]] = TTLCache(
+    ttl=settings.search_cache_ttl,
+    max_entries=settings.search_cache_max_entries,
+    max_bytes=settings.search_cache_max_bytes,
+    sizeof=_hits_size,
+)
+
+
+def _cache_key(query: str, limit: int) -> str:
+    """Normalise *query* so that case and whitespace differences share an entry."""
+    return f"{limit}:{' '.join(query.lower().split())}"
+
+
 async def search(query: str, num_results: int | None = None) -> list[SearchHit]:
-    """Search via You.com Search API; tries v1 first, then legacy if v1 returns 403."""
+    """Search via You.com Search API, serving repeated queries from ``search_cache``.
+
+    Concurrent identical queries share a single upstream request.
+    """
     limit = num_results or settings.max_search_results
-    headers = {"X-API-Key": settings.you_api_key}
-
-    # Try v1 endpoint first (GET .../v1/search, params: query, count)
-    resp = await _client().get(
-        settings.you_search_url,
-        params={"query": query, "count": limit, "language": "EN"},
-        headers=headers,
-        timeout=settings.search_timeout,
+    with tracing.span("search", query=query, limit=limit) as span:
+        if settings.search_cache_ttl <= 0:
+            hits = await _search_uncached(query, limit)
+        else:
+            hits = await search_cache.get_or_load(
+                _cache_key(query, limit), lambda: _search_uncached(query, limit)
+            )
+        span.set(hits=len(hits))
+        return list(hits)
+
+
+# API key -> loop time until which the legacy endpoint is used without
+# trying v1 first.  Set when v1 answers 403 for that key; once it lapses v1
+# is probed again, and a success there clears the entry.
+_legacy_until: dict[str, float] = {}
+
+
+def reset_endpoint_memory() -> None:
+    """Forget which search endpoint works for which key (tests)."""
+    _legacy_until.clear()
+
+
+def _prefers_legacy(api_key: str) -> bool:
+    until = _legacy_until.get(api_key)
+    return until is not None and asyncio.get_running_loop().time() < until
+
+
+def _hedge_delay() -> float | None:
+    if not settings.search_hedge:
+        return None
+    p95 = search_latency.quantile(0.95)
+    delay = p95 if p95 is not None else settings.search_hedge_initial_delay
+    return max(settings.search_hedge_min_delay, delay)
+
+
+async def _search_uncached(query: str, limit: int) -> list[SearchHit]:
+    """Query the Search API, hedging the request once it runs slower than
+    the recent p95 search latency."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    hits, hedge_fired = await resilience.hedged(
+        lambda: _search_once(query, limit), _hedge_delay()
     )
+    if hedge_fired:
+        _counters["hedges"] += 1
+    search_latency.record(loop.time() - started)
+    return hits
 
-    if resp.status_code == 403 and getattr(settings, "you_search_legacy_url", None):
-        # Fallback to legacy endpoint (GET .../search, params: query, num_web_results)
-        logger.info("Search v1 returned 403, trying legacy endpoint")
-        resp = await _client().get(
-            settings.you_search_legacy_url,
-            params={"query": query, "num_web_results": limit},
-            headers=headers,
-            timeout=settings.search_timeout,
+
+async def _search_once(query: str, limit: int) -> list[SearchHit]:
+    """Query the Search API.
+
+    Tries v1 first and falls back to legacy if v1 returns 403.  A key that
+    got a 403 goes straight to legacy for ``search_endpoint_reprobe_interval``
+    seconds, after which v1 is tried again.
+    """
+    api_key = settings.you_api_key
+    headers = {"X-API-Key": api_key}
+    legacy_url = getattr(settings, "you_search_legacy_url", None)
+
+    if legacy_url and _prefers_legacy(api_key):
+        with tracing.span("search.fallback", reason="remembered"):
+            resp = await _get_legacy(legacy_url, query, limit, headers)
+    else:
+        # Try v1 endpoint first (GET .../v1/search, params: query, count)
+        resp = await _send(
+            "search",
+            lambda: _client().get(
+                settings.you_search_url,
+                params={"query": query, "count": limit, "language": "EN"},
+                headers=headers,
+                timeout=http_pool.operation_timeout(settings.search_timeout),
+            ),
         )
+        if resp.status_code == 403 and legacy_url:
+            if api_key not in _legacy_until:
+                logger.info("Search v1 returned 403; using legacy endpoint for this key")
+            _legacy_until[api_key] = (
+                asyncio.get_running_loop().time() + settings.search_endpoint_reprobe_interval
+            )
+            with tracing.span("search.fallback", reason="v1_403"):
+                resp = await _get_legacy(legacy_url, query, limit, headers)
+        elif resp.status_code < 400 and _legacy_until.pop(api_key, None) is not None:
+            logger.info("Search v1 works again for this key")
 
     resp.raise_for_status()
     data = resp.json()
@@ -87,6 +350,19 @@ async def search(query: str, num_results: int | None = None) -> list[SearchHit]:
     return _parse_legacy_hits(legacy_hits)
 
 
+async def _get_legacy(url: str, query: str, limit: int, headers: dict[str, str]) -> httpx.Response:
+    # Legacy endpoint (GET .../search, params: query, num_web_results)
+    return await _send(
+        "search_legacy",
+        lambda: _client().get(
+            url,
+            params={"query": query, "num_web_results": limit},
+            headers=headers,
+            timeout=http_pool.operation_timeout(settings.search_timeout),
+        ),
+    )
+
+
 def _parse_web_hits(raw_list: list) -> list[SearchHit]:
     hits: list[SearchHit] = []
     for raw in raw_list:
@@ -130,24 +406,19 @@ def _parse_legacy_hits(raw_list: list) -> list[SearchHit]:
 # https://docs.you.com/api-reference/agents/express-agent/express-agent-runs
 
 async def research(prompt: str) -> str:
-    """Call You.com Express Agent and return the answer text (e.g. JSON string)."""
-    instructions = (
-        "Respond with valid JSON only. No markdown code fences, no commentary. "
-        "Follow the exact schema requested in the user message."
-    )
-    input_text = f"{instructions}\n\n---\n\n{prompt}"
-    resp = await _client().post(
-        settings.you_agents_runs_url,
-        headers={
-            "Authorization": f"Bearer {settings.you_api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "agent": "express",
-            "input": input_text,
-            "stream": False,
-        },
-        timeout=settings.chat_timeout,
+    """Call You.com Express Agent and return the answer text (e.g. JSON string).
+
+    A read timeout is not retried (see ``research_stream``).
+    """
+    resp = await _send(
+        "agents",
+        lambda: _client().post(
+            settings.you_agents_runs_url,
+            headers=_agent_headers(),
+            json=_agent_body(prompt, stream=False),
+            timeout=http_pool.operation_timeout(settings.chat_timeout),
+        ),
+        _retry_policy(retry_read_timeouts=False),
     )
     resp.raise_for_status()
     data = resp.json()
@@ -155,3 +426,126 @@ async def research(prompt: str) -> str:
         if item.get("type") == "message.answer" and item.get("text"):
             return (item["text"] or "").strip()
     return ""
+
+
+async def research_stream(prompt: str) -> AsyncIterator[str]:
+    """Call You.com Express Agent with ``stream: true`` and yield answer text deltas.
+
+    The upstream response is an SSE stream; only ``response.output_text.delta``
+    events for the answer are forwarded.  Concatenating the yielded chunks
+    gives the same text ``research()`` would return (modulo surrounding
+    whitespace).
+
+    Opening the stream is retried like any other call, except after a read
+    timeout: that attempt already waited ``chat_timeout``, and retrying it
+    would hold the request for several times as long.  Once a delta has
+    been yielded a failure is raised instead, since the caller already has
+    part of the answer.
+    """
+    with (
+        metrics.UPSTREAM_IN_FLIGHT.track(endpoint="agents_stream"),
+        metrics.UPSTREAM_SECONDS.time(endpoint="agents_stream"),
+        tracing.span("upstream.agents_stream") as span,
+    ):
+        chunks = 0
+        try:
+            async for delta in _stream_deltas(prompt):
+                chunks += 1
+                yield delta
+        except Exception as exc:
+            _record_error("agents_stream", exc)
+            raise
+        finally:
+            span.set(chunks=chunks)
+
+
+async def _stream_deltas(prompt: str) -> AsyncIterator[str]:
+    policy = _retry_policy(retry_read_timeouts=False)
+    breaker = breakers["agents"]
+    attempts = max(1, policy.attempts)
+    for retry in range(attempts):
+        breaker.before_call()
+        resp: httpx.Response | None = None
+        started = False
+        settled = False  # the breaker has been told how this attempt went
+        try:
+            async with _client().stream(
+                "POST",
+                settings.you_agents_runs_url,
+                headers={**_agent_headers(), "Accept": "text/event-stream"},
+                json=_agent_body(prompt, stream=True),
+                timeout=http_pool.operation_timeout(settings.chat_timeout),
+            ) as resp:
+                settled = True
+                if resilience.is_transient(resp):
+                    breaker.record_failure()
+                    if retry == attempts - 1:
+                        resp.raise_for_status()
+                else:
+                    breaker.record_success()
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        delta = _parse_stream_line(line)
+                        if delta:
+                            started = True
+                            yield delta
+                    return
+        except httpx.TransportError as exc:
+            if started:
+                raise
+            breaker.record_failure()
+            if retry == attempts - 1 or not resilience.is_retryable_error(policy, exc):
+                raise
+            resp = None
+        except Exception:
+            if not settled:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or closed before the endpoint answered.
+            if not settled:
+                breaker.release()
+            raise
+        delay = resilience.backoff_delay(policy, retry, resp)
+        logger.info("Agent stream failed to open; retrying in %.2fs", delay)
+        _count_retry()
+        await asyncio.sleep(delay)
+
+
+def _agent_headers() -> dict[str, str]:
+    return {
+        "Authorization": f"Bearer {settings.you_api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+def _agent_body(prompt: str, stream: bool) -> dict:
+    instructions = (
+        "Respond with valid JSON only. No markdown code fences, no commentary. "
+        "Follow the exact schema requested in the user message."
+    )
+    return {
+        "agent": "express",
+        "input": f"{instructions}\n\n---\n\n{prompt}",
+        "stream": stream,
+    }
+
+
+def _parse_stream_line(line: str) -> str:
+    """Return the answer text carried by one upstream SSE line, if any."""
+    if not line.startswith("data:"):
+        return ""
+    payload = line[5:].strip()
+    if not payload or payload == "[DONE]":
+        return ""
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError:
+        logger.debug("Skipping malformed agent stream line: %.80s", payload)
+        return ""
+    if data.get("type") != "response.output_text.delta":
+        return ""
+    response = data.get("response") or {}
+    if response.get("type", "message.answer") != "message.answer":
+        return ""
+    return response.get("delta") or ""
@@ -2,7 +2,16 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 
 def health_response() -> dict[str, str]:
     """Return the health check response body."""
     return {"status": "ok"}
+
+
+def upstream_response(
+    pool: dict[str, Any], search_cache: dict[str, int], resilience: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the body of the upstream-connection diagnostics endpoint."""
+    return {"pool": pool, "searchCache": search_cache, "resilience": resilience}
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from app.models import SavedAnalysis
+from app.models import HistorySummary, SavedAnalysis
 
 
-def history_list_view(items: list[SavedAnalysis]) -> list[dict]:
-    """Shape a list of saved analyses for the API response."""
-    return [item.model_dump() for item in items]
+def history_list_view(items: list[HistorySummary], fields: set[str] | None = None) -> list[dict]:
+    """Shape a list of history summaries for the API response.
+
+    *fields*, if given, limits each item to those keys.
+    """
+    return [item.model_dump(include=fields) for item in items]
 
 
 def history_item_view(entry: SavedAnalysis) -> dict:
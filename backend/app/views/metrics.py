@@ -0,0 +1,13 @@
+"""Metrics view — response for /metrics."""
+
+from __future__ import annotations
+
+from fastapi.responses import Response
+
+# Content type of the Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_response(text: str) -> Response:
+    """Wrap rendered metrics in a response scrapers accept."""
+    return Response(content=text, media_type=CONTENT_TYPE)
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 from fastapi.responses import StreamingResponse
 
-from app.services.pipeline import run
+from app.services.pipeline import run_shared
 
 
-def prepare_stream_response(job_description: str) -> StreamingResponse:
+def prepare_stream_response(
+    job_description: str,
+    use_cache: bool = True,
+    pacing: str | None = None,
+    trace: bool = False,
+) -> StreamingResponse:
     """Build the SSE streaming response for the prepare endpoint."""
     return StreamingResponse(
-        run(job_description),
+        run_shared(job_description, use_cache=use_cache, pacing=pacing, trace=trace),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
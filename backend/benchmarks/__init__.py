@@ -0,0 +1 @@
+"""Offline benchmarks: a fake You.com server and a load driver for /api/prepare."""
@@ -0,0 +1,101 @@
+"""Deterministic inputs for the micro-benchmarks: job descriptions, search
+results and LLM answers of realistic shapes and sizes."""
+
+from __future__ import annotations
+
+import random
+
+from app.helpers.job_parser import vocabulary
+from app.models import SearchHit
+from benchmarks.fake_you import analysis_json
+
+_TECH = [
+    "Python", "TypeScript", "JavaScript", "Go", "Rust", "Java", "Kotlin", "C++",
+    "React", "Vue", "Node.js", "Django", "FastAPI", "Spring Boot", "PostgreSQL",
+    "MySQL", "Redis", "Kafka", "RabbitMQ", "Elasticsearch", "AWS", "GCP", "Azure",
+    "Docker", "Kubernetes", "Terraform", "GraphQL", "gRPC", "Spark", "Airflow",
+]
+
+_FILLER = [
+    "You will work closely with product and design to ship features end to end.",
+    "We value ownership, clear written communication and pragmatic decisions.",
+    "Our platform serves millions of requests per day across several regions.",
+    "You will mentor engineers, review code and improve our delivery practices.",
+    "We offer competitive compensation, equity and a flexible remote policy.",
+    "The team is responsible for reliability, observability and on-call rotation.",
+]
+
+
+def job_descriptions(seed: int = 7) -> dict[str, str]:
+    """Short, typical and long job descriptions."""
+    rng = random.Random(seed)
+
+    def jd(company: str, paragraphs: int, techs: int) -> str:
+        stack = rng.sample(_TECH, techs)
+        lines = [f"Senior Software Engineer at {company}", "", "About the role:"]
+        lines += [rng.choice(_FILLER) for _ in range(paragraphs)]
+        lines += ["", "Requirements:"]
+        lines += [f"- {rng.randint(2, 8)}+ years with {tech}" for tech in stack[: techs // 2]]
+        lines += ["", "Nice to have: " + ", ".join(stack[techs // 2:]) + "."]
+        lines += ["", "About us:"] + [rng.choice(_FILLER) for _ in range(paragraphs)]
+        return "\n".join(lines)
+
+    return {
+        "short": jd("Acme", 1, 4),
+        "typical": jd("Globex", 6, 10),
+        "long": jd("Initech", 40, 24),
+    }
+
+
+def search_results(seed: int = 7) -> tuple[list[SearchHit], dict[str, list[SearchHit]]]:
+    """Company hits and per-technology hits like a full pipeline run collects."""
+    rng = random.Random(seed)
+
+    def hits(topic: str, count: int) -> list[SearchHit]:
+        return [
+            SearchHit(
+                title=f"{topic} article {i}",
+                url=f"https://site{i}.example.com/{topic.lower()}",
+                domain=f"site{i}.example.com",
+                snippets=[" ".join(rng.choice(_FILLER) for _ in range(3))],
+            )
+            for i in range(count)
+        ]
+
+    return hits("Company", 5), {tech: hits(tech, 5) for tech in _TECH[:5]}
+
+
+def llm_answers() -> dict[str, str]:
+    """Synthesis answers: small, typical and large, plus a fenced one."""
+    typical = analysis_json("Globex", 6)
+    return {
+        "small": analysis_json("Acme", 2),
+        "typical": typical,
+        "large": analysis_json("Initech", 40),
+        "fenced": f"```json\n{typical}\n```",
+    }
+
+
+def large_vocabulary() -> tuple[list[str], str]:
+    """Every bundled name and alias plus 1500 synthetic ones, and a long text."""
+    terms = [term for tech in vocabulary().technologies for term in (tech.name, *tech.aliases)]
+    terms += [f"Framework{i}js" for i in range(1500)]
+    words = "we build python kafka react native spring boot services with the team".split()
+    text = " ".join(words[i % len(words)] for i in range(1500)) + " Framework42js"
+    return terms, text
+
+
+
+def search_documents(count: int = 1000) -> list[tuple[str, dict[str, str]]]:
+    """*count* short documents for ``InvertedIndex``, four stack words each."""
+    words = "python react kafka kubernetes go rust java spring postgres redis aws gcp".split()
+    return [
+        (
+            str(i),
+            {
+                "company": f"Company{i}",
+                "body": " ".join(words[(i + k) % len(words)] for k in range(4)) + f" team{i}",
+            },
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,213 @@
+"""A stand-in for the You.com APIs, for offline load tests.
+
+``create_fake_app(profile)`` returns an ASGI app answering the routes
+``you_client`` calls — ``GET /v1/search``, ``GET /search`` (legacy) and
+``POST /v1/agents/runs`` (plain or streamed) — with generated payloads
+after latencies drawn from the profile.  A share of requests can be made
+to fail with 503 to exercise the retry path.
+
+Run it on its own with ``python -m benchmarks.fake_you --port 8900``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import zlib
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass(frozen=True, slots=True)
+class Latency:
+    """A latency distribution in seconds.
+
+    *kind* is ``"fixed"`` (always *median*), ``"uniform"`` (between 0 and
+    twice *median*) or ``"lognormal"`` (median *median*, shape *sigma*;
+    a long right tail like real APIs).
+    """
+
+    median: float = 0.0
+    kind: str = "lognormal"
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.kind == "fixed":
+            return self.median
+        if self.kind == "uniform":
+            return rng.uniform(0, 2 * self.median)
+        if self.kind == "lognormal":
+            return self.median * math.exp(self.sigma * rng.gauss(0, 1))
+        raise ValueError(f"Unknown latency kind: {self.kind!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class FakeProfile:
+    """How the fake APIs behave."""
+
+    search_latency: Latency = field(default_factory=Latency)
+    # Time to the first streamed chunk (or the whole answer when not streaming).
+    agent_latency: Latency = field(default_factory=Latency)
+    # Delay between streamed answer chunks.
+    agent_chunk_delay: float = 0.0
+    agent_chunk_chars: int = 64
+    # Share of requests answered with 503 (0..1).
+    error_rate: float = 0.0
+    search_results: int = 5
+    snippet_chars: int = 300
+    # Size of the generated analysis: items per list section.
+    analysis_items: int = 6
+    seed: int | None = None
+
+
+def analysis_json(company: str, items: int) -> str:
+    """A valid ``AnalysisResult`` JSON document with *items* entries per list."""
+    citation = {
+        "title": "Engineering blog",
+        "domain": "example.com",
+        "url": "https://example.com/post",
+    }
+    data = {
+        "companyName": company,
+        "companyIntelligence": [
+            {"text": f"{company} insight {i}: recent growth and launches.", "citation": citation}
+            for i in range(items)
+        ],
+        "techAnalysis": [
+            {
+                "name": f"Technology {i}",
+                "points": [
+                    {"text": "Used for core services; expect depth.", "citation": citation},
+                    {"text": "Know the performance trade-offs.", "citation": None},
+                ],
+            }
+            for i in range(items)
+        ],
+        "interviewFocus": [
+            {"topic": f"Topic {i}", "difficulty": "Medium", "description": "What they probe."}
+            for i in range(items)
+        ],
+        "practiceQuestions": [
+            {
+                "question": f"How would you design system {i} to scale?",
+                "difficulty": ("Easy", "Medium", "Hard")[i % 3],
+                "category": "System Design",
+                "hint": "Discuss caching, partitioning and failure modes.",
+            }
+            for i in range(items)
+        ],
+        "resources": [
+            {
+                "title": f"Resource {i}",
+                "domain": "docs.example.com",
+                "url": f"https://docs.example.com/{i}",
+                "description": "Official documentation.",
+            }
+            for i in range(items)
+        ],
+    }
+    return json.dumps(data)
+
+
+def create_fake_app(profile: FakeProfile | None = None) -> FastAPI:
+    """Build the fake You.com app for *profile*."""
+    profile = profile or FakeProfile()
+    rng = random.Random(profile.seed)
+    app = FastAPI(title="Fake You.com")
+    app.state.requests = {"search": 0, "agents": 0, "errors": 0}
+
+    def fail() -> bool:
+        if profile.error_rate > 0 and rng.random() < profile.error_rate:
+            app.state.requests["errors"] += 1
+            return True
+        return False
+
+    def search_body(query: str, count: int) -> list[dict]:
+        words = "lorem ipsum dolor sit amet " * (profile.snippet_chars // 27 + 1)
+        snippet = words[: profile.snippet_chars]
+        return [
+            {
+                "url": f"https://site{i}.example.com/{zlib.crc32(query.encode()) % 10_000}",
+                "title": f"{query[:40]} — result {i}",
+                "snippets": [snippet],
+                "description": snippet[:120],
+            }
+            for i in range(min(count, profile.search_results))
+        ]
+
+    @app.head("/")
+    async def warm_up() -> Response:
+        return Response()
+
+    @app.get("/v1/search")
+    async def search_v1(query: str, count: int = 5) -> Response:
+        app.state.requests["search"] += 1
+        await asyncio.sleep(profile.search_latency.sample(rng))
+        if fail():
+            return Response(status_code=503)
+        return JSONResponse({"results": {"web": search_body(query, count)}})
+
+    @app.get("/search")
+    async def search_legacy(query: str, num_web_results: int = 5) -> Response:
+        app.state.requests["search"] += 1
+        await asyncio.sleep(profile.search_latency.sample(rng))
+        if fail():
+            return Response(status_code=503)
+        return JSONResponse({"hits": search_body(query, num_web_results)})
+
+    @app.post("/v1/agents/runs")
+    async def agent_runs(request: Request) -> Response:
+        app.state.requests["agents"] += 1
+        body = await request.json()
+        await asyncio.sleep(profile.agent_latency.sample(rng))
+        if fail():
+            return Response(status_code=503)
+        answer = analysis_json("Acme", profile.analysis_items)
+        if not body.get("stream"):
+            return JSONResponse({"output": [{"type": "message.answer", "text": answer}]})
+        return StreamingResponse(_stream(answer, profile), media_type="text/event-stream")
+
+    return app
+
+
+async def _stream(answer: str, profile: FakeProfile) -> AsyncIterator[str]:
+    yield 'data: {"type": "response.created"}\n\n'
+    size = max(1, profile.agent_chunk_chars)
+    for start in range(0, len(answer), size):
+        if start and profile.agent_chunk_delay > 0:
+            await asyncio.sleep(profile.agent_chunk_delay)
+        delta = {
+            "type": "response.output_text.delta",
+            "response": {"type": "message.answer", "delta": answer[start:start + size]},
+        }
+        yield f"data: {json.dumps(delta)}\n\n"
+    yield 'data: {"type": "response.done"}\n\ndata: [DONE]\n\n'
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--agent-latency", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    profile = FakeProfile(
+        search_latency=Latency(args.search_latency),
+        agent_latency=Latency(args.agent_latency),
+        error_rate=args.error_rate,
+    )
+    uvicorn.run(create_fake_app(profile), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Load driver: concurrent ``/api/prepare`` streams against a fake upstream.
+
+Starts the fake You.com server (``fake_you``) and the real app from
+``create_app()`` on local ports, points ``you_client`` at the fake, then
+keeps *concurrency* SSE streams open until *requests* have completed.
+Every request uses a distinct job description (company and technology
+stack), so the result cache and in-flight sharing do not hide the work,
+and the search cache is off unless ``--search-cache`` is given.  Upstream
+calls go through the app's configured connection pool, so pool limits
+and contention are part of what is measured.
+
+The fake server runs on its own event loop in a separate thread.  The
+load generator shares the app's loop, so the reported loop lag includes
+its (small) client-side work, and both threads share the GIL.
+
+Reports throughput, time to first event (TTFE), completion latency and
+event-loop lag percentiles (how long the app's loop was blocked, sampled
+every 10 ms)::
+
+    python -m benchmarks.load --concurrency 50 --requests 500 \\
+        --search-latency 0.3 --agent-latency 1.0 --error-rate 0.02
+
+``--offload`` picks the executor for CPU-heavy steps (see
+``app.services.offload``); compare ``--offload none`` with ``thread`` at
+a large ``--analysis-items`` to see what offloading does to loop lag.
+
+``--max-p95-ms`` / ``--min-throughput`` make the run exit non-zero when
+the result is worse, for use as a pre-deploy gate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from unittest.mock import patch
+
+os.environ.setdefault("YOU_API_KEY", "benchmark-key")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.main import create_app  # noqa: E402
+from app.repositories import result_cache  # noqa: E402
+from app.services import http_pool, offload, you_client  # noqa: E402
+from app.services.loop_lag import LoopLagMonitor  # noqa: E402
+from benchmarks.fake_you import FakeProfile, Latency, create_fake_app  # noqa: E402
+
+JOB_TEMPLATE = (
+    "Senior Backend Engineer at Company{index}\n\n"
+    "About the role: build and scale the services behind our product.\n"
+    "Requirements:\n{requirements}\nNice to have: {nice_to_have}.\n"
+)
+
+# Technologies rotated through the job descriptions, so requests search
+# for different stacks.
+STACK = [
+    "Python", "TypeScript", "Go", "Rust", "Java", "Kotlin", "Scala", "Ruby", "PHP",
+    "C++", "React", "Vue", "Angular", "Node.js", "Django", "FastAPI", "Spring Boot",
+    "Rails", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "RabbitMQ",
+    "Elasticsearch", "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform",
+    "GraphQL", "gRPC", "Spark", "Airflow", "Snowflake",
+]
+
+
+def job_description(index: int) -> str:
+    """The job description for request *index*: its own company and stack."""
+    start = index * 7
+    stack = [STACK[(start + i) % len(STACK)] for i in range(8)]
+    return JOB_TEMPLATE.format(
+        index=index,
+        requirements="\n".join(f"- 5+ years with {tech}" for tech in stack[:5]),
+        nice_to_have=", ".join(stack[5:]),
+    )
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Outcome of one load run; latencies are in milliseconds."""
+
+    concurrency: int
+    requests: int
+    succeeded: int = 0
+    failed: int = 0
+    duration_s: float = 0.0
+    throughput_rps: float = 0.0
+    ttfe_ms: dict[str, float] = field(default_factory=dict)
+    completion_ms: dict[str, float] = field(default_factory=dict)
+    loop_lag_ms: dict[str, float] = field(default_factory=dict)
+    upstream: dict[str, int] = field(default_factory=dict)
+
+    def format(self) -> str:
+        def row(name: str, values: dict[str, float]) -> str:
+            return f"{name:<14}" + "".join(f"{k:>6} {v:>9.1f}" for k, v in values.items())
+
+        return "\n".join(
+            [
+                f"requests      {self.requests} (concurrency {self.concurrency}), "
+                f"{self.succeeded} ok, {self.failed} failed",
+                f"duration      {self.duration_s:.2f}s, {self.throughput_rps:.1f} req/s",
+                row("TTFE ms", self.ttfe_ms),
+                row("complete ms", self.completion_ms),
+                row("loop lag ms", self.loop_lag_ms),
+                f"upstream      {self.upstream}",
+            ]
+        )
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 (nearest rank) and max of *samples*, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))] * 1000
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99), "max": ordered[-1] * 1000}
+
+
+def _config(app: object) -> uvicorn.Config:
+    return uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning")
+
+
+def _port(server: uvicorn.Server) -> int:
+    return server.servers[0].sockets[0].getsockname()[1]
+
+
+async def _serve(app: object) -> tuple[uvicorn.Server, asyncio.Task, int]:
+    """Serve *app* on the running loop."""
+    server = uvicorn.Server(_config(app))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task, _port(server)
+
+
+async def _serve_in_thread(app: object) -> tuple[uvicorn.Server, threading.Thread, int]:
+    """Serve *app* on its own event loop in a daemon thread."""
+    server = uvicorn.Server(_config(app))
+    thread = threading.Thread(target=server.run, name="fake-upstream", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("fake upstream server failed to start")
+        await asyncio.sleep(0.01)
+    return server, thread, _port(server)
+
+
+class _RedirectTransport(httpx.AsyncBaseTransport):
+    """Sends every upstream request to the fake server instead, through the
+    app's configured connection pool."""
+
+    def __init__(self, port: int) -> None:
+        self._port = port
+        self._inner = http_pool.build_transport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self._port)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+async def _one_request(client: httpx.AsyncClient, index: int) -> tuple[float | None, float, bool]:
+    """POST one job description; return (TTFE, completion time, succeeded)."""
+    started = time.perf_counter()
+    first: float | None = None
+    last_type = None
+    try:
+        async with client.stream(
+            "POST", "/api/prepare", json={"jobDescription": job_description(index)}
+        ) as resp:
+            if resp.status_code != 200:
+                return None, time.perf_counter() - started, False
+            async for line in resp.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                if first is None:
+                    first = time.perf_counter() - started
+                last_type = json.loads(line[6:]).get("type")
+    except httpx.HTTPError:
+        return first, time.perf_counter() - started, False
+    return first, time.perf_counter() - started, last_type == "result"
+
+
+async def run_load(
+    concurrency: int = 10,
+    requests: int = 100,
+    profile: FakeProfile | None = None,
+    offload_executor: str | None = None,
+    offload_min_chars: int | None = None,
+    search_cache: bool = False,
+) -> LoadReport:
+    """Drive *requests* streams, *concurrency* at a time, and report.
+
+    *offload_executor* / *offload_min_chars* override the configured
+    offload strategy for the run.  The search cache is disabled unless
+    *search_cache* is true.
+    """
+    if search_cache:
+        you_client.search_cache.clear()
+        return await _run_load(concurrency, requests, profile, offload_executor, offload_min_chars)
+    uncached = replace(you_client.settings, search_cache_ttl=0)
+    with patch.object(you_client, "settings", uncached):
+        return await _run_load(concurrency, requests, profile, offload_executor, offload_min_chars)
+
+
+async def _run_load(
+    concurrency: int,
+    requests: int,
+    profile: FakeProfile | None,
+    offload_executor: str | None,
+    offload_min_chars: int | None,
+) -> LoadReport:
+    if offload_executor is not None:
+        offload.configure(offload_executor, offload_min_chars)
+    lag = LoopLagMonitor(interval=0.01)
+    fake_app = create_fake_app(profile)
+    fake_server, fake_thread, fake_port = await _serve_in_thread(fake_app)
+    await you_client.startup(transport=_RedirectTransport(fake_port))
+    await result_cache.startup()
+    app_server, app_task, app_port = await _serve(create_app())
+
+    ttfe: list[float] = []
+    completion: list[float] = []
+    report = LoadReport(concurrency=concurrency, requests=requests)
+    queue = iter(range(requests))
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{app_port}",
+            timeout=httpx.Timeout(120.0),
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        ) as client:
+
+            async def worker() -> None:
+                for index in queue:
+                    first, total, ok = await _one_request(client, index)
+                    if first is not None:
+                        ttfe.append(first)
+                    if ok:
+                        report.succeeded += 1
+                        completion.append(total)
+                    else:
+                        report.failed += 1
+
+            started = time.perf_counter()
+            lag.start()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            report.duration_s = time.perf_counter() - started
+    finally:
+        await lag.stop()
+        app_server.should_exit = True
+        fake_server.should_exit = True
+        await app_task
+        await asyncio.to_thread(fake_thread.join)
+        await result_cache.shutdown()
+        await you_client.shutdown()
+        offload.shutdown()
+
+    report.throughput_rps = report.succeeded / report.duration_s if report.duration_s else 0.0
+    report.ttfe_ms = percentiles(ttfe)
+    report.completion_ms = percentiles(completion)
+    report.loop_lag_ms = percentiles(list(lag.samples))
+    report.upstream = dict(fake_app.state.requests)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test /api/prepare against a fake You.com.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--search-latency", type=float, default=0.3, help="median seconds")
+    parser.add_argument("--agent-latency", type=float, default=1.0, help="median seconds")
+    parser.add_argument(
+        "--latency-kind", default="lognormal", choices=("fixed", "uniform", "lognormal")
+    )
+    parser.add_argument(
+        "--chunk-delay", type=float, default=0.01, help="seconds between agent chunks"
+    )
+    parser.add_argument("--chunk-chars", type=int, default=64, help="characters per agent chunk")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--analysis-items", type=int, default=6, help="items per result section")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--offload", choices=offload.EXECUTORS, help="offload executor")
+    parser.add_argument("--offload-min-chars", type=int, help="offload threshold")
+    parser.add_argument(
+        "--search-cache", action="store_true", help="keep the search cache on (off by default)"
+    )
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if p95 completion is slower")
+    parser.add_argument("--min-throughput", type=float, help="fail if fewer req/s")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logging")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    profile = FakeProfile(
+        search_latency=Latency(args.search_latency, args.latency_kind),
+        agent_latency=Latency(args.agent_latency, args.latency_kind),
+        agent_chunk_delay=args.chunk_delay,
+        agent_chunk_chars=args.chunk_chars,
+        error_rate=args.error_rate,
+        analysis_items=args.analysis_items,
+        seed=args.seed,
+    )
+    report = asyncio.run(
+        run_load(
+            args.concurrency,
+            args.requests,
+            profile,
+            args.offload,
+            args.offload_min_chars,
+            args.search_cache,
+        )
+    )
+    print(report.format())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(asdict(report), fh, indent=2)
+
+    failures = []
+    p95 = report.completion_ms.get("p95")
+    if args.max_p95_ms is not None and (p95 is None or p95 > args.max_p95_ms):
+        failures.append(f"p95 completion {p95} ms exceeds {args.max_p95_ms} ms")
+    if args.min_throughput is not None and report.throughput_rps < args.min_throughput:
+        failures.append(f"throughput {report.throughput_rps:.1f} req/s below {args.min_throughput}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+"""Micro-benchmarks for the CPU-bound steps of a request.
+
+Each case calls one hot function on a fixed input from ``corpus``:
+``extract_metadata``, ``build_synthesis_prompt``, SSE encoding, fence
+stripping + ``json.loads``, ``AnalysisResult.model_validate``, a
+history search over 1,000 entries and timing a block into a metrics
+histogram.  Some cases pair a hot path with the
+code it replaced: the single-pass ``TechMatcher`` against one regex per
+term on a large vocabulary (``tech_matcher`` vs ``tech_per_pattern``),
+and ``result_event`` on the model against ``model_dump()`` + encoding
+(``sse.result_event`` vs ``sse.result_event[via_dict]``).  For every
+case it reports operations per second (best of several timed rounds, to
+discount noise) and, from ``tracemalloc``, the peak memory one call
+allocates and the number of allocations still live when it returns (its
+result and anything it caches).
+
+Results can be saved as a baseline and later runs compared against it::
+
+    python -m benchmarks.micro --save          # write benchmarks/baselines.json
+    python -m benchmarks.micro                 # compare; exit 1 on regression
+    python -m benchmarks.micro --filter parse  # only matching cases
+
+A case regresses when its ops/sec drop, or its peak allocation or
+allocation count grows, by more than ``--threshold`` (default 40%)
+relative to the baseline.  A slowdown must also cost more than
+``--noise-floor`` (default 0.5 µs) per call, so sub-microsecond cases do
+not fail on scheduler jitter, and a case that looks slower is
+re-measured (``--confirm`` times) and only reported if it stays slower.
+``--save`` records the median of ``--save-runs`` full passes, not one
+pass's figures, so the baseline is not a lucky (or unlucky) outlier: on
+a shared machine the same case drifts by 20-40% from one minute to the
+next.
+
+Baselines are only comparable on the machine that produced them.  The
+baseline file records that machine (``--host`` names it; the CPU model,
+count and Python version are detected) and a run on different hardware
+prints a warning.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+os.environ.setdefault("YOU_API_KEY", "benchmark-key")
+
+from app.helpers.job_parser import TechMatcher, extract_metadata  # noqa: E402
+from app.helpers.prompts import build_synthesis_prompt  # noqa: E402
+from app.helpers.sse import event, progress_event, result_event, section_event  # noqa: E402
+from app.models import AnalysisResult  # noqa: E402
+from app.repositories.search_index import InvertedIndex  # noqa: E402
+from app.services import metrics  # noqa: E402
+from app.services.pipeline import _strip_markdown_fences  # noqa: E402
+from benchmarks import corpus  # noqa: E402
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+SEARCH_WEIGHTS = {"company": 4.0, "body": 1.0}
+DEFAULT_THRESHOLD = 0.4
+DEFAULT_NOISE_FLOOR = 0.5e-6  # seconds per call
+DEFAULT_CONFIRM = 2
+DEFAULT_SAVE_RUNS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    name: str
+    func: Callable[[], Any]
+
+
+@dataclass(slots=True)
+class Result:
+    name: str
+    ops_per_sec: float
+    peak_bytes: int
+    allocations: int
+
+
+def _parse(text: str) -> Any:
+    return json.loads(_strip_markdown_fences(text))
+
+
+def _result_via_dict(result: AnalysisResult) -> str:
+    """The ``model_dump()`` + encode path ``result_event(model)`` replaced."""
+    return event({"type": "result", "data": result.model_dump()})
+
+
+def _time_block(histogram: metrics.Histogram) -> None:
+    with histogram.time(stage="x"):
+        pass
+
+
+def _per_pattern(patterns: list[re.Pattern[str]], text: str) -> list[re.Match[str] | None]:
+    """The one-regex-per-term scan ``TechMatcher`` replaced, for comparison."""
+    return [pattern.search(text) for pattern in patterns]
+
+
+def cases() -> list[Case]:
+    """Every benchmark case, in report order."""
+    jds = corpus.job_descriptions()
+    answers = corpus.llm_answers()
+    company_hits, tech_hits = corpus.search_results()
+    metadata = extract_metadata(jds["typical"])
+    parsed = {size: _parse(text) for size, text in answers.items()}
+    analysis = AnalysisResult.model_validate(parsed["typical"])
+    questions = parsed["typical"]["practiceQuestions"]
+
+    found: list[Case] = []
+    for size, text in jds.items():
+        found.append(Case(f"extract_metadata[{size}]", partial(extract_metadata, text)))
+    for size in ("typical", "long"):
+        found.append(
+            Case(
+                f"build_synthesis_prompt[{size}]",
+                partial(
+                    build_synthesis_prompt,
+                    job_description=jds[size],
+                    company=metadata.company_name,
+                    role=metadata.role_title,
+                    technologies=metadata.technologies,
+                    company_results=company_hits,
+                    tech_results=tech_hits,
+                ),
+            )
+        )
+    found += [
+        Case("sse.event[partial]", partial(event, {"type": "partial", "text": "x" * 64})),
+        Case("sse.progress_event", partial(progress_event, 2, "done")),
+        Case("sse.section_event", partial(section_event, "practiceQuestions", questions)),
+        Case("sse.result_event", partial(result_event, analysis)),
+        Case("sse.result_event[via_dict]", partial(_result_via_dict, analysis)),
+    ]
+    for size, text in answers.items():
+        found.append(Case(f"parse_json[{size}]", partial(_parse, text)))
+    for size in ("small", "typical", "large"):
+        found.append(
+            Case(f"model_validate[{size}]", partial(AnalysisResult.model_validate, parsed[size]))
+        )
+    terms, text = corpus.large_vocabulary()
+    patterns = [re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE) for term in terms]
+    found += [
+        Case("tech_matcher[large_vocab]", partial(TechMatcher(terms).find, text)),
+        Case("tech_per_pattern[large_vocab]", partial(_per_pattern, patterns, text)),
+    ]
+    index = InvertedIndex(SEARCH_WEIGHTS)
+    for doc_id, fields in corpus.search_documents(1000):
+        index.add(doc_id, fields)
+    found.append(Case("search_index.search[1k_docs]", partial(index.search, "kafka kube", 20)))
+    histogram = metrics.Histogram("benchmark_seconds", "Micro-benchmark.", ["stage"])
+    found.append(Case("metrics.histogram_time", partial(_time_block, histogram)))
+    return found
+
+
+def measure(case: Case, min_time: float = 0.2, rounds: int = 5) -> Result:
+    """Time *case* (best of *rounds*, each at least *min_time* seconds)."""
+    func = case.func
+    func()  # warm caches (compiled regexes, validators)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 4 or number >= 1 << 24:
+            break
+        number *= 4
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+
+    tracemalloc.start()
+    try:
+        snapshot = _snapshot()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        kept = func()
+        peak = tracemalloc.get_traced_memory()[1] - before
+        allocations = sum(
+            max(0, stat.count_diff) for stat in _snapshot().compare_to(snapshot, "lineno")
+        )
+        del kept
+    finally:
+        tracemalloc.stop()
+    return Result(case.name, round(1 / best, 1), max(0, peak), allocations)
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    """Traced allocations, minus tracemalloc's own bookkeeping."""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+def run(name_filter: str = "", min_time: float = 0.2, rounds: int = 5) -> list[Result]:
+    return [
+        measure(case, min_time, rounds) for case in cases() if name_filter in case.name
+    ]
+
+
+def median_of_runs(
+    name_filter: str = "", min_time: float = 0.2, rounds: int = 5, runs: int = DEFAULT_SAVE_RUNS
+) -> list[Result]:
+    """Per case, the median ops/sec and allocation figures of *runs* passes."""
+    passes = [run(name_filter, min_time, rounds) for _ in range(max(1, runs))]
+    return [
+        Result(
+            same[0].name,
+            round(statistics.median(r.ops_per_sec for r in same), 1),
+            int(statistics.median(r.peak_bytes for r in same)),
+            int(statistics.median(r.allocations for r in same)),
+        )
+        for same in zip(*passes)
+    ]
+
+
+def _regressions(
+    result: Result, base: dict[str, float], threshold: float, noise_floor: float
+) -> list[str]:
+    found = []
+    slower_by = 1 / result.ops_per_sec - 1 / base["ops_per_sec"]  # seconds per call
+    if result.ops_per_sec < base["ops_per_sec"] * (1 - threshold) and slower_by > noise_floor:
+        found.append(
+            f"{result.name}: {result.ops_per_sec:,.0f} ops/s vs {base['ops_per_sec']:,.0f}"
+        )
+    if result.peak_bytes > base["peak_bytes"] * (1 + threshold) + 1024:
+        found.append(
+            f"{result.name}: peak {result.peak_bytes:,} B vs {base['peak_bytes']:,.0f} B"
+        )
+    if "allocations" in base and result.allocations > base["allocations"] * (1 + threshold) + 16:
+        found.append(
+            f"{result.name}: {result.allocations:,} allocations vs {base['allocations']:,.0f}"
+        )
+    return found
+
+
+def compare(
+    results: list[Result],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    noise_floor: float = DEFAULT_NOISE_FLOOR,
+) -> list[str]:
+    """Describe every result worse than its baseline by more than *threshold*
+    (and, for speed, by more than *noise_floor* seconds per call)."""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is not None:
+            regressions += _regressions(result, base, threshold, noise_floor)
+    return regressions
+
+
+def confirm(
+    results: list[Result],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    noise_floor: float = DEFAULT_NOISE_FLOOR,
+    attempts: int = DEFAULT_CONFIRM,
+    measure_case: Callable[[Case], Result] = measure,
+) -> list[Result]:
+    """Re-measure cases that look regressed, up to *attempts* times each.
+
+    A one-off slow run (another process took the CPU) should not fail the
+    gate, so each suspect keeps the best figures seen across its runs.
+    """
+    by_name = {case.name: case for case in cases()}
+    best = {r.name: r for r in results}
+    for _ in range(attempts):
+        suspects = [
+            r.name
+            for r in best.values()
+            if r.name in baseline and _regressions(r, baseline[r.name], threshold, noise_floor)
+        ]
+        if not suspects:
+            break
+        for name in suspects:
+            again = measure_case(by_name[name])
+            best[name] = Result(
+                name,
+                max(best[name].ops_per_sec, again.ops_per_sec),
+                min(best[name].peak_bytes, again.peak_bytes),
+                min(best[name].allocations, again.allocations),
+            )
+    return [best[r.name] for r in results]
+
+
+# ``machine_info()`` fields that must match for results to be comparable.
+HARDWARE_FIELDS = ("machine", "processor", "cpus", "python")
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine_info(host: str | None = None) -> dict[str, Any]:
+    """The machine and interpreter a baseline was recorded on.
+
+    *host* names the machine (default: its hostname).
+    """
+    return {
+        "host": host or platform.node(),
+        "machine": platform.machine(),
+        "processor": _cpu_model(),
+        "cpus": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+    }
+
+
+def same_hardware(recorded_on: dict[str, Any], current: dict[str, Any]) -> bool:
+    return all(recorded_on.get(field) == current[field] for field in HARDWARE_FIELDS)
+
+
+def _read(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, dict[str, float]]:
+    return _read(path).get("results", {})
+
+
+def load_baseline_machine(path: Path = BASELINES_PATH) -> dict[str, Any]:
+    return _read(path).get("recorded_on", {})
+
+
+def save_baselines(
+    results: list[Result], path: Path = BASELINES_PATH, host: str | None = None
+) -> None:
+    """Write *results* to *path*, keeping saved cases that were not re-run.
+
+    *host* names the machine in ``recorded_on``; by default the name
+    already saved is kept, or the hostname is used.
+    """
+    saved = load_baselines(path)
+    for r in results:
+        saved[r.name] = {k: v for k, v in asdict(r).items() if k != "name"}
+    host = host or load_baseline_machine(path).get("host")
+    data = {"recorded_on": machine_info(host), "results": saved}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def format_results(results: list[Result], baseline: dict[str, dict[str, float]]) -> str:
+    lines = [f"{'case':<34}{'ops/sec':>14}{'vs base':>9}{'peak KiB':>11}{'allocs':>8}"]
+    for r in results:
+        base = baseline.get(r.name)
+        change = f"{r.ops_per_sec / base['ops_per_sec'] - 1:+.0%}" if base else "-"
+        lines.append(
+            f"{r.name:<34}{r.ops_per_sec:>14,.0f}{change:>9}{r.peak_bytes / 1024:>11.1f}"
+            f"{r.allocations:>8,}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for CPU hot paths.")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--noise-floor",
+        type=float,
+        default=DEFAULT_NOISE_FLOOR * 1e6,
+        help="microseconds per call a slowdown must exceed to count",
+    )
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=DEFAULT_CONFIRM,
+        help="times to re-measure a case that looks regressed",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument(
+        "--save-runs",
+        type=int,
+        default=DEFAULT_SAVE_RUNS,
+        help="passes whose median --save records",
+    )
+    parser.add_argument("--host", help="name of this machine, recorded by --save")
+    args = parser.parse_args(argv)
+
+    baseline = load_baselines(args.baseline)
+    if args.save:
+        results = median_of_runs(args.filter, args.min_time, args.rounds, args.save_runs)
+        print(format_results(results, baseline))
+        save_baselines(results, args.baseline, args.host)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    results = run(args.filter, args.min_time, args.rounds)
+    recorded_on = load_baseline_machine(args.baseline)
+    current = machine_info()
+    if recorded_on and not same_hardware(recorded_on, current):
+        print(
+            f"warning: baseline was recorded on {recorded_on}, this is {current}; "
+            "results are not comparable",
+            file=sys.stderr,
+        )
+    noise_floor = args.noise_floor / 1e6
+    results = confirm(
+        results,
+        baseline,
+        args.threshold,
+        noise_floor,
+        args.confirm,
+        partial(measure, min_time=args.min_time, rounds=args.rounds),
+    )
+    print(format_results(results, baseline))
+    regressions = compare(results, baseline, args.threshold, noise_floor)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,3 +11,13 @@ import pytest
 def set_test_env():
     """Ensure YOU_API_KEY is set so you_client.startup() does not fail in integration tests."""
     os.environ.setdefault("YOU_API_KEY", "test-key-for-pytest")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_result_cache():
+    """Give every test an empty in-process result cache."""
+    from app.repositories import result_cache
+
+    result_cache.configure_backend(
+        result_cache.InMemoryResultCache(max_entries=16, max_bytes=1 << 20)
+    )
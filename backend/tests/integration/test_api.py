@@ -50,16 +50,36 @@ def test_health_returns_ok():
     assert resp.json() == {"status": "ok"}
 
 
+def test_health_upstream_reports_pool_and_cache():
+    """GET /api/health/upstream returns pool, search-cache and resilience counters."""
+    client = TestClient(app)
+    resp = client.get("/api/health/upstream")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body) == {"pool", "searchCache", "resilience"}
+    assert body["resilience"]["circuits"]["search"]["state"] == "closed"
+
+
+def test_metrics_endpoint_serves_exposition_format():
+    """GET /api/metrics returns pipeline and upstream metrics as text."""
+    client = TestClient(app)
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE interview_buddy_pipeline_stage_seconds histogram" in resp.text
+    assert "interview_buddy_search_cache_hits_total" in resp.text
+
+
 def test_prepare_valid_body_streams_sse_with_steps_progress_result():
     """POST /api/prepare with valid body streams SSE: steps, progress, result."""
     async def mock_search(_query: str):
         return []
 
     async def mock_research(_prompt: str):
-        return _minimal_analysis_json("Acme")
+        yield _minimal_analysis_json("Acme")
 
     with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
-        with patch("app.services.pipeline.you_client.research", side_effect=mock_research):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
             client = TestClient(app)
             resp = client.post(
                 "/api/prepare",
@@ -86,6 +106,71 @@ def test_prepare_valid_body_streams_sse_with_steps_progress_result():
     assert "result" in types
 
 
+def test_prepare_bypass_cache_reruns_pipeline():
+    """A repeated JD is served from cache unless bypassCache is set."""
+    calls = 0
+
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research(_prompt: str):
+        nonlocal calls
+        calls += 1
+        yield _minimal_analysis_json("Acme")
+
+    body = {"jobDescription": "Senior Engineer at Acme. Python, React."}
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            client = TestClient(app)
+            assert client.post("/api/prepare", json=body).status_code == 200
+            assert client.post("/api/prepare", json=body).status_code == 200
+            assert calls == 1
+            resp = client.post("/api/prepare", json={**body, "bypassCache": True})
+            types = [
+                json.loads(line[6:])["type"]
+                for line in resp.text.splitlines()
+                if line.startswith("data: ")
+            ]
+            assert types[-1] == "result"
+            assert calls == 2
+
+
+def test_prepare_with_trace_header_ends_with_trace_event():
+    """X-Trace: 1 appends a trace event with the run's spans."""
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research(_prompt: str):
+        yield _minimal_analysis_json("Acme")
+
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            client = TestClient(app)
+            resp = client.post(
+                "/api/prepare",
+                json={"jobDescription": "Senior Engineer at Acme. Python, React."},
+                headers={"X-Trace": "1"},
+            )
+
+    payloads = [
+        json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: ")
+    ]
+    assert [p["type"] for p in payloads][-2:] == ["result", "trace"]
+    spans = {span["name"] for span in payloads[-1]["trace"]["spans"]}
+    assert {"pipeline.run", "extract_metadata", "synthesise", "validate"} <= spans
+
+
+def test_prepare_rejects_unknown_pacing_header():
+    """An X-Pacing value other than "ui" or "none" is rejected with 400."""
+    client = TestClient(app)
+    resp = client.post(
+        "/api/prepare",
+        json={"jobDescription": "Engineer at Acme."},
+        headers={"X-Pacing": "slow"},
+    )
+    assert resp.status_code == 400
+
+
 def test_prepare_missing_job_description_returns_422():
     """POST /api/prepare with missing jobDescription returns 422."""
     client = TestClient(app)
@@ -151,6 +236,77 @@ def test_history_save_and_list():
     items = resp2.json()
     assert len(items) == 1
     assert items[0]["id"] == data["id"]
+    assert items[0]["jobDescriptionPreview"] == body["jobDescription"]
+    assert "results" not in items[0]
+    assert "jobDescription" not in items[0]
+
+
+def test_history_list_paginates_with_cursor():
+    """GET /api/history?limit= returns pages linked by the X-Next-Cursor header."""
+    client = TestClient(app)
+    for company in ("A", "B", "C"):
+        body = {"jobDescription": f"Job at {company}.", "results": _minimal_analysis_result(company)}
+        assert client.post("/api/history", json=body).status_code == 200
+
+    first = client.get("/api/history", params={"limit": 2})
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/history", params={"limit": 2, "cursor": cursor})
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+
+    ids = [i["id"] for i in first.json() + second.json()]
+    assert ids == [i["id"] for i in client.get("/api/history").json()]
+
+
+def test_history_list_selects_fields():
+    """GET /api/history?fields= narrows each item; unknown fields are rejected."""
+    client = TestClient(app)
+    body = {"jobDescription": "Job at Acme.", "results": _minimal_analysis_result("Acme")}
+    client.post("/api/history", json=body)
+
+    resp = client.get("/api/history", params={"fields": "id,companyName"})
+    assert resp.status_code == 200
+    assert list(resp.json()[0]) == ["id", "companyName"]
+    assert client.get("/api/history", params={"fields": "id,results"}).status_code == 400
+
+
+def test_history_search_returns_ranked_summaries():
+    """GET /api/history/search?q= finds entries by text and is not routed as an id."""
+    client = TestClient(app)
+    for company, jd in (("Acme", "Kafka pipelines at Acme."), ("Beta", "React at Beta.")):
+        body = {"jobDescription": jd, "results": _minimal_analysis_result(company)}
+        assert client.post("/api/history", json=body).status_code == 200
+
+    resp = client.get("/api/history/search", params={"q": "kafka"})
+    assert resp.status_code == 200
+    items = resp.json()
+    assert [i["companyName"] for i in items] == ["Acme"]
+    assert "results" not in items[0]
+    assert client.get("/api/history/search", params={"q": "nothing-like-this"}).json() == []
+    assert client.get("/api/history/search").status_code == 422
+
+
+def test_history_stats_reports_store_size():
+    """GET /api/history/stats reports entries and eviction counters."""
+    client = TestClient(app)
+    body = {"jobDescription": "Job at Acme.", "results": _minimal_analysis_result("Acme")}
+    client.post("/api/history", json=body)
+
+    resp = client.get("/api/history/stats")
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+    assert stats["evictions"] == 0
+
+
+def test_history_list_invalid_cursor_returns_400():
+    """A malformed cursor is rejected with 400."""
+    client = TestClient(app)
+    assert client.get("/api/history", params={"cursor": "***"}).status_code == 400
 
 
 def test_history_get_by_id():
@@ -197,3 +353,33 @@ def test_history_save_invalid_body_returns_422():
     assert client.post("/api/history", json={}).status_code == 422
     assert client.post("/api/history", json={"jobDescription": "x"}).status_code == 422
     assert client.post("/api/history", json={"results": results}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_history_handlers_do_not_block_the_event_loop():
+    """A slow history-store call (e.g. a locked SQLite database) runs off the loop."""
+    import asyncio
+    import time
+
+    import httpx
+
+    def slow_get(_id: str):
+        time.sleep(0.3)
+        return None
+
+    finished: list[str] = []
+
+    async def fetch(client: httpx.AsyncClient, path: str) -> None:
+        await client.get(path)
+        finished.append(path)
+
+    transport = httpx.ASGITransport(app=app)
+    with patch("app.controllers.history.get_by_id", side_effect=slow_get):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.create_task(fetch(client, "/api/history/missing"))
+            await asyncio.sleep(0.05)
+            await fetch(client, "/api/health")
+            await slow
+
+    assert finished == ["/api/health", "/api/history/missing"]
+
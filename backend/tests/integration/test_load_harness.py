@@ -0,0 +1,67 @@
+"""Smoke test for the benchmark harness (benchmarks/)."""
+
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import patch
+
+from app.config import settings
+from app.services import you_client
+from benchmarks import load
+from benchmarks.fake_you import FakeProfile, Latency
+
+
+async def test_load_run_reports_latencies_against_fake_upstream():
+    """A small run completes every stream and fills in the report."""
+    profile = FakeProfile(
+        search_latency=Latency(0.002, "fixed"),
+        agent_latency=Latency(0.005, "fixed"),
+        analysis_items=2,
+        seed=1,
+    )
+    keyed = dataclasses.replace(settings, you_api_key="test-key", http_warmup=False)
+    with patch("app.services.you_client.settings", keyed):
+        report = await load.run_load(concurrency=3, requests=6, profile=profile)
+
+    assert (report.succeeded, report.failed) == (6, 0)
+    assert report.throughput_rps > 0
+    assert set(report.completion_ms) == {"p50", "p95", "p99", "max"}
+    assert report.ttfe_ms["p50"] <= report.completion_ms["p50"]
+    assert report.upstream["agents"] == 6
+    # The search cache is off: every request searches its company and stack.
+    assert report.upstream["search"] >= 6 * (1 + settings.max_technologies)
+    assert "p99" in report.loop_lag_ms
+
+
+async def test_load_run_survives_upstream_errors():
+    """Injected 503s are retried by you_client instead of failing streams."""
+    profile = FakeProfile(error_rate=0.3, analysis_items=1, seed=7)
+    keyed = dataclasses.replace(
+        settings,
+        you_api_key="test-key",
+        http_warmup=False,
+        upstream_retry_attempts=6,
+        upstream_retry_base_delay=0.0,
+        circuit_failure_threshold=1000,
+    )
+    with patch("app.services.you_client.settings", keyed):
+        you_client.reset_resilience()
+        report = await load.run_load(concurrency=2, requests=4, profile=profile)
+
+    you_client.reset_resilience()
+    assert report.succeeded == 4
+    assert report.upstream["errors"] > 0
+
+
+def test_percentiles_use_nearest_rank():
+    samples = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert load.percentiles(samples) == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+
+
+def test_job_descriptions_vary_company_and_stack():
+    from app.helpers.job_parser import extract_metadata
+
+    first, second = (extract_metadata(load.job_description(i)) for i in (0, 1))
+    assert first.company_name != second.company_name
+    assert first.technologies != second.technologies
+
@@ -0,0 +1,85 @@
+"""Unit tests for app.repositories.blob_codec."""
+
+from __future__ import annotations
+
+import importlib.util
+import zlib
+
+import pytest
+
+from app.models import AnalysisResult, CompanyInsight, PracticeQuestion, SavedAnalysis
+from app.repositories.blob_codec import BlobCodec
+
+
+def _entry_json() -> str:
+    return SavedAnalysis(
+        id="1",
+        jobDescription="Backend Engineer at Acme. Requirements: Python, Kafka, AWS. " * 3,
+        companyName="Acme",
+        roleTitle="Acme Analysis",
+        results=AnalysisResult(
+            companyName="Acme",
+            companyIntelligence=[CompanyInsight(text=f"Acme insight {i}.") for i in range(5)],
+            techAnalysis=[],
+            interviewFocus=[],
+            practiceQuestions=[
+                PracticeQuestion(
+                    question=f"How would you scale service {i}?",
+                    difficulty="Hard",
+                    category="System Design",
+                    hint="Think about partitioning.",
+                )
+                for i in range(5)
+            ],
+            resources=[],
+        ),
+        savedAt=1,
+    ).model_dump_json()
+
+
+@pytest.mark.parametrize("method", ["none", "zlib"])
+def test_round_trip(method):
+    """decode(encode(text)) returns the original text."""
+    codec = BlobCodec(method)
+    text = _entry_json()
+    assert codec.decode(codec.encode(text)) == text
+
+
+def test_zlib_dictionary_beats_plain_zlib():
+    """The preset dictionary makes entries smaller than compressing them alone."""
+    text = _entry_json()
+    blob = BlobCodec("zlib").encode(text)
+    assert len(blob) < len(zlib.compress(text.encode()))
+    assert len(blob) * 4 < len(text)
+
+
+def test_blobs_decode_after_method_change():
+    """Blobs carry their method, so any codec can read them."""
+    text = _entry_json()
+    assert BlobCodec("none").decode(BlobCodec("zlib").encode(text)) == text
+    assert BlobCodec("zlib").decode(BlobCodec("none").encode(text)) == text
+
+
+def test_unknown_method_and_tag_rejected():
+    """Unknown methods and corrupt blobs raise ValueError."""
+    with pytest.raises(ValueError):
+        BlobCodec("lz4")
+    with pytest.raises(ValueError):
+        BlobCodec().decode(b"\x7fdata")
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("zstandard") is not None, reason="zstandard is installed"
+)
+def test_zstd_without_package_raises():
+    """Asking for zstd without the optional package fails clearly."""
+    with pytest.raises(RuntimeError, match="zstandard"):
+        BlobCodec("zstd")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("zstandard") is None, reason="needs zstandard")
+def test_zstd_round_trip():
+    """zstd blobs round-trip with the shared dictionary."""
+    codec = BlobCodec("zstd")
+    text = _entry_json()
+    assert codec.decode(codec.encode(text)) == text
@@ -0,0 +1,159 @@
+"""Unit tests for app.services.cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(clock: _Clock | None = None, **kwargs) -> TTLCache[str]:
+    options = {"ttl": 10.0, "max_entries": 3, "max_bytes": 100, "sizeof": len}
+    options.update(kwargs)
+    return TTLCache(clock=clock or _Clock(), **options)
+
+
+def test_get_returns_stored_value_until_ttl_expires():
+    """Entries are served until their TTL elapses, then dropped."""
+    clock = _Clock()
+    cache = _cache(clock)
+    cache.put("k", "value")
+    clock.now = 9.9
+    assert cache.get("k") == "value"
+    clock.now = 10.0
+    assert cache.get("k") is None
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_put_evicts_least_recently_used_entry():
+    """Exceeding max_entries evicts the least recently used key."""
+    cache = _cache()
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.put("c", "3")
+    assert cache.get("a") == "1"  # "b" is now the LRU entry
+    cache.put("d", "4")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.evictions == 1
+
+
+def test_put_enforces_byte_cap():
+    """Entries are evicted to stay within max_bytes; oversized values are not stored."""
+    cache = _cache(max_entries=100, max_bytes=10)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.put("c", "xxxx")
+    assert cache.get("a") is None
+    assert cache.bytes == 8
+    cache.put("huge", "x" * 11)
+    assert cache.get("huge") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_counts_hits_and_misses():
+    """First load is a miss; the next call is a hit that does not call the loader."""
+    cache = _cache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return "v"
+
+    assert await cache.get_or_load("k", loader) == "v"
+    assert await cache.get_or_load("k", loader) == "v"
+    assert calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_loads():
+    """Concurrent calls for one key share a single load."""
+    cache = _cache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "v"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+    assert results == ["v"] * 5
+    assert calls == 1
+    assert cache.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_failures():
+    """A failing load propagates to all waiters and is retried next time."""
+    cache = _cache()
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    outcomes = await asyncio.gather(
+        cache.get_or_load("k", flaky), cache.get_or_load("k", flaky), return_exceptions=True
+    )
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert await cache.get_or_load("k", flaky) == "ok"
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_load():
+    """Cancelling one caller leaves the load running for the others."""
+    cache = _cache()
+
+    async def loader():
+        await asyncio.sleep(0.02)
+        return "v"
+
+    first = asyncio.create_task(cache.get_or_load("k", loader))
+    second = asyncio.create_task(cache.get_or_load("k", loader))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "v"
+    assert cache.get("k") == "v"
+
+
+async def test_clear_forgets_in_flight_loads():
+    """A load running during clear() neither serves new callers nor repopulates the cache."""
+    cache = _cache()
+    release_stale = asyncio.Event()
+
+    async def stale():
+        await release_stale.wait()
+        return "stale"
+
+    async def fresh():
+        return "fresh"
+
+    waiting = asyncio.create_task(cache.get_or_load("k", stale))
+    await asyncio.sleep(0)
+    cache.clear()
+    assert await asyncio.wait_for(cache.get_or_load("k", fresh), 1) == "fresh"
+    assert cache.coalesced == 0
+
+    release_stale.set()
+    assert await waiting == "stale"
+    assert cache.get("k") == "fresh"
@@ -0,0 +1,322 @@
+"""Unit tests for app.repositories.history_backends."""
+
+from __future__ import annotations
+
+import multiprocessing
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models import AnalysisResult, CompanyInsight, SavedAnalysis
+from app.repositories.history_backends import (
+    PREVIEW_CHARS,
+    MemoryHistoryBackend,
+    SQLiteHistoryBackend,
+    summarize,
+)
+
+
+def _entry(id: str, saved_at: int, company: str = "Acme") -> SavedAnalysis:
+    return SavedAnalysis(
+        id=id,
+        jobDescription=f"Engineer at {company}. Python.",
+        companyName=company,
+        roleTitle=f"{company} Analysis",
+        results=AnalysisResult(
+            companyName=company,
+            companyIntelligence=[CompanyInsight(text="Insight")],
+            techAnalysis=[],
+            interviewFocus=[],
+            practiceQuestions=[],
+            resources=[],
+        ),
+        savedAt=saved_at,
+    )
+
+
+def _put(backend, entry: SavedAnalysis) -> None:
+    backend.put(entry, summarize(entry))
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryHistoryBackend()
+    else:
+        sqlite = SQLiteHistoryBackend(tmp_path / "history.db")
+        yield sqlite
+        sqlite.close()
+
+
+def test_put_get_round_trip(backend):
+    """A stored entry comes back equal, including nested results."""
+    entry = _entry("a", 1)
+    _put(backend, entry)
+    assert backend.get("a") == entry
+    assert backend.get("missing") is None
+
+
+def test_list_all_newest_first(backend):
+    """list_all() orders by savedAt descending."""
+    for id, saved_at in (("a", 1), ("c", 3), ("b", 2)):
+        _put(backend, _entry(id, saved_at))
+    assert [e.id for e in backend.list_all()] == ["c", "b", "a"]
+
+
+def test_delete_and_clear(backend):
+    """delete() reports whether the entry existed; clear() empties the store."""
+    _put(backend, _entry("a", 1))
+    _put(backend, _entry("b", 2))
+    assert backend.delete("a") is True
+    assert backend.delete("a") is False
+    backend.clear()
+    assert backend.list_all() == []
+
+
+def test_sqlite_persists_across_connections(tmp_path):
+    """Entries written by one connection are visible after reopening the file."""
+    path = tmp_path / "history.db"
+    first = SQLiteHistoryBackend(path)
+    _put(first, _entry("a", 1, "Beta"))
+    first.close()
+
+    second = SQLiteHistoryBackend(path)
+    assert second.get("a").companyName == "Beta"
+    mode = second._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+    second.close()
+
+
+def test_list_page_walks_history_in_order(backend):
+    """list_page() returns newest-first slices strictly older than the given key."""
+    for i in range(5):
+        _put(backend, _entry(f"id{i}", 100 + i))
+    _put(backend, _entry("tie", 102))
+
+    first = backend.list_page(3)
+    assert [e.id for e in first] == ["id4", "id3", "tie"]
+    rest = backend.list_page(10, before=(first[-1].savedAt, first[-1].id))
+    assert [e.id for e in rest] == ["id2", "id1", "id0"]
+
+
+def test_list_page_reflects_deletes_and_replacements(backend):
+    """The sorted index follows deletes and re-saves of the same id."""
+    _put(backend, _entry("a", 1))
+    _put(backend, _entry("b", 2))
+    _put(backend, _entry("a", 3))
+    backend.delete("b")
+    assert [e.id for e in backend.list_page(10)] == ["a"]
+    assert [e.id for e in backend.list_all()] == ["a"]
+
+
+def test_list_page_returns_summaries(backend):
+    """Listings carry the summary fields and a truncated description only."""
+    entry = _entry("a", 1).model_copy(update={"jobDescription": "x" * (PREVIEW_CHARS + 50)})
+    _put(backend, entry)
+    (summary,) = backend.list_page()
+    assert summary.id == "a"
+    assert summary.companyName == "Acme"
+    assert summary.jobDescriptionPreview == "x" * PREVIEW_CHARS
+    assert not hasattr(summary, "results")
+
+
+def _old_database(path) -> SavedAnalysis:
+    """Create a database from before summaries and search; return its entry."""
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE saved_analyses (id TEXT PRIMARY KEY, saved_at INTEGER NOT NULL, "
+        "company_name TEXT NOT NULL, role_title TEXT NOT NULL, "
+        "job_description TEXT NOT NULL, results TEXT NOT NULL)"
+    )
+    entry = _entry("a", 1)
+    conn.execute(
+        "INSERT INTO saved_analyses VALUES (?, ?, ?, ?, ?, ?)",
+        ("a", 1, "Acme", "Acme Analysis", entry.jobDescription, entry.results.model_dump_json()),
+    )
+    conn.commit()
+    conn.close()
+    return entry
+
+
+def test_sqlite_migrates_old_databases(tmp_path):
+    """A database from before summaries and search gains both, backfilled."""
+    path = tmp_path / "history.db"
+    entry = _old_database(path)
+
+    backend = SQLiteHistoryBackend(path)
+    assert backend.list_page()[0].jobDescriptionPreview == entry.jobDescription
+    assert backend.get("a") == entry
+    assert [s.id for s in backend.search("python", 10)] == ["a"]
+    backend.close()
+
+
+def test_search_ranks_matching_entries(backend):
+    """search() matches company, technology, question and job text."""
+    stripe = _entry("s", 2, "Stripe").model_copy(
+        update={"jobDescription": "Payments in Go. Acme is a partner."}
+    )
+    for entry in (_entry("a", 1, "Acme"), stripe):
+        _put(backend, entry)
+    assert [s.id for s in backend.search("acme", 10)] == ["a", "s"]
+    assert [s.id for s in backend.search("payments g", 10)] == ["s"]
+    assert backend.search("rust", 10) == []
+    assert backend.search("  ", 10) == []
+
+    backend.delete("a")
+    assert [s.id for s in backend.search("acme", 10)] == ["s"]
+    backend.clear()
+    assert backend.search("stripe", 10) == []
+
+
+def test_sqlite_search_survives_reopen(tmp_path):
+    """The full-text index is persisted with the entries."""
+    path = tmp_path / "history.db"
+    first = SQLiteHistoryBackend(path)
+    _put(first, _entry("a", 1, "Beta"))
+    first.close()
+
+    second = SQLiteHistoryBackend(path)
+    assert [s.id for s in second.search("beta", 10)] == ["a"]
+    second.close()
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Past max_entries the entry not read for longest is evicted."""
+    backend = MemoryHistoryBackend(max_entries=2, eviction="lru")
+    _put(backend, _entry("a", 1))
+    _put(backend, _entry("b", 2))
+    backend.get("a")
+    _put(backend, _entry("c", 3))
+    assert [e.id for e in backend.list_all()] == ["c", "a"]
+    assert backend.search("engineer", 10) and backend.get("b") is None
+    assert backend.stats()["evictions"] == 1
+
+
+def test_memory_backend_evicts_oldest_by_age_policy():
+    """With eviction="age" reads do not protect an entry; the oldest save goes."""
+    backend = MemoryHistoryBackend(max_entries=2, eviction="age")
+    _put(backend, _entry("a", 1))
+    _put(backend, _entry("b", 2))
+    backend.get("a")
+    _put(backend, _entry("c", 3))
+    assert [e.id for e in backend.list_all()] == ["c", "b"]
+
+
+def test_memory_backend_respects_byte_cap():
+    """Entries are evicted until the stored (compressed) size fits max_bytes."""
+    probe = MemoryHistoryBackend()
+    _put(probe, _entry("0", 0))
+    size = probe.stats()["bytes"]
+    cap = size * 2 + size // 2
+    backend = MemoryHistoryBackend(max_bytes=cap)
+    for i in range(5):
+        _put(backend, _entry(str(i), i))
+    stats = backend.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= cap
+    assert stats["evictions"] == 3
+    backend.delete("4")
+    assert backend.stats()["bytes"] == len(backend._blobs["3"])
+
+
+def test_memory_backend_expires_old_entries():
+    """Entries saved more than max_age seconds ago disappear from every read."""
+    now = [100.0]
+    backend = MemoryHistoryBackend(max_age=10, clock=lambda: now[0])
+    _put(backend, _entry("old", 95_000))
+    _put(backend, _entry("new", 99_000))
+    now[0] = 106.0
+    assert [s.id for s in backend.list_page()] == ["new"]
+    assert backend.get("old") is None
+    assert backend.search("engineer", 10)[0].id == "new"
+    assert backend.stats()["expirations"] == 1
+
+
+def test_memory_backend_rejects_unknown_policy():
+    """Only "lru" and "age" are accepted."""
+    with pytest.raises(ValueError):
+        MemoryHistoryBackend(eviction="random")
+
+
+def test_stats_report_entry_count(backend):
+    """Both backends report their entry count."""
+    _put(backend, _entry("a", 1))
+    stats = backend.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+
+
+def _churn(backend, worker: int) -> None:
+    for i in range(150):
+        entry = _entry(f"{worker}-{i % 10}", worker * 1000 + i)
+        _put(backend, entry)
+        backend.list_page(limit=5)
+        backend.search("python", 10)
+        backend.get(entry.id)
+        backend.delete(f"{(worker + 1) % 8}-{i % 10}")
+
+
+@pytest.mark.parametrize("max_entries", [0, 20])
+def test_memory_backend_survives_concurrent_threads(max_entries):
+    """Handlers run in a threadpool: puts, reads, searches, deletes and
+    evictions from several threads leave the backend consistent."""
+    backend = MemoryHistoryBackend(max_entries=max_entries)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often, to expose races
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            for future in [pool.submit(_churn, backend, w) for w in range(8)]:
+                future.result()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    page = backend.list_page()
+    assert [s.savedAt for s in page] == sorted((s.savedAt for s in page), reverse=True)
+    assert {s.id for s in backend.search("python", 1000)} == {s.id for s in page}
+    assert backend.stats()["entries"] == len(page)
+    assert backend.stats()["bytes"] == sum(len(backend._blobs[s.id]) for s in page)
+
+
+def _open_backend(path, barrier) -> None:
+    barrier.wait()
+    SQLiteHistoryBackend(path).close()
+
+
+def _open_concurrently(path, processes: int = 8) -> list[int]:
+    """Open (and so migrate) the database from several processes at once."""
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    barrier = ctx.Barrier(processes)
+    workers = [ctx.Process(target=_open_backend, args=(path, barrier)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    return [worker.exitcode for worker in workers]
+
+
+def test_sqlite_schema_created_by_concurrent_workers(tmp_path):
+    """Workers starting together on a fresh database all open it."""
+    path = tmp_path / "history.db"
+    assert _open_concurrently(path) == [0] * 8
+
+    backend = SQLiteHistoryBackend(path)
+    _put(backend, _entry("a", 1))
+    assert [s.id for s in backend.search("python", 10)] == ["a"]
+    backend.close()
+
+
+def test_sqlite_old_database_migrated_by_concurrent_workers(tmp_path):
+    """Workers upgrading the same old database together add the column once."""
+    path = tmp_path / "history.db"
+    entry = _old_database(path)
+    assert _open_concurrently(path) == [0] * 8
+
+    backend = SQLiteHistoryBackend(path)
+    assert backend.list_page()[0].jobDescriptionPreview == entry.jobDescription
+    assert [s.id for s in backend.search("python", 10)] == ["a"]
+    backend.close()
+
@@ -68,3 +68,72 @@ def test_delete():
     assert get_by_id(entry.id) is None
     assert delete(entry.id) is False
     assert delete("nonexistent") is False
+
+
+def test_list_summaries_mirror_saved_entries():
+    """list_summaries() returns lightweight summaries in history order."""
+    from app.repositories.history_store import list_summaries
+
+    entry = save("Job at Acme. Python.", _minimal_result("Acme"))
+    (summary,) = list_summaries()
+    assert summary.id == entry.id
+    assert summary.roleTitle == entry.roleTitle
+    assert summary.savedAt == entry.savedAt
+    assert summary.jobDescriptionPreview == "Job at Acme. Python."
+
+
+def test_search_follows_saves_and_deletes():
+    """search() sees new entries immediately and forgets deleted ones."""
+    from app.repositories.history_store import search
+
+    entry = save("Rust services at Acme.", _minimal_result("Acme"))
+    save("Java at Beta.", _minimal_result("Beta"))
+    assert [s.id for s in search("rust", 10)] == [entry.id]
+    delete(entry.id)
+    assert search("rust", 10) == []
+
+
+def test_store_with_sqlite_backend(tmp_path):
+    """The store functions behave the same on the SQLite backend."""
+    from app.repositories import history_store
+    from app.repositories.history_backends import MemoryHistoryBackend, SQLiteHistoryBackend
+
+    backend = SQLiteHistoryBackend(tmp_path / "history.db")
+    history_store.configure_backend(backend)
+    try:
+        entry = save("Job at Acme.", _minimal_result("Acme"))
+        assert [e.id for e in list_all()] == [entry.id]
+        assert get_by_id(entry.id) == entry
+        assert delete(entry.id) is True
+        assert get_by_id(entry.id) is None
+    finally:
+        backend.close()
+        history_store.configure_backend(MemoryHistoryBackend())
+
+
+def test_list_page_follows_cursor_to_the_end():
+    """list_page() pages through all entries and returns no cursor on the last page."""
+    from app.repositories.history_store import list_page
+
+    ids = [save(f"Job {i}", _minimal_result(f"C{i}")).id for i in range(5)]
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page, cursor = list_page(2, cursor)
+        seen.extend(entry.id for entry in page)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+    assert seen == [e.id for e in list_all()]
+
+
+def test_decode_cursor_rejects_garbage():
+    """Malformed cursors raise ValueError."""
+    from app.repositories.history_store import decode_cursor, encode_cursor
+
+    assert decode_cursor(encode_cursor((123, "abc:def"))) == (123, "abc:def")
+    with pytest.raises(ValueError):
+        decode_cursor("!!!")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor((1, "x"))[:-2] + "zz")
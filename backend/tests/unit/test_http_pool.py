@@ -0,0 +1,194 @@
+"""Unit tests for app.services.http_pool."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import shutil
+import ssl
+import subprocess
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import http_pool, you_client
+
+
+class _TracingTransport(httpx.AsyncBaseTransport):
+    """Fake pool: waits *delay* for a "connection", reporting it via the trace hook."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.delay)
+        trace = request.extensions.get("trace")
+        if trace is not None:
+            await trace("connection.connect_tcp.complete", {})
+        return httpx.Response(200, stream=httpx.ByteStream(b"ok"))
+
+
+@pytest.mark.asyncio
+async def test_monitor_tracks_in_flight_until_body_closed():
+    """A streamed response holds its slot until its body is read or closed."""
+    client, monitor = http_pool.build_client(_TracingTransport())
+    async with client.stream("GET", "https://example.test/") as resp:
+        assert monitor.stats()["inFlight"] == 1
+        await resp.aread()
+        assert monitor.stats()["inFlight"] == 0
+    await client.get("https://example.test/")
+    stats = monitor.stats()
+    assert stats["inFlight"] == 0
+    assert stats["requests"] == 2
+    assert stats["peakInFlight"] == 1
+    assert stats["connectionsOpened"] == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_pool_wait_and_peak():
+    """Time to the first connection event is recorded as the pool wait."""
+    client, monitor = http_pool.build_client(_TracingTransport(delay=0.02))
+    await asyncio.gather(*(client.get("https://example.test/") for _ in range(3)))
+    stats = monitor.stats()
+    assert stats["peakInFlight"] == 3
+    assert stats["waitMaxMs"] >= 15
+    assert stats["waitAvgMs"] > 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_monitor_releases_slot_on_transport_error():
+    """A request that fails before a response does not stay in flight."""
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    client, monitor = http_pool.build_client(httpx.MockTransport(handler))
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://example.test/")
+    assert monitor.stats()["inFlight"] == 0
+    await client.aclose()
+
+
+def test_operation_timeout_splits_phases():
+    """Each operation gets its own read timeout and the shared phase limits."""
+    timeout = http_pool.operation_timeout(42.0)
+    assert timeout.read == 42.0
+    assert timeout.connect == settings.http_connect_timeout
+    assert timeout.pool == settings.http_pool_timeout
+
+
+def test_build_client_without_h2_falls_back_to_http1():
+    """Requesting HTTP/2 without the h2 package does not fail."""
+    with patch.object(http_pool, "http2_available", return_value=False):
+        with patch("app.services.http_pool.settings", dataclasses.replace(settings, http2=True)):
+            client, _monitor = http_pool.build_client()
+    assert isinstance(client, httpx.AsyncClient)
+
+
+def _self_signed_cert(directory) -> tuple[str, str]:
+    cert, key = str(directory / "cert.pem"), str(directory / "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+            "-keyout", key, "-out", cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+async def _serve_h2(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal HTTP/2 server: answers every request with 200 "ok"."""
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+    conn.initiate_connection()
+    writer.write(conn.data_to_send())
+    while data := await reader.read(65536):
+        for event in conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                conn.send_headers(event.stream_id, [(":status", "200")])
+                conn.send_data(event.stream_id, b"ok", end_stream=True)
+        writer.write(conn.data_to_send())
+        await writer.drain()
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_build_client_negotiates_http2_when_h2_is_installed(tmp_path, monkeypatch):
+    """With ``h2`` installed the pooled client speaks HTTP/2 to servers offering it."""
+    pytest.importorskip("h2")
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to create a test certificate")
+    cert, key = _self_signed_cert(tmp_path)
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(cert, key)
+    server_ctx.set_alpn_protocols(["h2", "http/1.1"])
+    server = await asyncio.start_server(_serve_h2, "127.0.0.1", 0, ssl=server_ctx)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("SSL_CERT_FILE", cert)  # trusted by the default transport
+
+    with patch("app.services.http_pool.settings", dataclasses.replace(settings, http2=True)):
+        client, monitor = http_pool.build_client()
+    try:
+        responses = await asyncio.gather(
+            *(client.get(f"https://localhost:{port}/") for _ in range(3))
+        )
+    finally:
+        await client.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert [r.http_version for r in responses] == ["HTTP/2"] * 3
+    assert [r.text for r in responses] == ["ok"] * 3
+    assert monitor.connections_opened == 1  # multiplexed over one connection
+
+
+@pytest.mark.asyncio
+async def test_warm_up_touches_each_origin_once_and_ignores_failures():
+    """warm_up() sends one HEAD per distinct origin; errors are swallowed."""
+    seen: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, str(request.url)))
+        if request.url.host == "down.test":
+            raise httpx.ConnectError("down")
+        return httpx.Response(405)
+
+    client, monitor = http_pool.build_client(httpx.MockTransport(handler))
+    await http_pool.warm_up(
+        client,
+        monitor,
+        ["https://a.test/v1/search", "https://a.test/other", "https://down.test/x"],
+    )
+    assert sorted(seen) == [("HEAD", "https://a.test/"), ("HEAD", "https://down.test/")]
+    assert monitor.stats()["warmed"] == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_you_client_startup_uses_pool_and_reports_stats():
+    """startup() builds the pooled client; pool_stats() reflects its traffic."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"results": {"web": []}})
+
+    no_warmup = dataclasses.replace(
+        settings, you_api_key="test-key", http_warmup=False, search_cache_ttl=0
+    )
+    with patch("app.services.you_client.settings", no_warmup):
+        await you_client.startup(httpx.MockTransport(handler))
+        try:
+            assert await you_client.search("python") == []
+            assert you_client.pool_stats()["requests"] == 1
+        finally:
+            await you_client.shutdown()
+    assert you_client.pool_stats() == {}
@@ -0,0 +1,118 @@
+"""Unit tests for app.services.inflight."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.services import inflight
+
+
+async def _source(items: list[str], gate: asyncio.Event | None = None, started: list | None = None):
+    if started is not None:
+        started.append(True)
+    for i, item in enumerate(items):
+        if gate is not None and i == 1:
+            await gate.wait()
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subscribers_share_one_producer():
+    """Identical keys attach to one producer and all see every event."""
+    started: list = []
+    items = ["a", "b", "c"]
+
+    def start():
+        return _source(items, started=started)
+
+    async def consume():
+        return [e async for e in inflight.join("k", start)]
+
+    results = await asyncio.gather(consume(), consume(), consume())
+    assert results == [items] * 3
+    assert len(started) == 1
+    assert inflight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_events_already_emitted():
+    """A subscriber joining mid-run first gets the history, then live events."""
+    gate = asyncio.Event()
+    first = inflight.join("k", lambda: _source(["a", "b", "c"], gate))
+    assert await first.__anext__() == "a"
+
+    late = inflight.join("k", lambda: _source(["never"]))
+    assert await late.__anext__() == "a"
+
+    gate.set()
+    assert [e async for e in first] == ["b", "c"]
+    assert [e async for e in late] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_producer_cancelled_when_last_subscriber_leaves():
+    """Closing every subscriber cancels the run and frees the key."""
+    gate = asyncio.Event()
+    closed: list = []
+
+    async def source():
+        try:
+            yield "a"
+            await gate.wait()
+            yield "b"
+        finally:
+            closed.append(True)
+
+    stream = inflight.join("k", source)
+    assert await stream.__anext__() == "a"
+    await stream.aclose()
+    await asyncio.sleep(0.01)
+
+    assert closed == [True]
+    assert inflight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_key_released_after_completion():
+    """A new request after the run finished starts a fresh producer."""
+    assert [e async for e in inflight.join("k", lambda: _source(["a"]))] == ["a"]
+    assert [e async for e in inflight.join("k", lambda: _source(["b"]))] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_join_after_last_subscriber_left_starts_a_fresh_run():
+    """A request arriving while an abandoned run is being cancelled gets its own run."""
+    gate = asyncio.Event()
+
+    async def slow():
+        yield "e0"
+        await gate.wait()
+        yield "e1"
+
+    first = inflight.join("k", slow)
+    assert await first.__anext__() == "e0"
+    await first.aclose()  # the producer is cancelled, but has not finished yet
+
+    second = inflight.join("k", lambda: _source(["e0", "e1", "result"]))
+    assert [e async for e in second] == ["e0", "e1", "result"]
+    assert inflight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_producer_ends_streams_with_error_event():
+    """Subscribers see an error event instead of a silently truncated stream."""
+
+    async def broken():
+        yield "a"
+        raise RuntimeError("upstream exploded")
+
+    events = [e async for e in inflight.join("k", broken)]
+    assert events[0] == "a"
+    assert json.loads(events[-1][6:]) == {
+        "type": "error",
+        "message": "Analysis failed: upstream exploded",
+    }
+
@@ -2,9 +2,44 @@
 
 from __future__ import annotations
 
+import re
+import time
+
 import pytest
 
-from app.helpers.job_parser import extract_metadata
+from app.helpers.job_parser import (
+    TechMatcher,
+    extract_metadata,
+    find_technologies,
+    tokenize,
+    vocabulary,
+)
+
+# Every canonical name and alias in the bundled vocabulary, as plain terms.
+_ALL_TERMS = [
+    term
+    for tech in vocabulary().technologies
+    for term in (tech.name, *tech.aliases)
+]
+
+
+def _compile_per_pattern(vocabulary) -> list[tuple[str, re.Pattern[str]]]:
+    return [
+        (tech, re.compile(r"\b" + re.escape(tech) + r"\b", re.IGNORECASE))
+        for tech in vocabulary
+    ]
+
+
+def _per_pattern_reference(patterns, text: str) -> list[str]:
+    """The original one-regex-per-technology extraction, for comparison."""
+    seen: set[str] = set()
+    unique: list[str] = []
+    for tech, pattern in patterns:
+        if pattern.search(text):
+            if tech.lower() not in seen:
+                seen.add(tech.lower())
+                unique.append(tech)
+    return unique
 
 
 def test_extract_company_at_pattern():
@@ -103,3 +138,149 @@ def test_extract_metadata_empty_string():
     assert m.company_name == "the company"
     assert m.role_title == ""
     assert m.technologies == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "We use React Native, React and Vue.js (not Vue2). Spring Boot on .NET? ASP.NET!",
+        "Ruby on Rails, Go/Golang, C++ and C# devs; CI/CD with GitHub Actions + GitLab CI.",
+        "PYTHON_3 python3 Python. node.js NODE.JS Next.js nextjs R&D R, Dart-lang.",
+        "machine learning, deep-learning, Machine   Learning; distributed systems.",
+        "",
+    ],
+)
+def test_matcher_matches_per_pattern_regexes(text):
+    """The single-pass matcher finds exactly what the per-pattern regexes found, in order."""
+    matcher = TechMatcher(_ALL_TERMS)
+    found = [m.name for m in matcher.find(text)]
+    assert found == _per_pattern_reference(_compile_per_pattern(_ALL_TERMS), text)
+
+
+def test_find_technologies_reports_positions_and_counts():
+    """find_technologies() returns each hit with its start offsets and count."""
+    text = "Kafka and React Native. More Kafka, kafka!"
+    matches = {m.name: m for m in find_technologies(text)}
+    assert matches["Kafka"].count == 3
+    assert matches["Kafka"].positions == (0, 29, 36)
+    assert matches["React"].positions == (10,)
+    assert matches["React Native"].positions == (10,)
+
+
+def test_matcher_large_vocabulary_long_jd_matches_per_pattern_loop():
+    """One compiled pattern finds what one regex per term finds, on a big input.
+
+    The speed comparison lives in ``benchmarks/micro.py``
+    (``tech_matcher`` vs ``tech_per_pattern``).
+    """
+    vocabulary = list(_ALL_TERMS) + [f"Framework{i}js" for i in range(1500)]
+    words = "we build python kafka react native spring boot services with the team".split()
+    text = " ".join(words[i % len(words)] for i in range(1500)) + " Framework42js"
+
+    matcher = TechMatcher(vocabulary)
+    assert isinstance(matcher._scanner, re.Pattern)  # a single scanner for every term
+    found = [m.name for m in matcher.find(text)]
+    assert found == _per_pattern_reference(_compile_per_pattern(vocabulary), text)
+    assert "Framework42js" in found
+
+
+def test_aliases_collapse_to_canonical_name():
+    """Aliases are reported once, under the canonical name, with merged counts."""
+    text = "Backend in Golang (Go 1.22). Postgres, PostgreSQL and Vue.js."
+    m = extract_metadata(text)
+    assert sorted(m.technologies) == ["Go", "PostgreSQL", "Vue"]
+    matches = {t.name: t for t in find_technologies(text)}
+    assert matches["Go"].count == 2
+    assert matches["PostgreSQL"].count == 2
+    assert matches["Vue"].count == 1
+
+
+@pytest.fixture
+def custom_vocabulary(tmp_path):
+    """Point the parser at a temporary vocabulary file; restore the default after."""
+    import dataclasses
+    from unittest.mock import patch
+
+    from app.config import settings
+    from app.helpers import job_parser
+
+    path = tmp_path / "vocab.json"
+    path.write_text('[{"name": "Kafka", "category": "Data", "aliases": ["Apache Kafka"]}]')
+    custom = dataclasses.replace(
+        settings, tech_vocabulary_path=str(path), tech_vocabulary_reload_interval=0.001
+    )
+    with patch.object(job_parser, "settings", custom):
+        job_parser.reload_vocabulary()
+        yield path
+    job_parser.reload_vocabulary()
+
+
+def test_vocabulary_loaded_from_configured_file(custom_vocabulary):
+    """The configured data file replaces the bundled vocabulary."""
+    m = extract_metadata("Engineer at Acme. Python and Apache Kafka.")
+    assert m.technologies == ["Kafka"]
+    assert vocabulary().category("Kafka") == "Data"
+
+
+def test_vocabulary_hot_reloads_when_file_changes(custom_vocabulary):
+    """Editing the file is picked up without a restart; a broken file is ignored."""
+    import os
+
+    custom_vocabulary.write_text(
+        '[{"name": "Rust", "category": "Languages", "aliases": ["rustlang"]}]'
+    )
+    os.utime(custom_vocabulary, (time.time() + 5, time.time() + 5))
+    time.sleep(0.01)
+    assert extract_metadata("Kafka and rustlang").technologies == ["Rust"]
+
+    custom_vocabulary.write_text("not json")
+    os.utime(custom_vocabulary, (time.time() + 10, time.time() + 10))
+    time.sleep(0.01)
+    assert extract_metadata("Kafka and rustlang").technologies == ["Rust"]
+
+
+def test_ranking_prefers_frequently_mentioned_technology():
+    """A technology the JD keeps coming back to outranks one mentioned in passing."""
+    text = (
+        "Data Engineer at Acme\n"
+        "Some Python scripting helps.\n"
+        "You will own our Kafka platform: Kafka Streams, Kafka Connect and Kafka ops."
+    )
+    assert extract_metadata(text).technologies[0] == "Kafka"
+
+
+def test_ranking_weights_sections():
+    """Requirements outweigh nice-to-haves even when the nice-to-have comes first."""
+    text = (
+        "Engineer at Acme\n"
+        "Nice to have:\n- Rust\n- Elixir\n"
+        "Requirements:\n- Go\n"
+    )
+    assert extract_metadata(text).technologies[0] == "Go"
+
+
+def test_ranking_breaks_ties_by_position():
+    """With equal mentions, the earlier technology ranks first."""
+    text = "Engineer at Acme. Redis first, then Python."
+    assert extract_metadata(text).technologies == ["Redis", "Python"]
+
+
+def test_vocabulary_ranking_keeps_vocabulary_order():
+    """With tech_ranking='vocabulary', results follow the vocabulary file order."""
+    import dataclasses
+    from unittest.mock import patch
+
+    from app.config import settings
+
+    text = "Engineer at Acme. Redis first, then Python."
+    with patch(
+        "app.helpers.job_parser.settings",
+        dataclasses.replace(settings, tech_ranking="vocabulary"),
+    ):
+        assert extract_metadata(text).technologies == ["Python", "Redis"]
+
+
+def test_tokenize_lowercases_and_keeps_language_suffixes():
+    """tokenize() splits on non-word characters but keeps "C++" and "C#" whole."""
+    assert tokenize("Senior C++/C# dev; Node.js, Go!") == ["senior", "c++", "c#", "dev", "node", "js", "go"]
+    assert tokenize(" -- ") == []
@@ -0,0 +1,54 @@
+"""Unit tests for app.helpers.json_stream."""
+
+from __future__ import annotations
+
+import json
+
+from app.helpers.json_stream import SectionParser
+
+
+def _feed_in_chunks(text: str, size: int) -> list[tuple[str, str]]:
+    parser = SectionParser()
+    out: list[tuple[str, str]] = []
+    for i in range(0, len(text), size):
+        out.extend(parser.feed(text[i:i + size]))
+    return out
+
+
+def test_feed_reports_members_in_order():
+    """Every top-level member is reported once, with its raw JSON text."""
+    doc = {"companyName": "Acme", "items": [{"a": 1}, {"b": [2, 3]}], "n": 4}
+    members = _feed_in_chunks(json.dumps(doc), 1000)
+    assert [k for k, _ in members] == ["companyName", "items", "n"]
+    assert {k: json.loads(v) for k, v in members} == doc
+
+
+def test_feed_handles_arbitrary_chunk_boundaries():
+    """Splitting the text at any size gives the same members."""
+    doc = {"x": [{"text": "a, b } ] [ {", "q": "say \"hi\""}], "y": {"z": "\\"}}
+    text = json.dumps(doc, indent=2)
+    for size in (1, 2, 3, 7, 64):
+        members = _feed_in_chunks(text, size)
+        assert {k: json.loads(v) for k, v in members} == doc
+
+
+def test_member_is_reported_only_when_complete():
+    """A member is not reported until its trailing comma or closing brace arrives."""
+    parser = SectionParser()
+    assert parser.feed('{"items": [1, 2') == []
+    assert parser.feed("]") == []
+    assert parser.feed(', "next"') == [("items", "[1, 2]")]
+    assert parser.feed(": true}") == [("next", "true")]
+    assert parser.closed
+
+
+def test_feed_ignores_text_around_object():
+    """Markdown fences or chatter around the object are skipped."""
+    members = _feed_in_chunks('```json\n{"a": [1]}\n```', 4)
+    assert members == [("a", "[1]")]
+
+
+def test_escaped_keys_are_decoded():
+    """Keys with escapes are returned decoded."""
+    parser = SectionParser()
+    assert parser.feed('{"a\\"b": 1}') == [('a"b', "1")]
@@ -0,0 +1,117 @@
+"""Unit tests for app.services.metrics."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services import metrics
+from app.services.pipeline import run
+
+
+def test_counter_and_gauge_render_with_labels():
+    """Samples are rendered with HELP/TYPE lines and escaped label values."""
+    registry = metrics.Registry()
+    requests = registry.register(metrics.Counter("requests_total", "Requests.", ["path"]))
+    busy = registry.register(metrics.Gauge("busy", "Busy workers."))
+    requests.inc(path="/a")
+    requests.inc(2, path='/"b"')
+    busy.inc()
+    busy.inc()
+    busy.dec()
+
+    text = registry.render()
+    assert "# HELP interview_buddy_requests_total Requests.\n" in text
+    assert "# TYPE interview_buddy_requests_total counter\n" in text
+    assert 'interview_buddy_requests_total{path="/a"} 1\n' in text
+    assert 'interview_buddy_requests_total{path="/\\"b\\""} 2\n' in text
+    assert "interview_buddy_busy 1\n" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("latency_seconds", "Latency.", ["op"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, op="get")
+
+    lines = histogram.render().splitlines()
+    assert 'interview_buddy_latency_seconds_bucket{op="get",le="0.1"} 1' in lines
+    assert 'interview_buddy_latency_seconds_bucket{op="get",le="1"} 3' in lines
+    assert 'interview_buddy_latency_seconds_bucket{op="get",le="+Inf"} 4' in lines
+    assert 'interview_buddy_latency_seconds_sum{op="get"} 4.05' in lines
+    assert 'interview_buddy_latency_seconds_count{op="get"} 4' in lines
+    assert histogram.count(op="get") == 4
+
+
+def test_labels_must_match_declaration():
+    counter = metrics.Counter("things_total", "Things.", ["kind"])
+    with pytest.raises(ValueError):
+        counter.inc()
+    registry = metrics.Registry()
+    registry.register(counter)
+    with pytest.raises(ValueError):
+        registry.register(metrics.Counter("things_total", "Again."))
+
+
+def test_collectors_are_rendered_on_demand():
+    registry = metrics.Registry()
+    calls = 0
+
+    def collect():
+        nonlocal calls
+        calls += 1
+        gauge = metrics.Gauge("collected", "From a collector.")
+        gauge.set(calls)
+        return [gauge]
+
+    registry.add_collector(collect)
+    assert "interview_buddy_collected 1\n" in registry.render()
+    assert "interview_buddy_collected 2\n" in registry.render()
+
+
+def test_timing_a_block_records_every_call():
+    """Each timed block is observed once.
+
+    Recording overhead is measured by ``benchmarks/micro.py``
+    (``metrics.histogram_time``).
+    """
+    histogram = metrics.Histogram("bench_seconds", "Benchmark.", ["stage"])
+    for _ in range(1000):
+        with histogram.time(stage="x"):
+            pass
+    assert histogram.count(stage="x") == 1000
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_stage_latencies_and_outcome():
+    """A run observes every stage once and counts its outcome."""
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research(_prompt: str):
+        yield json.dumps(
+            {
+                "companyName": "Acme",
+                "companyIntelligence": [],
+                "techAnalysis": [],
+                "interviewFocus": [],
+                "practiceQuestions": [],
+                "resources": [],
+            }
+        )
+
+    stage = metrics.PIPELINE_STAGE_SECONDS
+    stages = ("total", "extract_metadata", "search_company", "search_technologies", "synthesise")
+    before = {name: stage.count(stage=name) for name in stages}
+    ok_before = metrics.PIPELINE_RUNS.value(outcome="ok")
+
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            events = [e async for e in run("Senior Engineer at Acme. Python, React.")]
+
+    assert '"type":"result"' in events[-1]
+    for name in stages:
+        assert stage.count(stage=name) == before[name] + 1, name
+    assert metrics.PIPELINE_RUNS.value(outcome="ok") == ok_before + 1
+    assert metrics.PIPELINE_IN_FLIGHT.value() == 0
@@ -0,0 +1,110 @@
+"""Unit tests for the micro-benchmark suite (benchmarks/micro.py)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from benchmarks import micro
+
+
+def test_every_case_runs_on_its_corpus():
+    """Each case executes; its result has a rate and an allocation figure."""
+    results = micro.run(min_time=0.001, rounds=1)
+    assert [r.name for r in results] == [case.name for case in micro.cases()]
+    assert all(r.ops_per_sec > 0 and r.peak_bytes >= 0 for r in results)
+
+
+def test_committed_baseline_covers_every_case():
+    assert set(micro.load_baselines()) == {case.name for case in micro.cases()}
+
+
+def test_compare_flags_slowdowns_and_allocation_growth():
+    baseline = {
+        "fast": {"ops_per_sec": 1000.0, "peak_bytes": 10_000, "allocations": 100},
+        "lean": {"ops_per_sec": 1000.0, "peak_bytes": 10_000, "allocations": 100},
+        "few": {"ops_per_sec": 1000.0, "peak_bytes": 10_000, "allocations": 100},
+    }
+    results = [
+        micro.Result("fast", 700.0, 10_000, 100),  # 30% slower
+        micro.Result("lean", 950.0, 20_000, 100),  # twice the memory
+        micro.Result("few", 1000.0, 10_000, 200),  # twice the allocations
+        micro.Result("new", 1.0, 1, 1),  # no baseline yet
+    ]
+    regressions = micro.compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("fast:")
+    assert regressions[1].startswith("lean: peak")
+    assert regressions[2] == "few: 200 allocations vs 100"
+    assert micro.compare(results[:1], baseline, threshold=0.5) == []
+
+
+def test_compare_ignores_slowdowns_below_the_noise_floor():
+    """A 40% drop on a 0.2 µs call is scheduler jitter, not a regression."""
+    baseline = {"tiny": {"ops_per_sec": 5_000_000.0, "peak_bytes": 100}}
+    results = [micro.Result("tiny", 3_000_000.0, 100, 5)]  # 0.13 µs slower per call
+    assert micro.compare(results, baseline, threshold=0.25) == []
+    assert micro.compare(results, baseline, threshold=0.25, noise_floor=0.1e-6) != []
+
+
+def test_confirm_keeps_the_best_of_repeated_measurements():
+    name = micro.cases()[0].name
+    baseline = {name: {"ops_per_sec": 1000.0, "peak_bytes": 100}}
+    remeasured = iter([micro.Result(name, 600.0, 100, 5), micro.Result(name, 990.0, 100, 5)])
+    calls = []
+
+    def measure_case(case):
+        calls.append(case.name)
+        return next(remeasured)
+
+    slow = [micro.Result(name, 500.0, 100, 5)]
+    (confirmed,) = micro.confirm(slow, baseline, threshold=0.25, measure_case=measure_case)
+    assert calls == [name, name]
+    assert confirmed.ops_per_sec == 990.0
+    assert micro.compare([confirmed], baseline, threshold=0.25) == []
+
+
+def test_median_of_runs_uses_every_pass():
+    passes = iter([
+        [micro.Result("a", 100.0, 10, 5)],
+        [micro.Result("a", 300.0, 30, 5)],
+        [micro.Result("a", 200.0, 20, 5)],
+    ])
+    with patch("benchmarks.micro.run", side_effect=lambda *args: next(passes)):
+        assert micro.median_of_runs(runs=3) == [micro.Result("a", 200.0, 20, 5)]
+
+
+def test_save_merges_into_existing_baseline(tmp_path):
+    path = tmp_path / "baselines.json"
+    micro.save_baselines([micro.Result("a", 1.0, 1, 5), micro.Result("b", 2.0, 2, 5)], path)
+    micro.save_baselines([micro.Result("b", 3.0, 3, 5)], path)
+    assert micro.load_baselines(path) == {
+        "a": {"ops_per_sec": 1.0, "peak_bytes": 1, "allocations": 5},
+        "b": {"ops_per_sec": 3.0, "peak_bytes": 3, "allocations": 5},
+    }
+    assert micro.load_baseline_machine(path) == micro.machine_info()
+
+
+def test_save_records_the_host_name(tmp_path):
+    path = tmp_path / "baselines.json"
+    micro.save_baselines([micro.Result("a", 1.0, 1, 1)], path, host="bench-box")
+    micro.save_baselines([micro.Result("b", 1.0, 1, 1)], path)
+    assert micro.load_baseline_machine(path)["host"] == "bench-box"
+
+
+def test_hardware_mismatch_is_detected():
+    current = micro.machine_info()
+    assert micro.same_hardware({**current, "host": "other", "platform": "other"}, current)
+    assert not micro.same_hardware({**current, "cpus": -1}, current)
+
+
+def test_committed_baseline_records_its_machine():
+    recorded_on = micro.load_baseline_machine()
+    assert set(micro.HARDWARE_FIELDS) <= set(recorded_on)
+    assert recorded_on["host"] not in ("", "vm", "localhost")
+
+
+def test_allocation_count_is_deterministic():
+    case = next(c for c in micro.cases() if c.name == "parse_json[typical]")
+    counts = {micro.measure(case, min_time=0.001, rounds=1).allocations for _ in range(3)}
+    assert len(counts) == 1
+    assert counts.pop() > 0
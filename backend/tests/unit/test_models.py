@@ -19,6 +19,12 @@ def test_prepare_request_valid():
     assert req.jobDescription == "Senior Engineer at Acme. Python."
 
 
+def test_prepare_request_bypass_cache_defaults_false():
+    """PrepareRequest.bypassCache is optional and off by default."""
+    assert PrepareRequest(jobDescription="Job").bypassCache is False
+    assert PrepareRequest(jobDescription="Job", bypassCache=True).bypassCache is True
+
+
 def test_prepare_request_empty_raises():
     """PrepareRequest with empty jobDescription raises ValidationError."""
     with pytest.raises(ValidationError):
@@ -0,0 +1,135 @@
+"""Unit tests for app.services.offload and app.services.loop_lag."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.models import AnalysisResult
+from app.services import metrics, offload, tracing
+from app.services.loop_lag import LoopLagMonitor
+from app.services.pipeline import _parse_analysis, run
+from benchmarks.fake_you import analysis_json
+
+
+@pytest.fixture(autouse=True)
+def _restore_offload():
+    yield
+    offload.configure(settings.offload_executor, settings.offload_min_chars)
+
+
+def _thread_id() -> int:
+    return threading.get_ident()
+
+
+async def test_small_inputs_run_inline():
+    offload.configure("thread", min_chars=100)
+    assert await offload.run(_thread_id, size=99) == threading.get_ident()
+
+
+async def test_large_inputs_run_in_the_thread_pool():
+    offload.configure("thread", min_chars=100)
+    assert await offload.run(_thread_id, size=100) != threading.get_ident()
+
+
+async def test_none_always_runs_inline():
+    offload.configure("none", min_chars=0)
+    assert await offload.run(_thread_id, size=10**9) == threading.get_ident()
+
+
+async def test_process_pool_parses_analysis():
+    """Module-level functions and their results survive the trip to a worker process."""
+    offload.configure("process", min_chars=0)
+    raw = analysis_json("Acme", 3)
+    result = await offload.run(_parse_analysis, raw, "Fallback", size=len(raw))
+    assert isinstance(result, AnalysisResult)
+    assert result.companyName == "Acme"
+    assert len(result.practiceQuestions) == 3
+
+
+async def test_errors_propagate_from_the_executor():
+    offload.configure("thread", min_chars=0)
+    with pytest.raises(json.JSONDecodeError):
+        await offload.run(_parse_analysis, "{not json", "Acme", size=9)
+
+
+def test_configure_rejects_unknown_executor():
+    with pytest.raises(ValueError, match="gpu"):
+        offload.configure("gpu")
+
+
+async def test_thread_offload_keeps_spans_nested():
+    offload.configure("thread", min_chars=0)
+    raw = analysis_json("Acme", 1)
+    trace = tracing.Trace("request")
+    with tracing.activate(trace):
+        await offload.run(_parse_analysis, raw, "Acme", size=len(raw))
+    spans = {s.name: s for s in trace.spans}
+    assert spans["offload"].attributes == {"func": "_parse_analysis", "executor": "thread"}
+    assert spans["parse_json"].parent_id == spans["offload"].span_id
+
+
+async def test_loop_lag_drops_when_blocking_work_is_offloaded():
+    """Lag measured around the same blocking call, inline vs in the thread pool."""
+    offload.configure("thread", min_chars=1)
+
+    async def max_lag(size: int) -> float:
+        monitor = LoopLagMonitor(interval=0.005)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        await offload.run(time.sleep, 0.1, size=size)
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+        return max(monitor.samples)
+
+    before = await max_lag(size=0)  # below the threshold: inline
+    after = await max_lag(size=1)
+    # A blocking sleep inline holds the loop for its whole 0.1 s; a slow
+    # runner can only make that longer, so compare the two runs, not a limit.
+    assert before >= 0.09
+    assert after < before / 2
+
+
+async def test_loop_lag_monitor_records_histogram():
+    before = metrics.EVENT_LOOP_LAG.count()
+    monitor = LoopLagMonitor(interval=0.001)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    assert metrics.EVENT_LOOP_LAG.count() > before
+    assert monitor.samples
+
+
+async def test_pipeline_result_is_unchanged_when_offloaded():
+    offload.configure("thread", min_chars=0)
+    raw = analysis_json("Acme", 2)
+
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research_stream(_prompt: str):
+        for i in range(0, len(raw), 50):
+            yield raw[i:i + 50]
+
+    events: list[str] = []
+    with (
+        patch("app.services.pipeline.you_client.search", side_effect=mock_search),
+        patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ),
+    ):
+        async for chunk in run("Engineer at Acme. Python."):
+            events.append(chunk)
+
+    payloads = [json.loads(e[6:]) for e in events if e.startswith("data: ")]
+    sections = [p["name"] for p in payloads if p["type"] == "section"]
+    assert len(sections) == 5
+    assert payloads[-1]["type"] == "result"
+    assert payloads[-1]["data"] == json.loads(raw)
@@ -45,11 +45,11 @@ async def test_run_happy_path_yields_steps_progress_result():
         return search_hits
 
     async def mock_research(_prompt: str):
-        return _minimal_analysis_json("Acme")
+        yield _minimal_analysis_json("Acme")
 
     events: list[str] = []
     with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
-        with patch("app.services.pipeline.you_client.research", side_effect=mock_research):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
             async for chunk in run("Senior Engineer at Acme. Python, React."):
                 events.append(chunk)
 
@@ -77,11 +77,11 @@ async def test_run_synthesis_error_yields_error_event():
         return []
 
     async def mock_research(_prompt: str):
-        return "not valid json {{{"
+        yield "not valid json {{{"
 
     events: list[str] = []
     with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
-        with patch("app.services.pipeline.you_client.research", side_effect=mock_research):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
             async for chunk in run("Engineer at Acme."):
                 events.append(chunk)
 
@@ -104,10 +104,11 @@ async def test_run_synthesis_exception_yields_error_event():
 
     async def mock_research(_prompt: str):
         raise RuntimeError("API down")
+        yield
 
     events: list[str] = []
     with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
-        with patch("app.services.pipeline.you_client.research", side_effect=mock_research):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
             async for chunk in run("Engineer at Acme."):
                 events.append(chunk)
 
@@ -120,3 +121,396 @@ async def test_run_synthesis_exception_yields_error_event():
 
     assert "error" in types
     assert "result" not in types
+
+
+def _event_payloads(events: list[str]) -> list[dict]:
+    return [json.loads(ev[6:].strip()) for ev in events if ev.startswith("data: ")]
+
+
+@pytest.mark.asyncio
+async def test_search_technologies_runs_queries_concurrently():
+    """_search_technologies() overlaps queries instead of awaiting them one by one."""
+    import asyncio
+
+    from app.services.pipeline import _search_technologies
+
+    techs = ["Python", "React", "Go", "Rust", "Kafka"]
+    in_flight = 0
+    all_started = asyncio.Event()
+
+    async def slow_search(_query: str):
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == len(techs):
+            all_started.set()
+        # Only returns once every query is in flight at the same time.
+        await asyncio.wait_for(all_started.wait(), timeout=5)
+        return [SearchHit(title="T")]
+
+    with patch("app.services.pipeline.you_client.search", side_effect=slow_search):
+        results = await _search_technologies(techs)
+
+    assert list(results) == techs
+    assert all(results.values())
+
+
+@pytest.mark.asyncio
+async def test_search_technologies_respects_concurrency_limit():
+    """No more than settings.search_concurrency queries are in flight at once."""
+    import asyncio
+    import dataclasses
+
+    from app.config import settings
+    from app.services.pipeline import _search_technologies
+
+    in_flight = 0
+    peak = 0
+
+    async def counting_search(_query: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return []
+
+    limited = dataclasses.replace(settings, search_concurrency=2)
+    with patch("app.services.pipeline.settings", limited):
+        with patch("app.services.pipeline.you_client.search", side_effect=counting_search):
+            results = await _search_technologies(["Python", "React", "Go", "Rust", "Kafka"])
+
+    assert len(results) == 5
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_search_technologies_returns_partial_results_on_deadline():
+    """A query that misses its deadline is dropped; the others are kept."""
+    import asyncio
+    import dataclasses
+
+    from app.config import settings
+    from app.services.pipeline import _search_technologies
+
+    async def search(query: str):
+        if query.startswith("Kafka"):
+            await asyncio.sleep(1)
+        if query.startswith("Rust"):
+            raise RuntimeError("boom")
+        return [SearchHit(title=query)]
+
+    strict = dataclasses.replace(settings, search_query_deadline=0.05)
+    with patch("app.services.pipeline.settings", strict):
+        with patch("app.services.pipeline.you_client.search", side_effect=search):
+            results = await _search_technologies(["Python", "Kafka", "Rust", "Go"])
+
+    assert list(results) == ["Python", "Go"]
+
+
+@pytest.mark.asyncio
+async def test_run_overlaps_company_and_tech_search_with_ordered_progress():
+    """Company and tech searches start together; progress events stay in step order."""
+    import asyncio
+
+    started: list[str] = []
+
+    async def mock_search(query: str):
+        started.append(query)
+        await asyncio.sleep(0.05)
+        return []
+
+    async def mock_research(_prompt: str):
+        yield _minimal_analysis_json("Acme")
+
+    events: list[str] = []
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            async for chunk in run("Senior Engineer at Acme. Python, React."):
+                events.append(chunk)
+                payload = json.loads(chunk[6:].strip())
+                if payload.get("stepIndex") == 1 and payload.get("status") == "done":
+                    # Company query plus both tech queries already issued.
+                    assert len(started) == 3
+
+    progress = [
+        (p["stepIndex"], p["status"])
+        for p in _event_payloads(events)
+        if p["type"] == "progress"
+    ]
+    assert progress == [
+        (0, "active"), (0, "done"),
+        (1, "active"), (1, "done"),
+        (2, "active"), (2, "done"),
+        (3, "active"), (3, "done"),
+        (4, "active"), (4, "done"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_streams_partial_events_before_result():
+    """Synthesis chunks are forwarded as partial events and assembled for validation."""
+    raw = _minimal_analysis_json("Acme")
+    chunks = [raw[i:i + 40] for i in range(0, len(raw), 40)]
+
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research_stream(_prompt: str):
+        for chunk in chunks:
+            yield chunk
+
+    events: list[str] = []
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ):
+            async for chunk in run("Engineer at Acme. Python."):
+                events.append(chunk)
+
+    payloads = _event_payloads(events)
+    types = [p["type"] for p in payloads]
+    partials = [p["text"] for p in payloads if p["type"] == "partial"]
+    assert partials == chunks
+    assert types.index("partial") < types.index("result")
+    assert payloads[-1]["data"]["companyName"] == "Acme"
+
+
+@pytest.mark.asyncio
+async def test_run_without_streaming_uses_blocking_research():
+    """With stream_synthesis disabled, run() calls research() and emits no partials."""
+    import dataclasses
+
+    from app.config import settings
+
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research(_prompt: str):
+        return _minimal_analysis_json("Acme")
+
+    blocking = dataclasses.replace(settings, stream_synthesis=False)
+    events: list[str] = []
+    with patch("app.services.pipeline.settings", blocking):
+        with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+            with patch("app.services.pipeline.you_client.research", side_effect=mock_research):
+                async for chunk in run("Engineer at Acme."):
+                    events.append(chunk)
+
+    types = [p["type"] for p in _event_payloads(events)]
+    assert "partial" not in types
+    assert "result" in types
+
+
+@pytest.mark.asyncio
+async def test_run_emits_validated_sections_while_streaming():
+    """Each list section is emitted as a section event once it is complete and valid."""
+    data = json.loads(_minimal_analysis_json("Acme"))
+    data["resources"] = [{"title": "missing required fields"}]
+    raw = json.dumps(data)
+
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research_stream(_prompt: str):
+        for i in range(0, len(raw), 25):
+            yield raw[i:i + 25]
+
+    events: list[str] = []
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ):
+            async for chunk in run("Engineer at Acme. Python."):
+                events.append(chunk)
+
+    payloads = _event_payloads(events)
+    sections = {p["name"]: p["data"] for p in payloads if p["type"] == "section"}
+    assert list(sections) == [
+        "companyIntelligence",
+        "techAnalysis",
+        "interviewFocus",
+        "practiceQuestions",
+    ]
+    assert sections["techAnalysis"] == data["techAnalysis"]
+    # The invalid section is not streamed and the final validation reports it.
+    assert payloads[-1]["type"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_run_replays_cached_result_for_same_job_description():
+    """A repeated job description is served from the result cache without upstream calls."""
+    search = AsyncMock(return_value=[])
+    calls = 0
+
+    async def mock_research_stream(_prompt: str):
+        nonlocal calls
+        calls += 1
+        yield _minimal_analysis_json("Acme")
+
+    jd = "Senior Engineer at Acme. Python, React."
+    with patch("app.services.pipeline.you_client.search", search):
+        with patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ):
+            first = [chunk async for chunk in run(jd)]
+            search_calls = search.await_count
+            second = [chunk async for chunk in run("Senior Engineer at Acme.  Python,  React. ")]
+            assert search.await_count == search_calls
+            assert calls == 1
+
+            third = [chunk async for chunk in run(jd, use_cache=False)]
+            assert calls == 2
+
+    def summary(events: list[str]) -> list[tuple]:
+        return [
+            (p["type"], p.get("stepIndex"), p.get("status"))
+            for p in _event_payloads(events)
+            if p["type"] in ("steps", "progress", "result")
+        ]
+
+    assert summary(second) == summary(first) == summary(third)
+    assert _event_payloads(second)[-1] == _event_payloads(first)[-1]
+
+
+@pytest.mark.asyncio
+async def test_run_shared_deduplicates_concurrent_identical_requests():
+    """Concurrent identical job descriptions share one synthesis call and event stream."""
+    import asyncio
+
+    from app.services.pipeline import run_shared
+
+    calls = 0
+
+    async def mock_search(_query: str):
+        await asyncio.sleep(0.02)
+        return []
+
+    async def mock_research_stream(_prompt: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        yield _minimal_analysis_json("Acme")
+
+    async def consume():
+        return [chunk async for chunk in run_shared("Senior Engineer at Acme. Python.")]
+
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ):
+            streams = await asyncio.gather(consume(), consume(), consume())
+
+    assert calls == 1
+    assert streams[0] == streams[1] == streams[2]
+    assert _event_payloads(streams[0])[-1]["type"] == "result"
+
+
+@pytest.mark.asyncio
+async def test_run_pacing_holds_steps_only_for_ui():
+    """Pacing "none" adds no delay; "ui" holds each step for its minimum duration."""
+    import dataclasses
+    from functools import partial
+
+    from app.config import settings
+    from app.services.pipeline import _Pacer
+
+    delays: list[float] = []
+
+    async def record_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    # A frozen clock: every step takes no time, so the pacer asks for its
+    # full minimum.
+    pacer = partial(_Pacer, clock=lambda: 0.0, sleep=record_sleep)
+
+    async def mock_research_stream(_prompt: str):
+        yield _minimal_analysis_json("Acme")
+
+    paced = dataclasses.replace(settings, ui_min_step_seconds=(0.15, 0.0, 0.0, 0.0, 0.1))
+    jd = "Senior Engineer at Acme. Python."
+    with (
+        patch("app.services.pipeline.settings", paced),
+        patch("app.services.pipeline._Pacer", pacer),
+        patch("app.services.pipeline.you_client.search", AsyncMock(return_value=[])),
+        patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ),
+    ):
+        fast = [chunk async for chunk in run(jd, use_cache=False, pacing="none")]
+        assert delays == []
+        slow = [chunk async for chunk in run(jd, use_cache=False, pacing="ui")]
+
+    assert delays == [0.15, 0.1]
+    assert _event_payloads(fast) == _event_payloads(slow)
+
+
+@pytest.mark.asyncio
+async def test_run_shared_keeps_pacing_policies_apart():
+    """Requests with different pacing do not attach to each other's run."""
+    import asyncio
+
+    from app.services.pipeline import run_shared
+
+    calls = 0
+
+    async def mock_research_stream(_prompt: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        yield _minimal_analysis_json("Acme")
+
+    async def consume(pacing: str):
+        jd = "Senior Engineer at Acme. Python."
+        return [chunk async for chunk in run_shared(jd, use_cache=False, pacing=pacing)]
+
+    with patch("app.services.pipeline.you_client.search", AsyncMock(return_value=[])):
+        with patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ):
+            await asyncio.gather(consume("none"), consume("ui"))
+
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_run_shared_keeps_cache_bypass_apart_and_extracts_once():
+    """bypassCache requests never attach to a cache-using run; metadata is extracted once."""
+    import asyncio
+
+    from app.helpers import job_parser
+    from app.services.pipeline import run_shared
+
+    calls = 0
+
+    async def mock_research_stream(_prompt: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        yield _minimal_analysis_json("Acme")
+
+    async def consume(use_cache: bool):
+        jd = "Senior Engineer at Acme. Python."
+        return [chunk async for chunk in run_shared(jd, use_cache=use_cache)]
+
+    with (
+        patch("app.services.pipeline.you_client.search", AsyncMock(return_value=[])),
+        patch(
+            "app.services.pipeline.you_client.research_stream",
+            side_effect=mock_research_stream,
+        ),
+        patch(
+            "app.services.pipeline.extract_metadata", wraps=job_parser.extract_metadata
+        ) as extract,
+    ):
+        cached, fresh = await asyncio.gather(consume(True), consume(False))
+
+    assert calls == 2
+    assert extract.call_count == 2  # once per request, not once more inside the run
+    assert _event_payloads(cached)[-1]["type"] == _event_payloads(fresh)[-1]["type"] == "result"
+
@@ -0,0 +1,336 @@
+"""Unit tests for app.services.resilience and its use in you_client."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import resilience, you_client
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+@pytest.fixture(autouse=True)
+def _reset_you_client():
+    you_client.search_cache.clear()
+    you_client.reset_endpoint_memory()
+    you_client.reset_resilience()
+    yield
+    you_client.search_cache.clear()
+    you_client.reset_resilience()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _sequence_client(*outcomes: int | Exception) -> tuple[httpx.AsyncClient, list[httpx.Request]]:
+    """Client whose successive requests get the given statuses (or raise)."""
+    seen: list[httpx.Request] = []
+    queue = list(outcomes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        outcome = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"results": {"web": []}})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), seen
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def test_backoff_honours_retry_after_and_caps_it():
+    """Retry-After (seconds) is used as the delay, capped at max_delay."""
+    policy = RetryPolicy(attempts=3, base_delay=0.1, max_delay=2.0)
+    assert resilience.backoff_delay(policy, 0, httpx.Response(429, headers={"Retry-After": "1.5"})) == 1.5
+    assert resilience.backoff_delay(policy, 0, httpx.Response(503, headers={"Retry-After": "60"})) == 2.0
+    for retry in range(5):
+        assert 0 <= resilience.backoff_delay(policy, retry) <= min(2.0, 0.1 * 2**retry)
+
+
+@pytest.mark.asyncio
+async def test_send_with_retries_retries_transient_statuses():
+    """429/5xx responses are retried; the first good response is returned."""
+    client, seen = _sequence_client(503, 429, 200)
+    delays: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    resp = await resilience.send_with_retries(
+        lambda: client.get("https://example.test/"), RetryPolicy(attempts=3), sleep=sleep
+    )
+    await client.aclose()
+    assert resp.status_code == 200
+    assert len(seen) == 3
+    assert len(delays) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_with_retries_does_not_retry_client_errors():
+    """A 4xx other than 429 is returned at once."""
+    client, seen = _sequence_client(404)
+    resp = await resilience.send_with_retries(
+        lambda: client.get("https://example.test/"), RetryPolicy(attempts=3), sleep=_no_sleep
+    )
+    await client.aclose()
+    assert resp.status_code == 404
+    assert len(seen) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_with_retries_reraises_last_transport_error():
+    """Transport errors are retried, and re-raised once attempts run out."""
+    client, seen = _sequence_client(httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        await resilience.send_with_retries(
+            lambda: client.get("https://example.test/"), RetryPolicy(attempts=2), sleep=_no_sleep
+        )
+    await client.aclose()
+    assert len(seen) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_with_retries_can_skip_read_timeouts():
+    """A policy that does not retry read timeouts raises the first one."""
+    client, seen = _sequence_client(httpx.ReadTimeout("slow"))
+    with pytest.raises(httpx.ReadTimeout):
+        await resilience.send_with_retries(
+            lambda: client.get("https://example.test/"),
+            RetryPolicy(attempts=3, retry_read_timeouts=False),
+            sleep=_no_sleep,
+        )
+    await client.aclose()
+    assert len(seen) == 1
+
+
+def test_circuit_breaker_opens_then_probes_once():
+    """Consecutive failures open the circuit; after the cool-down one probe is allowed."""
+    clock = _Clock()
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.rejected == 2
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    clock = _Clock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.state == "half_open"
+    return breaker
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_lets_the_next_call_probe():
+    """A probe cancelled mid-flight (lost hedge, deadline) gives its slot back."""
+    breaker = _half_open_breaker()
+    started = asyncio.Event()
+
+    async def hang() -> httpx.Response:
+        started.set()
+        await asyncio.sleep(3600)
+        raise AssertionError("not reached")
+
+    probe = asyncio.create_task(
+        resilience.send_with_retries(hang, RetryPolicy(attempts=1), breaker=breaker)
+    )
+    await started.wait()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # the probe is still running
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    breaker.before_call()  # the next call is the new probe
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_failing_unexpectedly_reopens_the_circuit():
+    """A probe raising something other than a transport error counts as a failure."""
+    breaker = _half_open_breaker()
+
+    async def broken() -> httpx.Response:
+        raise ValueError("bad payload")
+
+    with pytest.raises(ValueError):
+        await resilience.send_with_retries(broken, RetryPolicy(attempts=1), breaker=breaker)
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_faster_copy():
+    """A call slower than the delay is duplicated and the first answer wins."""
+    durations = [1.0, 0.0]
+    cancelled: list[bool] = []
+
+    async def call() -> str:
+        duration = durations.pop(0)
+        try:
+            await asyncio.sleep(duration)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return f"took {duration}"
+
+    result, fired = await resilience.hedged(call, delay=0.01)
+    await asyncio.sleep(0)
+    assert (result, fired) == ("took 0.0", True)
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_hedged_skips_duplicate_for_fast_call():
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await resilience.hedged(call, delay=0.5) == (1, False)
+    assert calls == 1
+
+
+def test_latency_tracker_needs_min_samples():
+    tracker = resilience.LatencyTracker(window=10, min_samples=3)
+    tracker.record(0.1)
+    tracker.record(0.2)
+    assert tracker.quantile(0.95) is None
+    tracker.record(0.3)
+    assert tracker.quantile(0.95) == 0.3
+    assert tracker.quantile(0.0) == 0.1
+
+
+@pytest.mark.asyncio
+async def test_search_retries_transient_upstream_errors():
+    """you_client.search() retries a 503 and counts the retry."""
+    client, seen = _sequence_client(503, 200)
+    fast = dataclasses.replace(settings, upstream_retry_base_delay=0.0)
+    with patch.object(you_client, "_http", client), patch("app.services.you_client.settings", fast):
+        hits = await you_client.search("python jobs")
+    await client.aclose()
+    assert hits == []
+    assert len(seen) == 2
+    assert you_client.resilience_stats()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_fails_fast_while_circuit_is_open():
+    """Once the search circuit opens, calls are rejected without a request."""
+    client, seen = _sequence_client(500)
+    strict = dataclasses.replace(
+        settings, upstream_retry_attempts=1, circuit_failure_threshold=2, search_cache_ttl=0
+    )
+    with patch.object(you_client, "_http", client), patch("app.services.you_client.settings", strict):
+        you_client.reset_resilience()
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await you_client.search("python jobs")
+        with pytest.raises(CircuitOpenError):
+            await you_client.search("python jobs")
+    await client.aclose()
+    assert len(seen) == 2
+    assert you_client.resilience_stats()["circuits"]["search"] == {"state": "open", "rejected": 1}
+
+
+@pytest.mark.asyncio
+async def test_research_stream_retries_before_first_delta():
+    """A 503 when opening the agent stream is retried; the answer then streams."""
+    calls = 0
+    line = 'data: {"type": "response.output_text.delta", "response": {"delta": "ok"}}\n'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, text=line)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fast = dataclasses.replace(settings, upstream_retry_base_delay=0.0)
+    with patch.object(you_client, "_http", client), patch("app.services.you_client.settings", fast):
+        chunks = [c async for c in you_client.research_stream("prompt")]
+    await client.aclose()
+    assert chunks == ["ok"]
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_agent_calls_do_not_retry_read_timeouts():
+    """A synthesis call that timed out reading is not sent again."""
+    client, seen = _sequence_client(httpx.ReadTimeout("slow"))
+    fast = dataclasses.replace(settings, upstream_retry_base_delay=0.0)
+    with patch.object(you_client, "_http", client), patch("app.services.you_client.settings", fast):
+        with pytest.raises(httpx.ReadTimeout):
+            await you_client.research("prompt")
+        with pytest.raises(httpx.ReadTimeout):
+            async for _ in you_client.research_stream("prompt"):
+                pass
+    await client.aclose()
+    assert len(seen) == 2
+    assert you_client.resilience_stats()["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_agent_stream_probe_releases_the_circuit():
+    """Cancelling research_stream while it opens the stream releases a half-open probe."""
+    opened = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        opened.set()
+        await asyncio.sleep(3600)
+        raise AssertionError("not reached")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    breaker = you_client.breakers["agents"]
+    breaker.record_failure()
+    breaker._opened_at = breaker._clock() - breaker.reset_timeout  # cool-down over
+    assert breaker.state == "half_open"
+
+    async def consume() -> None:
+        async for _ in you_client.research_stream("prompt"):
+            pass
+
+    with patch.object(you_client, "_http", client):
+        task = asyncio.create_task(consume())
+        await opened.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    await client.aclose()
+    assert breaker.state == "half_open"
+    breaker.before_call()  # allowed: the cancelled probe gave its slot back
+
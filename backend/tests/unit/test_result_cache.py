@@ -0,0 +1,80 @@
+"""Unit tests for app.repositories.result_cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models import JobMetadata
+from app.repositories import result_cache
+from app.repositories.result_cache import InMemoryResultCache, RedisResultCache, fingerprint
+
+
+def _metadata(company: str = "Acme") -> JobMetadata:
+    return JobMetadata(company_name=company, role_title="Engineer", technologies=["Python"])
+
+
+class _FakeRedis:
+    """Stand-in for ``redis.asyncio.Redis`` storing bytes like the real client."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int) -> None:
+        self.data[key] = value.encode()
+        self.expiries[key] = ex
+
+
+class _BrokenBackend:
+    async def get(self, key: str) -> str | None:
+        raise ConnectionError("down")
+
+    async def set(self, key: str, payload: str, ttl: float) -> None:
+        raise ConnectionError("down")
+
+
+def test_fingerprint_ignores_case_and_whitespace():
+    """Reformatted pastes of the same job description share a fingerprint."""
+    a = fingerprint("Senior Engineer at Acme.\n\nPython,  React.", _metadata())
+    b = fingerprint("  senior engineer at acme. python, react. ", _metadata())
+    assert a == b
+
+
+def test_fingerprint_depends_on_text_and_metadata():
+    """Different text or different extracted metadata give different keys."""
+    base = fingerprint("Engineer at Acme.", _metadata())
+    assert fingerprint("Engineer at Beta.", _metadata()) != base
+    assert fingerprint("Engineer at Acme.", _metadata("Other")) != base
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_round_trip():
+    """The in-process backend returns what was stored until it expires."""
+    backend = InMemoryResultCache(max_entries=4, max_bytes=1024)
+    await backend.set("k", '{"a": 1}', ttl=60)
+    assert await backend.get("k") == '{"a": 1}'
+    await backend.set("gone", "{}", ttl=0)
+    assert await backend.get("gone") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_with_fake_client():
+    """RedisResultCache prefixes keys, sets an expiry and decodes bytes."""
+    client = _FakeRedis()
+    result_cache.configure_backend(RedisResultCache(client, prefix="t:"))
+
+    await result_cache.put("abc", '{"companyName": "Acme"}')
+    assert client.expiries["t:abc"] >= 1
+    assert await result_cache.get("abc") == '{"companyName": "Acme"}'
+    assert await result_cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_failures_are_treated_as_misses():
+    """A failing backend never breaks the caller."""
+    result_cache.configure_backend(_BrokenBackend())
+    await result_cache.put("k", "{}")
+    assert await result_cache.get("k") is None
@@ -0,0 +1,83 @@
+"""Unit tests for app.repositories.search_index."""
+
+from __future__ import annotations
+
+from app.repositories.search_index import InvertedIndex
+from benchmarks import corpus
+
+_WEIGHTS = {"company": 4.0, "body": 1.0}
+
+
+def _index() -> InvertedIndex:
+    index = InvertedIndex(_WEIGHTS)
+    index.add("acme", {"company": "Acme", "body": "Python and Kubernetes at scale"})
+    index.add("stripe", {"company": "Stripe", "body": "C++ services; Acme is a partner"})
+    index.add("plain", {"company": "Initech", "body": "Java, Spring and Python"})
+    return index
+
+
+def test_every_query_token_must_match():
+    """Documents must contain all query words."""
+    index = _index()
+    assert sorted(index.search("python", 10)) == ["acme", "plain"]
+    assert index.search("python kubernetes", 10) == ["acme"]
+    assert index.search("python rust", 10) == []
+    assert index.search("", 10) == []
+
+
+def test_last_token_matches_as_prefix():
+    """The final word also matches longer terms, for search-as-you-type."""
+    index = _index()
+    assert index.search("kube", 10) == ["acme"]
+    assert index.search("python kube", 10) == ["acme"]
+    assert index.search("kube python", 10) == []
+    assert index.search("c++", 10) == ["stripe"]
+
+
+def test_weighted_fields_rank_higher():
+    """A company-name match outranks the same word in the body."""
+    assert _index().search("acme", 10) == ["acme", "stripe"]
+
+
+def test_remove_and_replace_update_postings():
+    """Removed and re-added documents are reflected immediately."""
+    index = _index()
+    index.remove("acme")
+    assert index.search("kubernetes", 10) == []
+    assert index.search("kube", 10) == []
+    index.add("stripe", {"company": "Stripe", "body": "Rust only"})
+    assert index.search("c++", 10) == []
+    assert index.search("rust", 10) == ["stripe"]
+    assert len(index) == 2
+    index.remove("missing")
+    index.clear()
+    assert len(index) == 0
+    assert index.search("rust", 10) == []
+
+
+def test_limit_caps_results():
+    """At most *limit* ids are returned."""
+    index = InvertedIndex(_WEIGHTS)
+    for i in range(20):
+        index.add(str(i), {"company": f"Co{i}", "body": "python"})
+    assert len(index.search("python", 5)) == 5
+
+
+def test_search_over_thousand_documents():
+    """A prefix query over 1,000 documents finds every match, company hits first.
+
+    Query speed is measured by ``benchmarks/micro.py`` (``search_index.search``).
+    """
+    index = InvertedIndex(_WEIGHTS)
+    for doc_id, fields in corpus.search_documents(1000):
+        index.add(doc_id, fields)
+    index.add("kafka-co", {"company": "Kafka", "body": "kubernetes"})
+
+    # Document i holds words i..i+3 of a 12-word cycle; kafka and
+    # kubernetes are words 2 and 3.
+    expected = {str(i) for i in range(1000) if i % 12 in (0, 1, 2)} | {"kafka-co"}
+    assert set(index.search("kafka kube", 2000)) == expected
+    results = index.search("kafka kube", 20)
+    assert len(results) == 20
+    assert results[0] == "kafka-co"
+    assert results[1:] == sorted(expected - {"kafka-co"}, reverse=True)[:19]
@@ -3,15 +3,20 @@
 from __future__ import annotations
 
 import json
+from unittest.mock import patch
 
 import pytest
 
+from app.helpers import sse
 from app.helpers.sse import (
     PIPELINE_STEPS,
+    RawJSON,
     error_event,
     event,
+    partial_event,
     progress_event,
     result_event,
+    section_event,
     steps_event,
 )
 
@@ -53,6 +58,14 @@ def test_progress_event():
             assert 0 <= payload["progress"] <= 99
 
 
+def test_partial_event():
+    """partial_event() has type 'partial' and the raw text chunk."""
+    out = partial_event('{"companyName": "Ac')
+    payload = json.loads(out.split("data: ", 1)[1].strip())
+    assert payload["type"] == "partial"
+    assert payload["text"] == '{"companyName": "Ac'
+
+
 def test_result_event():
     """result_event() has type 'result' and data present."""
     data = {"companyName": "Acme", "x": 1}
@@ -62,6 +75,90 @@ def test_result_event():
     assert payload["data"] == data
 
 
+def test_result_event_from_model_and_raw_json():
+    """A model or RawJSON payload is embedded as JSON equal to the dict form."""
+    from app.models import AnalysisResult
+
+    result = AnalysisResult(
+        companyName="Acmé",
+        companyIntelligence=[],
+        techAnalysis=[],
+        interviewFocus=[],
+        practiceQuestions=[],
+        resources=[],
+    )
+    expected = json.loads(result_event(result.model_dump()).split("data: ", 1)[1])
+    for value in (result, RawJSON(result.model_dump_json())):
+        out = result_event(value)
+        assert out.startswith("data: ") and out.endswith("\n\n")
+        assert json.loads(out[6:-2]) == expected
+    assert expected["data"]["companyName"] == "Acmé"
+
+
+def test_constant_events_are_cached():
+    """steps and progress events are built once and reused."""
+    assert steps_event() is steps_event()
+    assert progress_event(1, "done") is progress_event(1, "done")
+    payload = json.loads(progress_event(7, "active")[6:-2])
+    assert payload["stepIndex"] == 7
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    """Without orjson, events carry the same JSON."""
+    data = {"type": "partial", "text": "naïve \"quote\" ✅"}
+    fast = event(data)
+    monkeypatch.setattr(sse, "orjson", None)
+    assert json.loads(event(data)[6:-2]) == json.loads(fast[6:-2]) == data
+
+
+def test_result_event_serialises_the_model_in_one_step():
+    """A model goes straight to JSON: no model_dump() and no encoder pass over
+    its data, and the event is byte-for-byte the one the dict path emits.
+
+    The speed difference is measured by ``benchmarks/micro.py``
+    (``sse.result_event`` vs ``sse.result_event[via_dict]``).
+    """
+    from app.models import AnalysisResult, PracticeQuestion
+
+    result = AnalysisResult(
+        companyName="Acme",
+        companyIntelligence=[],
+        techAnalysis=[],
+        interviewFocus=[],
+        practiceQuestions=[
+            PracticeQuestion(question=f"Q{i}?", difficulty="Hard", category="Tech", hint="H")
+            for i in range(50)
+        ],
+        resources=[],
+    )
+    via_dict = result_event(result.model_dump())
+
+    encoded = []
+
+    def spy(data):
+        encoded.append(data)
+        return real_dumps(data)
+
+    real_dumps = sse._dumps
+    with (
+        patch.object(sse, "_dumps", side_effect=spy),
+        patch.object(AnalysisResult, "model_dump", side_effect=AssertionError("model_dump")),
+    ):
+        direct = result_event(result)
+
+    assert encoded == [{"type": "result"}]
+    assert direct == via_dict
+
+
+def test_section_event():
+    """section_event() has type 'section', the section name and its data."""
+    out = section_event("resources", [{"title": "R"}])
+    payload = json.loads(out.split("data: ", 1)[1].strip())
+    assert payload["type"] == "section"
+    assert payload["name"] == "resources"
+    assert payload["data"] == [{"title": "R"}]
+
+
 def test_error_event():
     """error_event() has type 'error' and message present."""
     msg = "Something went wrong"
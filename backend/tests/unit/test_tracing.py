@@ -0,0 +1,152 @@
+"""Unit tests for app.services.tracing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import tracing
+from app.services.pipeline import run, run_shared
+
+
+@pytest.fixture(autouse=True)
+def _memory_exporter():
+    exporter = tracing.InMemoryExporter()
+    tracing.configure_exporters([exporter])
+    yield exporter
+    tracing.configure_exporters(None)
+
+
+def test_span_is_a_noop_without_an_active_trace():
+    with tracing.span("anything", key="value") as span:
+        span.set(more=1)
+    assert span is tracing.span("other")
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks():
+    """Spans opened in tasks started inside a span are its children."""
+    trace = tracing.Trace("request")
+
+    async def child(name: str) -> None:
+        with tracing.span(name):
+            await asyncio.sleep(0)
+
+    with tracing.activate(trace):
+        with tracing.span("parent", size=2) as parent:
+            await asyncio.gather(child("a"), child("b"))
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+    trace.finish()
+
+    spans = {span["name"]: span for span in trace.to_dict()["spans"]}
+    assert spans["parent"]["parentId"] == spans["request"]["id"]
+    assert spans["a"]["parentId"] == parent.span_id
+    assert spans["b"]["parentId"] == parent.span_id
+    assert spans["parent"]["attributes"] == {"size": 2}
+    assert spans["failing"]["error"] == "ValueError: boom"
+    assert tracing.span("after") is tracing.span("after")  # deactivated again
+
+
+@pytest.mark.asyncio
+async def test_jsonl_exporter_appends_one_line_per_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = tracing.JsonLinesExporter(path)
+    await exporter.export({"traceId": "a"})
+    await exporter.export({"traceId": "b"})
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["traceId"] for line in lines] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_http_exporter_posts_trace_json():
+    received: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content))
+        return httpx.Response(202)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    exporter = tracing.HttpExporter("http://collector.test/traces", client=client)
+    await exporter.export({"traceId": "abc"})
+    await client.aclose()
+    assert received == [{"traceId": "abc"}]
+
+
+@pytest.mark.asyncio
+async def test_traced_run_yields_trace_event_and_exports(_memory_exporter):
+    """run(trace=True) ends with a trace event covering searches and synthesis."""
+    async def mock_search(query: str):
+        with tracing.span("mock_search", query=query):
+            return []
+
+    async def mock_research(_prompt: str):
+        yield json.dumps(
+            {
+                "companyName": "Acme",
+                "companyIntelligence": [],
+                "techAnalysis": [],
+                "interviewFocus": [],
+                "practiceQuestions": [],
+                "resources": [],
+            }
+        )
+
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            events = [e async for e in run("Senior Engineer at Acme. Python, React.", trace=True)]
+    await tracing.flush()
+
+    payload = json.loads(events[-1][6:])
+    assert payload["type"] == "trace"
+    trace = payload["trace"]
+    spans = {span["name"]: span for span in trace["spans"]}
+    for name in ("extract_metadata", "search_company", "search_technologies",
+                 "build_prompt", "synthesise", "parse_json", "validate"):
+        assert name in spans, name
+    searches = [span for span in trace["spans"] if span["name"] == "mock_search"]
+    assert {span["parentId"] for span in searches} <= {
+        spans["search_company"]["id"], spans["search_technologies"]["id"]
+    }
+    assert list(_memory_exporter.traces) == [trace]
+
+
+@pytest.mark.asyncio
+async def test_untraced_run_exports_nothing(_memory_exporter):
+    async def mock_search(_query: str):
+        return []
+
+    async def mock_research(_prompt: str):
+        yield "not json"
+
+    with patch("app.services.pipeline.you_client.search", side_effect=mock_search):
+        with patch("app.services.pipeline.you_client.research_stream", side_effect=mock_research):
+            events = [e async for e in run("Engineer at Acme.")]
+    await tracing.flush()
+    assert '"type":"error"' in events[-1]
+    assert not _memory_exporter.traces
+
+
+@pytest.mark.asyncio
+async def test_traced_requests_do_not_share_runs():
+    """A traced request never attaches to another request's run."""
+
+    async def shared_stream():
+        yield "shared"
+
+    with (
+        patch("app.services.pipeline.inflight.join", return_value=shared_stream()) as join,
+        patch("app.services.pipeline.run") as own_run,
+    ):
+        run_shared("Engineer at Acme.", trace=True)
+        assert [e async for e in run_shared("Engineer at Acme.")] == ["shared"]
+    assert join.call_count == 1
+    own_run.assert_called_once_with(
+        "Engineer at Acme.", use_cache=True, pacing=settings.pacing, trace=True
+    )
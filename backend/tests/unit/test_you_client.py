@@ -10,6 +10,17 @@ from app.models import SearchHit
 from app.services import you_client
 
 
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    you_client.search_cache.clear()
+    you_client.reset_endpoint_memory()
+    you_client.reset_resilience()
+    yield
+    you_client.search_cache.clear()
+    you_client.reset_endpoint_memory()
+    you_client.reset_resilience()
+
+
 @pytest.fixture
 def mock_http():
     """Provide a mock AsyncClient for you_client._http."""
@@ -81,10 +92,111 @@ async def test_search_parses_legacy_response(mock_http):
     assert hits[0].snippets == ["Fallback description"]
 
 
+def _legacy_response(title: str = "Legacy Doc") -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {"hits": [{"url": "https://legacy.com/doc", "title": title}]}
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+def _forbidden() -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = 403
+    return resp
+
+
+@pytest.mark.asyncio
+async def test_search_remembers_legacy_endpoint_per_key(mock_http):
+    """After v1 returns 403, later searches go straight to the legacy endpoint."""
+    from app.config import settings
+
+    mock_http.get.side_effect = [_forbidden(), _legacy_response("A"), _legacy_response("B")]
+    with patch.object(you_client, "_http", mock_http):
+        await you_client.search("first query")
+        hits = await you_client.search("second query")
+
+    assert hits[0].title == "B"
+    urls = [call.args[0] for call in mock_http.get.await_args_list]
+    assert urls == [
+        settings.you_search_url,
+        settings.you_search_legacy_url,
+        settings.you_search_legacy_url,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_reprobes_v1_after_interval(mock_http):
+    """Once the re-probe interval lapses v1 is tried again and, if it works, kept."""
+    import dataclasses
+
+    from app.config import settings
+
+    no_memory = dataclasses.replace(settings, search_endpoint_reprobe_interval=0.0)
+    mock_http.get.side_effect = [
+        _forbidden(),
+        _legacy_response(),
+        _v1_response("v1 again"),
+        _v1_response("still v1"),
+    ]
+    with patch("app.services.you_client.settings", no_memory):
+        with patch.object(you_client, "_http", mock_http):
+            await you_client.search("first query")
+            assert (await you_client.search("second query"))[0].title == "v1 again"
+            assert (await you_client.search("third query"))[0].title == "still v1"
+
+    urls = [call.args[0] for call in mock_http.get.await_args_list]
+    assert urls.count(settings.you_search_legacy_url) == 1
+
+
+def _v1_response(title: str = "Example Page") -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {
+        "results": {"web": [{"url": "https://example.com/page", "title": title}]},
+    }
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+@pytest.mark.asyncio
+async def test_search_serves_normalised_repeat_queries_from_cache(mock_http):
+    """Queries differing only in case/whitespace hit the cache after the first call."""
+    mock_http.get.return_value = _v1_response()
+
+    with patch.object(you_client, "_http", mock_http):
+        first = await you_client.search("React  best practices")
+        second = await you_client.search("react best practices ")
+        other_limit = await you_client.search("react best practices", num_results=3)
+
+    assert first == second == other_limit
+    assert mock_http.get.await_count == 2
+    assert you_client.search_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_coalesces_concurrent_identical_queries(mock_http):
+    """Concurrent identical searches share one upstream request."""
+    import asyncio
+
+    async def slow_get(*_args, **_kwargs):
+        await asyncio.sleep(0.02)
+        return _v1_response()
+
+    mock_http.get.side_effect = slow_get
+
+    with patch.object(you_client, "_http", mock_http):
+        results = await asyncio.gather(*(you_client.search("Kafka") for _ in range(4)))
+
+    assert all(len(hits) == 1 for hits in results)
+    assert mock_http.get.await_count == 1
+
+
 @pytest.mark.asyncio
 async def test_research_returns_message_answer_text(mock_http):
     """research() returns text from output item with type message.answer."""
     mock_resp = MagicMock()
+    mock_resp.status_code = 200
     mock_resp.json.return_value = {
         "output": [
             {"type": "other", "content": []},
@@ -104,6 +216,7 @@ async def test_research_returns_message_answer_text(mock_http):
 async def test_research_returns_empty_when_no_answer(mock_http):
     """research() returns empty string when no message.answer in output."""
     mock_resp = MagicMock()
+    mock_resp.status_code = 200
     mock_resp.json.return_value = {"output": [{"type": "web_search.results", "content": []}]}
     mock_resp.raise_for_status = MagicMock()
     mock_http.post.return_value = mock_resp
@@ -112,3 +225,37 @@ async def test_research_returns_empty_when_no_answer(mock_http):
         out = await you_client.research("prompt")
 
     assert out == ""
+
+
+@pytest.mark.asyncio
+async def test_research_stream_yields_answer_deltas():
+    """research_stream() posts stream=true and yields only answer text deltas."""
+    import json
+
+    import httpx
+
+    seen: dict = {}
+    lines = [
+        'event: response.created',
+        'data: {"type": "response.created"}',
+        '',
+        'data: {"type": "response.output_text.delta", "response": {"type": "message.answer", "delta": "{\\"company"}}',
+        '',
+        'data: {"type": "response.output_text.delta", "response": {"type": "web_search.results", "delta": "ignored"}}',
+        'data: not json',
+        'data: {"type": "response.output_text.delta", "response": {"delta": "Name\\": \\"Acme\\"}"}}',
+        'data: {"type": "response.done", "response": {"finished": true}}',
+        'data: [DONE]',
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, text="\n".join(lines) + "\n")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(you_client, "_http", client):
+        chunks = [c async for c in you_client.research_stream("prompt")]
+    await client.aclose()
+
+    assert seen["body"]["stream"] is True
+    assert chunks == ['{"company', 'Name": "Acme"}']
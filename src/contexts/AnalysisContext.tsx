@@ -59,7 +59,8 @@ export function AnalysisProvider({ children }: { children: ReactNode }) {
     try {
       const resp = await fetch(`${BACKEND_URL}/api/prepare`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        // "ui" pacing keeps fast steps on screen long enough to be seen.
+        headers: { "Content-Type": "application/json", "X-Pacing": "ui" },
         body: JSON.stringify({ jobDescription }),
         signal: controller.signal,
       });
@@ -1,5 +1,5 @@
 import { useState, useCallback, useEffect } from "react";
-import { SavedAnalysis, AnalysisResult } from "@/types/analysis";
+import { SavedAnalysis, AnalysisResult, HistoryItem } from "@/types/analysis";
 
 const STORAGE_KEY = "interview-prep-saved";
 const API_BASE = import.meta.env.VITE_BACKEND_URL ?? "";
@@ -17,7 +17,7 @@ function persistToStorage(items: SavedAnalysis[]) {
 }
 
 export function useSavedAnalyses() {
-  const [items, setItems] = useState<SavedAnalysis[]>([]);
+  const [items, setItems] = useState<HistoryItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [useApi, setUseApi] = useState<boolean | null>(null);
 
@@ -86,12 +86,10 @@ export function useSavedAnalyses() {
         }
       }
 
-      // Fallback: localStorage
-      setItems((prev) => {
-        const next = [entry, ...prev];
-        persistToStorage(next);
-        return next;
-      });
+      // Fallback: localStorage, which only ever holds full entries; the
+      // listed items may be summaries fetched from the API.
+      persistToStorage([entry, ...loadFromStorage().filter((i) => i.id !== entry.id)]);
+      setItems((prev) => [entry, ...prev]);
       return entry.id;
     },
     [useApi]
@@ -114,14 +112,27 @@ export function useSavedAnalyses() {
         }
       }
 
-      setItems((prev) => {
-        const next = prev.filter((i) => i.id !== id);
-        persistToStorage(next);
-        return next;
-      });
+      persistToStorage(loadFromStorage().filter((i) => i.id !== id));
+      setItems((prev) => prev.filter((i) => i.id !== id));
     },
     [useApi]
   );
 
-  return { items, save, remove, refresh, loading };
+  /** Return the full analysis for a listed item, fetching it if only the summary is loaded. */
+  const load = useCallback(
+    async (id: string): Promise<SavedAnalysis | null> => {
+      const item = items.find((i) => i.id === id);
+      if (item && "results" in item) return item;
+      try {
+        const resp = await fetch(`${API_BASE}/api/history/${id}`);
+        if (resp.ok) return await resp.json();
+      } catch {
+        // API not available
+      }
+      return loadFromStorage().find((i) => i.id === id) ?? null;
+    },
+    [items]
+  );
+
+  return { items, save, remove, load, refresh, loading };
 }
@@ -5,7 +5,7 @@ import { useSavedAnalyses } from "@/hooks/useSavedAnalyses";
 import { useToast } from "@/hooks/use-toast";
 
 export default function History() {
-  const { items, remove, loading } = useSavedAnalyses();
+  const { items, remove, load, loading } = useSavedAnalyses();
   const { toast } = useToast();
   const navigate = useNavigate();
 
@@ -14,6 +14,15 @@ export default function History() {
     toast({ title: "Deleted", description: "Analysis removed from history." });
   };
 
+  const handleView = async (id: string) => {
+    const loaded = await load(id);
+    if (loaded) {
+      navigate("/prepare", { state: { loaded } });
+    } else {
+      toast({ title: "Could not load", description: "This analysis is no longer available." });
+    }
+  };
+
   if (loading) {
     return (
       <div className="container mx-auto px-6 py-20 flex justify-center">
@@ -77,13 +86,13 @@ export default function History() {
               </button>
             </div>
             <p className="text-xs text-muted-foreground leading-relaxed line-clamp-2 mb-4">
-              {item.jobDescription.slice(0, 120)}...
+              {("jobDescription" in item ? item.jobDescription : item.jobDescriptionPreview).slice(0, 120)}...
             </p>
             <Button
               variant="secondary"
               size="sm"
               className="w-full gap-2 text-xs"
-              onClick={() => navigate("/prepare", { state: { loaded: item } })}
+              onClick={() => handleView(item.id)}
             >
               <Eye className="h-3.5 w-3.5" />
               View Analysis
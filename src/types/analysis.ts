@@ -57,3 +57,14 @@ export interface SavedAnalysis {
   results: AnalysisResult;
   savedAt: number;
 }
+
+/** Listing item returned by GET /api/history; fetch /api/history/:id for the full analysis. */
+export interface HistorySummary {
+  id: string;
+  companyName: string;
+  roleTitle: string;
+  savedAt: number;
+  jobDescriptionPreview: string;
+}
+
+export type HistoryItem = SavedAnalysis | HistorySummary;